@@ -0,0 +1,141 @@
+"""Benchmark starting and stopping runners against a local fake GitHub API.
+
+Runs `DeployInstance` and `TeardownInstance` for each fleet size against
+`FakeGitHub` and the fake cloud providers, and reports the wall-clock time
+percentiles and the number of GitHub API calls.
+
+Usage::
+
+    python benchmarks/bench_deploy.py --sizes 1 10 100 500 --repeat 5 \\
+        --latency 0.05 --boot-delay 0.5 --appearance-delay 1
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import time
+
+from fake_cloud import (
+    FakeCloud,
+    FakeCreateCloudInstance,
+    FakeStopCloudInstance,
+)
+from fake_github import FakeGitHub
+
+from gha_runner.clouddeployment import DeployInstance, TeardownInstance
+from gha_runner.gh import PollStrategy
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Return the nearest-rank `q` percentile of `values`."""
+    ordered = sorted(values)
+    rank = max(math.ceil(q / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def api_calls(gh) -> int:
+    """Return the number of API calls recorded by a `GitHubInstance`."""
+    return sum(m.count for m in gh.metrics.snapshot().values())
+
+
+def run_once(args, size: int) -> dict:
+    """Start and stop a fleet of `size` runners, returning the timings."""
+    with FakeGitHub(
+        latency=args.latency, appearance_delay=args.appearance_delay
+    ) as github:
+        cloud = FakeCloud(
+            github, boot_delay=args.boot_delay, api_latency=args.cloud_latency
+        )
+        gh = github.client(
+            runners_per_page=args.per_page, page_workers=args.page_workers
+        )
+        start = time.perf_counter()
+        deploy = DeployInstance(
+            provider_type=FakeCreateCloudInstance,
+            cloud_params={"cloud": cloud},
+            gh=gh,
+            count=size,
+            timeout=args.timeout,
+            poll=PollStrategy.adaptive(initial=args.poll, max_interval=2.0),
+            token_workers=args.token_workers,
+            pipeline=args.pipeline,
+        )
+        mappings = deploy.start_runner_instances()
+        deploy_time = time.perf_counter() - start
+        deploy_calls = api_calls(gh)
+        gh.metrics.reset()
+        start = time.perf_counter()
+        teardown = TeardownInstance(
+            provider_type=FakeStopCloudInstance,
+            cloud_params={"cloud": cloud, "mapping": mappings},
+            gh=gh,
+            max_workers=args.remove_workers,
+        )
+        teardown.stop_runner_instances()
+        teardown_time = time.perf_counter() - start
+        assert github.runner_count() == 0, "Runners left registered"
+        assert not cloud.running, "Instances left running"
+        result = {
+            "deploy": deploy_time,
+            "deploy_calls": deploy_calls,
+            "teardown": teardown_time,
+            "teardown_calls": api_calls(gh),
+        }
+        gh.close()
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--appearance-delay", type=float, default=0.2)
+    parser.add_argument("--boot-delay", type=float, default=0.2)
+    parser.add_argument("--cloud-latency", type=float, default=0.0)
+    parser.add_argument("--poll", type=float, default=0.1)
+    parser.add_argument("--timeout", type=int, default=600)
+    parser.add_argument("--per-page", type=int, default=100)
+    parser.add_argument("--page-workers", type=int, default=4)
+    parser.add_argument("--token-workers", type=int, default=8)
+    parser.add_argument("--remove-workers", type=int, default=8)
+    parser.add_argument("--pipeline", action="store_true")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    results = []
+    print(
+        f"{'size':>5} {'phase':>9} {'p50 (s)':>9} {'p95 (s)':>9} "
+        f"{'calls':>7}"
+    )
+    for size in args.sizes:
+        runs = []
+        for _ in range(args.repeat):
+            # Keep the progress logs out of the printed table
+            with contextlib.redirect_stdout(io.StringIO()):
+                runs.append(run_once(args, size))
+        for phase in ("deploy", "teardown"):
+            times = [run[phase] for run in runs]
+            calls = max(run[f"{phase}_calls"] for run in runs)
+            row = {
+                "size": size,
+                "phase": phase,
+                "p50": percentile(times, 50),
+                "p95": percentile(times, 95),
+                "calls": calls,
+            }
+            results.append(row)
+            print(
+                f"{size:>5} {phase:>9} {row['p50']:>9.3f} {row['p95']:>9.3f} "
+                f"{calls:>7}",
+                flush=True,
+            )
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark `EnvVarBuilder` against the number and size of parameters.
+
+Each run parses `--counts` JSON parameters of `--sizes` list entries, reading
+`params` after every update as a chain of start actions would, and compares:
+
+- ``deepcopy``: the previous builder, deep-copying on every update
+- ``default``: the current builder, deep-copying only in `params`
+- ``frozen``: the current builder with `frozen=True`, never deep-copying
+
+Usage::
+
+    python benchmarks/bench_env_builder.py --counts 10 50 200 --sizes 1 100
+"""
+
+import argparse
+import json
+import timeit
+from copy import deepcopy
+
+from gha_runner.helper.input import EnvVarBuilder
+
+
+class DeepCopyingBuilder(EnvVarBuilder):
+    """The builder as it was, copying all parameters on each update."""
+
+    def _update_params(self, key, value):
+        self._params = deepcopy(self._params)
+        self._params[key] = deepcopy(value)
+
+
+def make_env(count: int, size: int) -> dict[str, str]:
+    """Make `count` JSON variables holding a list of `size` tags each."""
+    value = json.dumps(
+        [{"Key": f"key-{i}", "Value": f"value-{i}"} for i in range(size)]
+    )
+    return {f"INPUT_VAR_{i}": value for i in range(count)}
+
+
+def build(builder: EnvVarBuilder, env: dict[str, str]):
+    for name in env:
+        builder.update_state(name, name.lower(), is_json=True)
+        builder.params
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    modes = {
+        "deepcopy": lambda env: DeepCopyingBuilder(env),
+        "default": lambda env: EnvVarBuilder(env),
+        "frozen": lambda env: EnvVarBuilder(env, frozen=True),
+    }
+    print(f"{'count':>6} {'size':>6} " + " ".join(f"{m:>12}" for m in modes))
+    for size in args.sizes:
+        for count in args.counts:
+            env = make_env(count, size)
+            times = []
+            for make_builder in modes.values():
+                best = min(
+                    timeit.repeat(
+                        lambda: build(make_builder(env), env),
+                        number=1,
+                        repeat=args.repeat,
+                    )
+                )
+                times.append(f"{best * 1000:>10.2f}ms")
+            print(f"{count:>6} {size:>6} " + " ".join(times), flush=True)
+
+
+if __name__ == "__main__":
+    main()
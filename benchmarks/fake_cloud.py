@@ -0,0 +1,96 @@
+"""Fake cloud providers for benchmarking, backed by `FakeGitHub`.
+
+Each instance "boots" in a background timer and then registers its runner
+with the fake GitHub API, as the runner on a real instance would.
+"""
+
+import threading
+import time
+
+from fake_github import FakeGitHub
+
+from gha_runner.clouddeployment import CreateCloudInstance, StopCloudInstance
+from gha_runner.gh import GitHubInstance
+
+
+class FakeCloud:
+    """The shared state of the fake cloud.
+
+    Parameters
+    ----------
+    github : FakeGitHub
+        The fake GitHub API runners register with.
+    boot_delay : float
+        The time in seconds an instance takes to boot. Defaults to 0.
+    api_latency : float
+        The time in seconds each provider call takes. Defaults to 0.
+
+    """
+
+    def __init__(
+        self, github: FakeGitHub, boot_delay: float = 0.0, api_latency=0.0
+    ):
+        self.github = github
+        self.boot_delay = boot_delay
+        self.api_latency = api_latency
+        self.running: dict[str, str] = {}
+        self.ready_at: dict[str, float] = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def launch(self) -> tuple[str, str]:
+        """Launch an instance and return its ID and runner label."""
+        with self._lock:
+            instance_id = f"i-{self._next_id:08d}"
+            self._next_id += 1
+        label = GitHubInstance.generate_random_label()
+        with self._lock:
+            self.running[instance_id] = label
+            self.ready_at[instance_id] = time.time() + self.boot_delay
+        timer = threading.Timer(self.boot_delay, self.github.register, [label])
+        timer.daemon = True
+        timer.start()
+        return instance_id, label
+
+
+class FakeCreateCloudInstance(CreateCloudInstance):
+    """Create instances in a `FakeCloud`, one per runner token."""
+
+    def __init__(
+        self, gh_runner_tokens: list[str], cloud: FakeCloud, **kwargs
+    ):
+        self.count = len(gh_runner_tokens)
+        self.cloud = cloud
+        self.mapping: dict[str, str] = {}
+
+    def create_instances(self) -> dict[str, str]:
+        time.sleep(self.cloud.api_latency)
+        return dict(self.cloud.launch() for _ in range(self.count))
+
+    def wait_until_ready(self, ids: list[str], **kwargs):
+        time.sleep(self.cloud.api_latency)
+        ready_at = max((self.cloud.ready_at[i] for i in ids), default=0)
+        time.sleep(max(ready_at - time.time(), 0))
+
+    def set_instance_mapping(self, mapping: dict[str, str]):
+        self.mapping = mapping
+
+
+class FakeStopCloudInstance(StopCloudInstance):
+    """Remove instances from a `FakeCloud`."""
+
+    def __init__(self, cloud: FakeCloud, mapping: dict[str, str], **kwargs):
+        self.cloud = cloud
+        self.mapping = mapping
+
+    def remove_instances(self, ids: list[str]):
+        time.sleep(self.cloud.api_latency)
+        with self.cloud._lock:
+            for instance_id in ids:
+                self.cloud.running.pop(instance_id, None)
+
+    def wait_until_removed(self, ids: list[str], **kwargs):
+        time.sleep(self.cloud.api_latency)
+
+    def get_instance_mapping(self) -> dict[str, str]:
+        return self.mapping
@@ -0,0 +1,207 @@
+"""A local fake of the GitHub API endpoints used to start and stop runners.
+
+Only the endpoints used by `DeployInstance` and `TeardownInstance` are served:
+registration tokens, runner listing and removal, and the latest runner
+release. Runners are registered directly by the fake cloud provider, and only
+become visible in the listing after a configurable delay.
+"""
+
+import json
+import re
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from gha_runner.gh import GitHubInstance
+
+RELEASE = {
+    "tag_name": "v2.321.0",
+    "assets": [
+        {
+            "name": f"actions-runner-linux-{arch}-2.321.0.tar.gz",
+            "browser_download_url": "https://github.com/actions/runner/"
+            f"releases/download/v2.321.0/actions-runner-linux-{arch}-2.321.0"
+            ".tar.gz",
+        }
+        for arch in ("x64", "arm", "arm64")
+    ],
+}
+
+_RUNNERS = re.compile(r"^/repos/[^/]+/[^/]+/actions/runners$")
+_RUNNER = re.compile(r"^/repos/[^/]+/[^/]+/actions/runners/(\d+)$")
+_TOKEN = re.compile(
+    r"^/repos/[^/]+/[^/]+/actions/runners/registration-token$"
+)
+_RELEASE = re.compile(r"^/repos/actions/runner/releases/latest$")
+
+
+class FakeGitHub:
+    """A fake GitHub API served over HTTP on localhost.
+
+    Parameters
+    ----------
+    latency : float
+        The time in seconds each request takes. Defaults to 0.
+    appearance_delay : float
+        The time in seconds between a runner registering and it appearing in
+        the runner listing. Defaults to 0.
+    max_per_page : int
+        The maximum page size of the runner listing. Defaults to 100.
+
+    Attributes
+    ----------
+    url : str
+        The base URL of the fake API, once started.
+
+    Examples
+    --------
+    >>> with FakeGitHub(latency=0.02) as fake:
+    ...     gh = fake.client(repo="owner/repo")
+    ...     gh.get_runners()
+
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        appearance_delay: float = 0.0,
+        max_per_page: int = 100,
+    ):
+        self.latency = latency
+        self.appearance_delay = appearance_delay
+        self.max_per_page = max_per_page
+        self._runners: dict[int, dict] = {}
+        self._visible_at: dict[int, float] = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> "FakeGitHub":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve the fake API in a background thread."""
+        fake = self
+
+        class Handler(_Handler):
+            github = fake
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop serving the fake API."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def client(self, repo: str = "owner/repo", **kwargs) -> GitHubInstance:
+        """Create a `GitHubInstance` talking to the fake API."""
+
+        class LocalGitHubInstance(GitHubInstance):
+            BASE_URL = self.url
+
+        return LocalGitHubInstance(token="fake-token", repo=repo, **kwargs)
+
+    def register(self, label: str):
+        """Register a runner, as the runner on a booted instance would."""
+        with self._lock:
+            runner_id = self._next_id
+            self._next_id += 1
+            self._runners[runner_id] = {
+                "id": runner_id,
+                "name": label,
+                "os": "linux",
+                "status": "online",
+                "busy": False,
+                "labels": [{"name": "self-hosted"}, {"name": label}],
+            }
+            self._visible_at[runner_id] = time.time() + self.appearance_delay
+
+    def runner_count(self) -> int:
+        """Return the number of runners registered."""
+        with self._lock:
+            return len(self._runners)
+
+    def _list_runners(self, page: int, per_page: int) -> dict:
+        now = time.time()
+        with self._lock:
+            visible = [
+                runner
+                for runner_id, runner in self._runners.items()
+                if self._visible_at[runner_id] <= now
+            ]
+        per_page = min(per_page, self.max_per_page)
+        start = (page - 1) * per_page
+        return {
+            "total_count": len(visible),
+            "runners": visible[start : start + per_page],
+        }
+
+    def _remove_runner(self, runner_id: int) -> bool:
+        with self._lock:
+            self._visible_at.pop(runner_id, None)
+            return self._runners.pop(runner_id, None) is not None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep connections alive so the client's connection pool is exercised
+    protocol_version = "HTTP/1.1"
+    github: FakeGitHub
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, body=None):
+        content = b"" if body is None else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _handle(self, method: str):
+        time.sleep(self.github.latency)
+        url = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qs(url.query)
+        if method == "POST" and _TOKEN.match(url.path):
+            self._reply(201, {"token": "fake-registration-token"})
+        elif method == "GET" and _RUNNERS.match(url.path):
+            page = int(query.get("page", ["1"])[0])
+            per_page = int(query.get("per_page", ["30"])[0])
+            self._reply(200, self.github._list_runners(page, per_page))
+        elif method == "DELETE" and (match := _RUNNER.match(url.path)):
+            if self.github._remove_runner(int(match.group(1))):
+                self._reply(204)
+            else:
+                self._reply(404, {"message": "Not Found"})
+        elif method == "GET" and _RELEASE.match(url.path):
+            self._reply(200, RELEASE)
+        else:
+            self._reply(404, {"message": "Not Found"})
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self._handle("POST")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
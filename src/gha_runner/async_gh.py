@@ -0,0 +1,463 @@
+"""Module to manage GitHub repository actions through the GitHub API with asyncio.
+
+This module requires the optional `httpx` dependency, which can be installed
+with `pip install gha-runner[async]`.
+"""
+
+import asyncio
+import math
+import time
+import urllib.parse
+from json import JSONDecodeError
+
+from gha_runner.gh import (
+    MAX_RUNNERS_PER_PAGE,
+    GitHubInstance,
+    MissingRunnerLabel,
+    PollStrategy,
+    RunnerListError,
+    SelfHostedRunner,
+    TokenRetrievalError,
+    _check_runner_platform,
+    _find_runner_asset,
+    _github_headers,
+    _parse_runner_page,
+)
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+class AsyncGitHubInstance:
+    """Class to manage GitHub repository actions through the GitHub API.
+
+    This is the asyncio counterpart of `GitHubInstance`, so a single event
+    loop can drive many repositories concurrently.
+
+    Parameters
+    ----------
+    token : str
+        GitHub API token for authentication.
+    repo : str
+        Full name of the GitHub repository in the format "owner/repo".
+    pool_size : int
+        The maximum number of pooled connections kept alive to the GitHub API.
+        Defaults to 10.
+    runners_per_page : int
+        The page size used when listing runners, up to the API maximum of
+        100. Defaults to 30, the API default.
+    client : httpx.AsyncClient, optional
+        The client to use for requests. If not given, a pooled client is
+        created and closed with this instance.
+
+    Attributes
+    ----------
+    headers : dict
+        Headers for HTTP requests to GitHub API.
+    client : httpx.AsyncClient
+        The client used for all requests to the GitHub API.
+
+    Examples
+    --------
+    >>> async with AsyncGitHubInstance(token="...", repo="owner/repo") as gh:
+    ...     runners = await gh.get_runners()
+
+    """
+
+    BASE_URL = GitHubInstance.BASE_URL
+
+    def __init__(
+        self,
+        token: str,
+        repo: str,
+        pool_size: int = 10,
+        runners_per_page: int = 30,
+        client: "httpx.AsyncClient | None" = None,
+    ):
+        if httpx is None:
+            raise ImportError(
+                "AsyncGitHubInstance requires httpx. "
+                "Install it with `pip install gha-runner[async]`."
+            )
+        self.token = token
+        self.headers = _github_headers(token)
+        if not 1 <= runners_per_page <= MAX_RUNNERS_PER_PAGE:
+            raise ValueError(
+                f"runners_per_page must be between 1 and "
+                f"{MAX_RUNNERS_PER_PAGE}, got {runners_per_page}"
+            )
+        self.repo = repo
+        self.runners_per_page = runners_per_page
+        if client is None:
+            limits = httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+            )
+            client = httpx.AsyncClient(limits=limits)
+        self.client = client
+
+    async def __aenter__(self) -> "AsyncGitHubInstance":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the client and release its connections."""
+        await self.client.aclose()
+
+    async def _do_request(self, method: str, endpoint, **kwargs):
+        """Make a request to the GitHub API."""
+        endpoint_url = urllib.parse.urljoin(self.BASE_URL, endpoint)
+        resp = await self.client.request(
+            method, endpoint_url, headers=self.headers, **kwargs
+        )
+        if not resp.is_success:
+            raise RuntimeError(
+                f"Error in API call for {endpoint_url}: " f"{resp.content}"
+            )
+        else:
+            try:
+                return resp.json()
+            except JSONDecodeError:
+                return resp.content
+
+    async def post(self, endpoint, **kwargs):
+        """Make a POST request to the GitHub API.
+
+        Parameters
+        ----------
+        endpoint : str
+            The endpoint to make the request to.
+        **kwargs : dict, optional
+            Additional keyword arguments to pass to the request.
+            See the httpx.AsyncClient.request documentation for more information.
+
+        """
+        return await self._do_request("POST", endpoint, **kwargs)
+
+    async def get(self, endpoint, **kwargs):
+        """Make a GET request to the GitHub API.
+
+        Parameters
+        ----------
+        endpoint : str
+            The endpoint to make the request to.
+        **kwargs : dict, optional
+            Additional keyword arguments to pass to the request.
+            See the httpx.AsyncClient.request documentation for more information.
+        """
+        return await self._do_request("GET", endpoint, **kwargs)
+
+    async def delete(self, endpoint, **kwargs):
+        """Make a DELETE request to the GitHub API.
+
+        Parameters
+        ----------
+        endpoint : str
+            The endpoint to make the request to.
+        **kwargs : dict, optional
+            Additional keyword arguments to pass to the request.
+            See the httpx.AsyncClient.request documentation for more information.
+        """
+        return await self._do_request("DELETE", endpoint, **kwargs)
+
+    async def create_runner_token(self) -> str:
+        """Generate a registration token for GitHub Actions runners.
+
+        Returns
+        -------
+        str
+            A runner registration token.
+
+        Raises
+        ------
+        TokenRetrievalError
+            If there is an error generating the token.
+
+        """
+        try:
+            res = await self.post(
+                f"repos/{self.repo}/actions/runners/registration-token"
+            )
+            return res["token"]
+        except Exception as e:
+            raise TokenRetrievalError(f"Error creating runner token: {e}")
+
+    async def create_runner_tokens(
+        self, count: int, max_concurrency: int = 10
+    ) -> list[str]:
+        """Generate registration tokens for GitHub Actions runners.
+
+        Parameters
+        ----------
+        count : int
+            The number of runner tokens to generate.
+        max_concurrency : int
+            The maximum number of tokens to request at once. Defaults to 10.
+
+        Returns
+        -------
+        list[str]
+            A list of runner registration tokens, in request order.
+
+        Raises
+        ------
+        TokenRetrievalError
+            If there is an error generating the tokens. Remaining requests are
+            cancelled and the message reports how many tokens were created.
+
+        """
+        semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+
+        async def mint() -> str:
+            async with semaphore:
+                return await self.create_runner_token()
+
+        tasks = [asyncio.ensure_future(mint()) for _ in range(count)]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except TokenRetrievalError as e:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            created = sum(
+                1
+                for task in tasks
+                if not task.cancelled() and task.exception() is None
+            )
+            raise TokenRetrievalError(
+                f"Created {created} of {count} runner tokens: {e}"
+            ) from e
+
+    async def _get_runner_page(
+        self, page: int, per_page: int
+    ) -> tuple[int, list[SelfHostedRunner]]:
+        """Get a single page of the self-hosted runners in the repository."""
+        try:
+            res = await self.get(
+                f"repos/{self.repo}/actions/runners"
+                f"?per_page={per_page}&page={page}"
+            )
+        except RuntimeError as e:
+            raise RunnerListError(f"Error getting runners: {e}")
+        return _parse_runner_page(res)
+
+    async def get_runners(self) -> list[SelfHostedRunner] | None:
+        """Get a list of self-hosted runners in the repository.
+
+        Once the first page gives the total number of runners, the remaining
+        pages are fetched concurrently and merged in page order.
+
+        Returns
+        -------
+        list[SelfHostedRunner] | None
+            A list of self-hosted runners in the repository if they exist,
+            otherwise None.
+
+        Raises
+        ------
+        RunnerListError
+            If there is an error getting the list of runners. Either because of
+            an error in the request or the response is not a mapping object.
+        """
+        per_page = self.runners_per_page
+        total_runners, runners = await self._get_runner_page(1, per_page)
+        next_page = 2
+        # protect from bug/issue where total_count is higher than actual # of runners
+        exhausted = len(runners) < 1
+        if not exhausted:
+            # total_count is known now, so fetch the remaining pages at once
+            last_page = math.ceil(total_runners / per_page)
+            pages = await asyncio.gather(
+                *(
+                    self._get_runner_page(page, per_page)
+                    for page in range(next_page, last_page + 1)
+                )
+            )
+            for total_runners, page_runners in pages:
+                next_page += 1
+                if len(page_runners) < 1:
+                    exhausted = True
+                    break
+                runners.extend(page_runners)
+        # picks up runners registered while the pages above were fetched
+        while not exhausted and len(runners) < total_runners:
+            total_runners, page_runners = await self._get_runner_page(
+                next_page, per_page
+            )
+            next_page += 1
+            if len(page_runners) < 1:
+                break
+            runners.extend(page_runners)
+        return runners if len(runners) > 0 else None
+
+    async def get_runner(self, label: str) -> SelfHostedRunner:
+        """Get a runner by a given label for a repository.
+
+        Returns
+        -------
+        SelfHostedRunner
+            The runner with the given label.
+
+        Raises
+        ------
+        MissingRunnerLabel
+            If the runner with the given label is not found.
+
+        """
+        for runner in await self.get_runners() or []:
+            if label in runner.labels:
+                return runner
+        raise MissingRunnerLabel(f"Runner {label} not found")
+
+    async def wait_for_runner(
+        self,
+        label: str,
+        timeout: int,
+        wait: int = 15,
+        poll: PollStrategy | None = None,
+    ) -> SelfHostedRunner:
+        """Wait for the runner with the given label to be online.
+
+        Parameters
+        ----------
+        label : str
+            The label of the runner to wait for.
+        timeout : int
+            The maximum time in seconds to wait for the runner to be online.
+        wait : int
+            The time in seconds to wait between checks. Defaults to 15 seconds.
+        poll : PollStrategy, optional
+            The strategy for the time between checks. Overrides `wait`.
+            No sleep extends past `timeout`.
+
+        Returns
+        -------
+        SelfHostedRunner
+            The runner with the given label.
+
+        Raises
+        ------
+        RuntimeError
+            If the timeout is reached before the runner is online.
+
+        """
+        runners = await self.wait_for_runners([label], timeout, wait, poll)
+        return runners[label]
+
+    async def wait_for_runners(
+        self,
+        labels: list[str],
+        timeout: int,
+        wait: int = 15,
+        poll: PollStrategy | None = None,
+    ) -> dict[str, SelfHostedRunner]:
+        """Wait for all runners with the given labels to be online.
+
+        Parameters
+        ----------
+        labels : list[str]
+            The labels of the runners to wait for.
+        timeout : int
+            The maximum time in seconds to wait for all runners to be online.
+        wait : int
+            The time in seconds to wait between checks. Defaults to 15 seconds.
+        poll : PollStrategy, optional
+            The strategy for the time between checks. Overrides `wait`.
+            No sleep extends past `timeout`.
+
+        Returns
+        -------
+        dict[str, SelfHostedRunner]
+            A mapping of each label to its runner, in the order of `labels`.
+
+        Raises
+        ------
+        RuntimeError
+            If the timeout is reached before all runners are online.
+
+        """
+        intervals = (poll or PollStrategy.fixed(wait)).intervals()
+        max = time.time() + timeout
+        found: dict[str, SelfHostedRunner] = {}
+        pending = set(labels)
+        while True:
+            for runner in await self.get_runners() or []:
+                for label in runner.labels:
+                    if label in pending:
+                        found[label] = runner
+                        pending.discard(label)
+            if not pending:
+                return {label: found[label] for label in labels}
+            # Report the missing labels in the order they were given
+            missing = [label for label in labels if label in pending]
+            now = time.time()
+            if now > max:
+                raise RuntimeError(
+                    f"Timeout reached: Runners {missing} not found"
+                )
+            print(f"Waiting for runners {missing}...")
+            await asyncio.sleep(min(next(intervals), max - now))
+
+    async def remove_runner(self, label: str):
+        """Remove a runner by a given label.
+
+        Parameters
+        ----------
+        label : str
+            The label of the runner to remove.
+
+        Raises
+        ------
+        MissingRunnerLabel
+            If the runner is not found.
+        RuntimeError
+            If there is an error removing the runner.
+
+        """
+        runner = await self.get_runner(label)
+        try:
+            await self.delete(f"repos/{self.repo}/actions/runners/{runner.id}")
+        except Exception as e:
+            raise RuntimeError(f"Error removing runner {label}. Error: {e}")
+
+    generate_random_label = staticmethod(GitHubInstance.generate_random_label)
+
+    async def _get_latest_release(self, repo: str) -> dict:
+        """Get the latest release for a repository."""
+        try:
+            return await self.get(f"repos/{repo}/releases/latest")
+        except Exception as e:
+            raise RuntimeError(f"Error getting latest release: {e}")
+
+    async def get_latest_runner_release(
+        self, platform: str, architecture: str
+    ) -> str:
+        """Return the latest runner for the given platform and architecture.
+
+        Parameters
+        ----------
+        platform : str
+            The platform of the runner to download.
+        architecture : str
+            The architecture of the runner to download.
+
+        Returns
+        -------
+        str
+            The download URL of the runner.
+
+        Raises
+        ------
+        RuntimeError
+            If the runner is not found for the given platform and architecture.
+        ValueError
+            If the platform or architecture is not supported.
+
+        """
+        _check_runner_platform(platform, architecture)
+        release = await self._get_latest_release("actions/runner")
+        return _find_runner_asset(release, platform, architecture)
@@ -0,0 +1,353 @@
+"""Module to size a runner fleet from the queued workflow job backlog.
+
+Rather than starting a fixed number of runners, the autoscaler reads the jobs
+waiting for a runner through the Actions API and starts or stops runners so
+that the fleet matches the demand, within configured bounds. Fleets with
+different runner labels are scaled together with `scale_fleets`.
+"""
+
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Type
+
+from gha_runner.clouddeployment import (
+    CreateCloudInstance,
+    DeployInstance,
+    StopCloudInstance,
+    TeardownInstance,
+)
+from gha_runner.gh import GitHubInstance, WorkflowJob
+from gha_runner.helper.state import locked_json_state
+from gha_runner.helper.workflow_cmds import error
+
+
+def count_queued_jobs(
+    jobs: list[WorkflowJob], label_sets: list[list[str]]
+) -> list[int]:
+    """Count the queued jobs that each label set can serve.
+
+    A job can be served by a label set if every label it requests is in the
+    set. Each job is counted once, against the first label set serving it.
+
+    Parameters
+    ----------
+    jobs : list[WorkflowJob]
+        The queued workflow jobs.
+    label_sets : list[list[str]]
+        The labels carried by the runners of each fleet.
+
+    Returns
+    -------
+    list[int]
+        The number of queued jobs for each label set, in order.
+
+    """
+    sets = [{label.lower() for label in labels} for labels in label_sets]
+    counts = [0] * len(sets)
+    for job in jobs:
+        requested = {label.lower() for label in job.labels}
+        for i, labels in enumerate(sets):
+            if requested <= labels:
+                counts[i] += 1
+                break
+    return counts
+
+
+@dataclass
+class ScalingDecision:
+    """The outcome of a single autoscaler evaluation.
+
+    Parameters
+    ----------
+    queued : int
+        The number of queued jobs the fleet can serve.
+    busy : int
+        The number of fleet runners running a job.
+    current : int
+        The number of instances in the fleet.
+    desired : int
+        The number of instances the fleet should have.
+    scale_up : int
+        The number of instances to start.
+    scale_down : dict[str, str]
+        The idle instances to stop, mapped to their runner labels.
+    finished : dict[str, str]
+        The instances whose ephemeral runner has finished its job, mapped to
+        their runner labels. These are always stopped.
+    mismatched : dict[str, str]
+        The instances whose runner registered without the fleet's labels,
+        mapped to their runner labels. These can not run the queued jobs, so
+        they are always stopped, and no instances are started.
+
+    """
+
+    queued: int
+    busy: int
+    current: int
+    desired: int
+    scale_up: int = 0
+    scale_down: dict[str, str] = field(default_factory=dict)
+    finished: dict[str, str] = field(default_factory=dict)
+    mismatched: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class Autoscaler:
+    """Scale a fleet of runners to the queued job backlog.
+
+    Parameters
+    ----------
+    create_type : Type[CreateCloudInstance]
+        The type of cloud provider used to create instances.
+    stop_type : Type[StopCloudInstance]
+        The type of cloud provider used to remove instances.
+    cloud_params : dict
+        The parameters to pass to the create provider. The fleet's labels are
+        added as `runner_labels`.
+    stop_params : dict
+        The parameters to pass to the stop provider.
+    gh : GitHubInstance
+        The GitHub instance to use.
+    labels : list[str]
+        The labels carried by the fleet's runners (e.g. `["self-hosted",
+        "linux", "gpu"]`). Queued jobs requesting only these labels count
+        towards the fleet's demand. They are passed to the create provider
+        as the `runner_labels` parameter, which it must register each runner
+        with. Runners that register without them are stopped.
+    state_path : str | os.PathLike
+        The file in which the fleet is persisted between evaluations.
+    min_runners : int
+        The minimum number of instances to keep. Defaults to 0.
+    max_runners : int
+        The maximum number of instances to run. Defaults to 10.
+    cooldown : float
+        The time in seconds after scaling up during which the fleet is not
+        scaled down. Defaults to 300 seconds.
+    timeout : int
+        The timeout to use when waiting for runners to come online. Runners
+        that have not registered within this time of starting are treated as
+        finished. Defaults to 600 seconds.
+    dry_run : bool
+        If True, only report the scaling decisions without acting on them.
+        Defaults to False.
+
+    Attributes
+    ----------
+    create_type : Type[CreateCloudInstance]
+    stop_type : Type[StopCloudInstance]
+    cloud_params : dict
+    stop_params : dict
+    gh : GitHubInstance
+    labels : list[str]
+    state_path : str | os.PathLike
+    min_runners : int
+    max_runners : int
+    cooldown : float
+    timeout : int
+    dry_run : bool
+
+    """
+
+    create_type: Type[CreateCloudInstance]
+    stop_type: Type[StopCloudInstance]
+    cloud_params: dict
+    stop_params: dict
+    gh: GitHubInstance
+    labels: list[str]
+    state_path: str | os.PathLike
+    min_runners: int = 0
+    max_runners: int = 10
+    cooldown: float = 300.0
+    timeout: int = 600
+    dry_run: bool = False
+
+    def __post_init__(self):
+        if not 0 <= self.min_runners <= self.max_runners:
+            raise ValueError(
+                "Expected 0 <= min_runners <= max_runners, got "
+                f"{self.min_runners} and {self.max_runners}"
+            )
+
+    def _state(self):
+        """Lock, load and yield the fleet state, saving it on exit."""
+        return locked_json_state(
+            self.state_path, fleet={}, last_scale_up=0.0
+        )
+
+    def evaluate(self, queued: int | None = None) -> ScalingDecision:
+        """Compute the scaling decision for the current backlog.
+
+        Parameters
+        ----------
+        queued : int, optional
+            The number of queued jobs the fleet can serve. Defaults to
+            counting the queued jobs requesting only the fleet's labels.
+
+        Returns
+        -------
+        ScalingDecision
+            What the fleet should start and stop.
+
+        """
+        if queued is None:
+            (queued,) = count_queued_jobs(
+                self.gh.get_queued_jobs(), [self.labels]
+            )
+        runners = self.gh.get_runner_index(refresh=True).by_label
+        with self._state() as state:
+            fleet = dict(state["fleet"])
+            last_scale_up = state["last_scale_up"]
+        now = time.time()
+        wanted = {label.lower() for label in self.labels}
+        finished = {}
+        mismatched = {}
+        busy = {}
+        idle = {}
+        for instance_id, entry in fleet.items():
+            runner = runners.get(entry["label"])
+            if runner is None:
+                # Ephemeral runners deregister once their job is done
+                if now - entry["started"] > self.timeout:
+                    finished[instance_id] = entry["label"]
+            elif not wanted <= {label.lower() for label in runner.labels}:
+                # The runner would never pick up the jobs counted for it
+                mismatched[instance_id] = entry["label"]
+            elif runner.busy:
+                busy[instance_id] = entry["label"]
+            else:
+                idle[instance_id] = entry["label"]
+        current = len(fleet) - len(finished) - len(mismatched)
+        desired = min(
+            max(len(busy) + queued, self.min_runners), self.max_runners
+        )
+        decision = ScalingDecision(
+            queued=queued,
+            busy=len(busy),
+            current=current,
+            desired=desired,
+            finished=finished,
+            mismatched=mismatched,
+        )
+        if mismatched:
+            # Starting more would only start more runners that sit idle
+            return decision
+        if desired > current:
+            decision.scale_up = desired - current
+        elif desired < current and now - last_scale_up >= self.cooldown:
+            # Only idle runners are stopped, oldest first
+            surplus = list(idle.items())[: current - desired]
+            decision.scale_down = dict(surplus)
+        return decision
+
+    def scale(self, queued: int | None = None) -> ScalingDecision:
+        """Evaluate the backlog and start or stop instances to match it.
+
+        Parameters
+        ----------
+        queued : int, optional
+            The number of queued jobs the fleet can serve, see `evaluate`.
+
+        Returns
+        -------
+        ScalingDecision
+            The decision that was applied, or only reported in dry-run mode.
+
+        """
+        decision = self.evaluate(queued)
+        print(
+            f"Queued: {decision.queued}, busy: {decision.busy}, "
+            f"current: {decision.current}, desired: {decision.desired}"
+        )
+        if decision.mismatched:
+            error(
+                title="Runners registered without the fleet's labels",
+                message=f"Runners {', '.join(decision.mismatched.values())} "
+                f"do not carry the labels {self.labels}, check that the "
+                "provider registers its runner_labels parameter",
+            )
+        stop = {**decision.finished, **decision.mismatched}
+        stop.update(decision.scale_down)
+        if self.dry_run:
+            print(
+                f"Dry run: would start {decision.scale_up} and stop "
+                f"{len(stop)} instances"
+            )
+            return decision
+        if stop:
+            with self._state() as state:
+                for instance_id in stop:
+                    state["fleet"].pop(instance_id, None)
+            teardown = TeardownInstance(
+                provider_type=self.stop_type,
+                cloud_params=dict(self.stop_params),
+                gh=self.gh,
+            )
+            teardown.stop_runner_instances(stop)
+        if decision.scale_up > 0:
+            deploy = DeployInstance(
+                provider_type=self.create_type,
+                cloud_params={
+                    **self.cloud_params,
+                    "runner_labels": list(self.labels),
+                },
+                gh=self.gh,
+                count=decision.scale_up,
+                timeout=self.timeout,
+            )
+            started_at = time.time()
+            # Start the cooldown even if the runners fail to come online
+            with self._state() as state:
+                state["last_scale_up"] = started_at
+            try:
+                deploy.start_runner_instances()
+            finally:
+                # Record every instance created, even if the start failed.
+                # Runners that never register are stopped once they time
+                # out, like finished ones.
+                with self._state() as state:
+                    for instance_id, label in deploy.instances.items():
+                        state["fleet"][instance_id] = {
+                            "label": label,
+                            "started": started_at,
+                        }
+        return decision
+
+
+def scale_fleets(autoscalers: list[Autoscaler]) -> list[ScalingDecision]:
+    """Scale several fleets, each with its own runner labels, to one backlog.
+
+    The queued jobs are fetched once, and each job counts towards the first
+    fleet whose labels can serve it, so a job is never started twice. Order
+    the fleets from the most to the least specific labels.
+
+    Parameters
+    ----------
+    autoscalers : list[Autoscaler]
+        The autoscaler of each fleet. They must use the same repository,
+        and each its own `state_path`.
+
+    Returns
+    -------
+    list[ScalingDecision]
+        The decision applied to each fleet, in order.
+
+    Raises
+    ------
+    ValueError
+        If two fleets share a `state_path`.
+
+    """
+    paths = [os.fspath(autoscaler.state_path) for autoscaler in autoscalers]
+    if len(set(paths)) != len(paths):
+        raise ValueError("Each fleet needs its own state_path")
+    if not autoscalers:
+        return []
+    jobs = autoscalers[0].gh.get_queued_jobs()
+    counts = count_queued_jobs(
+        jobs, [autoscaler.labels for autoscaler in autoscalers]
+    )
+    return [
+        autoscaler.scale(queued)
+        for autoscaler, queued in zip(autoscalers, counts)
+    ]
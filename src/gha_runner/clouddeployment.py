@@ -1,9 +1,12 @@
+import threading
 from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor
 from abc import ABC, abstractmethod
-from gha_runner.gh import GitHubInstance, MissingRunnerLabel
+from gha_runner.gh import GitHubInstance, MissingRunnerLabel, PollStrategy
+from gha_runner.helper.timing import Timer
 from gha_runner.helper.workflow_cmds import warning, error
 from dataclasses import dataclass, field
-from typing import Type
+from typing import Iterator, Type
 
 
 class CreateCloudInstance(ABC):
@@ -41,6 +44,30 @@ class CreateCloudInstance(ABC):
         """
         raise NotImplementedError
 
+    def iter_ready(self, ids: list[str], **kwargs) -> Iterator[str]:
+        """Yield instance IDs as each instance becomes ready.
+
+        Providers that can watch instances individually should override this,
+        so runners on fast instances are not held back by slow ones. The
+        default falls back to `wait_until_ready` and yields every ID once the
+        whole batch is ready.
+
+        Parameters
+        ----------
+        ids : list[str]
+            A list of instance IDs to wait for.
+        **kwargs : dict, optional
+            Additional arguments to pass to the waiter.
+
+        Yields
+        ------
+        str
+            The ID of an instance that is ready.
+
+        """
+        self.wait_until_ready(ids, **kwargs)
+        yield from ids
+
     @abstractmethod
     def set_instance_mapping(self, mapping: dict[str, str]):
         """Set the instance mapping in the environment.
@@ -99,6 +126,42 @@ class StopCloudInstance(ABC):
         """
         raise NotImplementedError
 
+    def iter_instance_mapping(self) -> Iterator[tuple[str, str]]:
+        """Get the instance mapping from the environment, one entry at a time.
+
+        Providers that read an encoded mapping (see
+        `gha_runner.helper.mapping`) should override this to decode it with
+        `iter_mapping`, so large mappings are never fully materialized. The
+        default iterates over `get_instance_mapping`.
+
+        Yields
+        ------
+        tuple[str, str]
+            Each instance ID and its github runner label.
+
+        """
+        yield from self.get_instance_mapping().items()
+
+    def find_instances(self, labels: list[str]) -> dict[str, str]:
+        """Find the running instances started for the given runner labels.
+
+        This is used to clean up instances whose stop action never ran.
+        Providers that can look instances up by runner label (e.g. from a
+        tag) should override it; the default finds no instances.
+
+        Parameters
+        ----------
+        labels : list[str]
+            The github runner labels to look up.
+
+        Returns
+        -------
+        dict[str, str]
+            A dictionary of instance IDs and their corresponding github runner labels.
+
+        """
+        return {}
+
 
 @dataclass
 class DeployInstance:
@@ -116,6 +179,36 @@ class DeployInstance:
         The number of instances to create.
     timeout : int
         The timeout to use when waiting for the runner to come online
+    runner_version : str, optional
+        A pinned `actions/runner` version to install (e.g. "2.321.0"). If not
+        set, the latest release is looked up.
+    poll : PollStrategy
+        The strategy for polling GitHub while waiting for the runners to come
+        online. Defaults to `PollStrategy.adaptive()`.
+    token_workers : int
+        The maximum number of runner tokens to mint concurrently.
+        Defaults to 1.
+    pipeline : bool
+        If True, mint the runner tokens while looking up the runner release,
+        and poll GitHub for the runners while waiting for the instances to be
+        ready, rather than doing each step in turn. Defaults to False.
+    min_count : int, optional
+        If set, start in partial-failure mode: instances whose runner does not
+        come online are removed and created again, and the start succeeds as
+        long as at least `min_count` runners are online. Requires `stop_type`,
+        and must not be greater than `count`. The instance mapping is
+        published as soon as instances are created, and updated as failed
+        instances are removed.
+    max_retries : int
+        The number of times to retry creating the instances that failed in
+        partial-failure mode. Defaults to 2.
+    stop_type : Type[StopCloudInstance], optional
+        The type of cloud provider used to remove failed instances.
+    stop_params : dict
+        The parameters to pass to the stop provider.
+    timer : Timer
+        Records how long each phase of the start takes. A summary is written
+        to the job step summary once the runners are started.
 
 
     Attributes
@@ -127,6 +220,21 @@ class DeployInstance:
     gh : GitHubInstance
     count : int
     timeout : int
+    runner_version : str | None
+    poll : PollStrategy
+    token_workers : int
+    pipeline : bool
+    min_count : int | None
+    max_retries : int
+    stop_type : Type[StopCloudInstance] | None
+    stop_params : dict
+    timer : Timer
+    instance_states : dict[str, str]
+        The state of each instance created in partial-failure mode, one of
+        "created", "online" or "failed".
+    instances : dict[str, str]
+        Every instance created and not yet removed, with its github runner
+        label. Callers can use it to clean up after a start that failed.
 
     """
 
@@ -135,7 +243,18 @@ class DeployInstance:
     gh: GitHubInstance
     count: int
     timeout: int
+    runner_version: str | None = None
+    poll: PollStrategy = field(default_factory=PollStrategy.adaptive)
+    token_workers: int = 1
+    pipeline: bool = False
+    min_count: int | None = None
+    max_retries: int = 2
+    stop_type: Type[StopCloudInstance] | None = None
+    stop_params: dict = field(default_factory=dict)
+    timer: Timer = field(default_factory=Timer)
     provider: CreateCloudInstance = field(init=False)
+    instance_states: dict[str, str] = field(init=False, default_factory=dict)
+    instances: dict[str, str] = field(init=False, default_factory=dict)
 
     def __post_init__(self):
         """Initialize the cloud provider.
@@ -144,39 +263,303 @@ class DeployInstance:
         init the provider.
 
         """
+        if self.min_count is not None and self.stop_type is None:
+            raise ValueError("min_count requires a stop_type")
+        if self.min_count is not None and self.min_count > self.count:
+            raise ValueError(
+                f"min_count ({self.min_count}) can not be greater than "
+                f"count ({self.count})"
+            )
+        architecture = self.cloud_params.get("arch", "x64")
         # We need to create runner tokens for use by the provider
-        runner_tokens = self.gh.create_runner_tokens(self.count)
+        if self.pipeline:
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                tokens = pool.submit(self._create_runner_tokens)
+                release = pool.submit(self._get_runner_release, architecture)
+                runner_tokens = tokens.result()
+                release = release.result()
+        else:
+            runner_tokens = self._create_runner_tokens()
+            release = self._get_runner_release(architecture)
         self.cloud_params["gh_runner_tokens"] = runner_tokens
-        architecture = self.cloud_params.get("arch", "x64")
-        release = self.gh.get_latest_runner_release(
-            platform="linux", architecture=architecture
-        )
         self.cloud_params["runner_release"] = release
         self.provider = self.provider_type(**self.cloud_params)
 
-    def start_runner_instances(self):
+    def _create_runner_tokens(self) -> list[str]:
+        """Mint a registration token for each runner."""
+        with self.timer.span("create_runner_tokens", count=self.count):
+            return self.gh.create_runner_tokens(
+                self.count, max_workers=self.token_workers
+            )
+
+    def _get_runner_release(self, architecture: str) -> str:
+        """Get the runner download URL, honoring a pinned runner version."""
+        if self.runner_version is not None:
+            return GitHubInstance.get_runner_release(
+                platform="linux",
+                architecture=architecture,
+                version=self.runner_version,
+            )
+        with self.timer.span("get_runner_release", architecture=architecture):
+            return self.gh.get_latest_runner_release(
+                platform="linux", architecture=architecture
+            )
+
+    def _create_instances(
+        self, provider: CreateCloudInstance
+    ) -> dict[str, str]:
+        """Create the instances of a provider, timing the call."""
+        with self.timer.span("create_instances") as attributes:
+            mappings = provider.create_instances()
+            attributes["count"] = len(mappings)
+        return mappings
+
+    def _wait_until_ready(self, provider: CreateCloudInstance, ids: list[str]):
+        """Wait for the instances of a provider, timing the wait."""
+        with self.timer.span("wait_until_ready", count=len(ids)):
+            provider.wait_until_ready(ids)
+
+    def _wait_for_runners(
+        self, labels: list[str], cancel: threading.Event | None = None
+    ):
+        """Wait for the runners to register with GitHub, timing the wait."""
+        with self.timer.span("wait_for_runners", count=len(labels)):
+            self.gh.wait_for_runners(
+                labels, self.timeout, poll=self.poll, cancel=cancel
+            )
+
+    def _wait_pipelined(self, mappings: dict[str, str]):
+        """Poll GitHub for the runners while waiting for the instances."""
+        # A runner can only register once its instance is up, so poll
+        # GitHub while the provider waits for the instances
+        github_labels = list(mappings.values())
+        # Stop polling as soon as the instances fail to become ready
+        failed = threading.Event()
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            print("Waiting for instance to be ready...")
+            ready = pool.submit(
+                self._wait_until_ready, self.provider, list(mappings)
+            )
+            ready.add_done_callback(
+                lambda future: future.exception() and failed.set()
+            )
+            print(f"Waiting for {', '.join(github_labels)}...")
+            try:
+                self._wait_for_runners(github_labels, cancel=failed)
+            except Exception:
+                if failed.is_set():
+                    # Raise why the instances failed rather than the wait
+                    ready.result()
+                raise
+            ready.result()
+        print("Instance is ready!")
+
+    def _start_with_retries(self) -> dict[str, str]:
+        """Start the runners, retrying and cleaning up failed instances.
+
+        Returns
+        -------
+        dict[str, str]
+            A dictionary of the instance IDs and github runner labels online.
+
+        Raises
+        ------
+        RuntimeError
+            If fewer than `min_count` runners came online. Every instance
+            started is removed before raising.
+
+        """
+        online: dict[str, str] = {}
+        # Publish the instance mapping whenever it changes, so the stop
+        # action can clean up after us
+        live = self.instances
+        provider = self.provider
+        for attempt in range(self.max_retries + 1):
+            missing = self.count - len(online)
+            if missing <= 0:
+                break
+            if attempt > 0:
+                print(f"Retrying {missing} failed instances...")
+                # Providers create one instance per runner token
+                tokens = self.cloud_params["gh_runner_tokens"][:missing]
+                provider = self.provider_type(
+                    **{**self.cloud_params, "gh_runner_tokens": tokens}
+                )
+            try:
+                mappings = self._create_instances(provider)
+            except Exception as e:
+                warning(title="Failed to create instances", message=e)
+                continue
+            for instance_id in mappings:
+                self.instance_states[instance_id] = "created"
+            live.update(mappings)
+            self.provider.set_instance_mapping(dict(live))
+            registered = self._wait_for_online(provider, mappings)
+            failed = {}
+            for instance_id, label in mappings.items():
+                if label in registered:
+                    self.instance_states[instance_id] = "online"
+                    online[instance_id] = label
+                else:
+                    self.instance_states[instance_id] = "failed"
+                    failed[instance_id] = label
+            # Instances that could not be removed stay in the mapping, so the
+            # stop action tries again
+            if failed and self._remove_instances(failed):
+                for instance_id in failed:
+                    del live[instance_id]
+                self.provider.set_instance_mapping(dict(live))
+        if len(online) < self.min_count:
+            error(
+                title="Failed to start runners",
+                message=f"{len(online)} of a minimum {self.min_count} "
+                "runners came online",
+            )
+            if self._remove_instances(dict(live)):
+                live.clear()
+                self.provider.set_instance_mapping({})
+            raise RuntimeError(
+                f"Only {len(online)} of a minimum {self.min_count} runners "
+                "came online"
+            )
+        return online
+
+    def _wait_for_online(
+        self, provider: CreateCloudInstance, mappings: dict[str, str]
+    ) -> set[str]:
+        """Wait for a batch of runners and return the labels online."""
+        labels = list(mappings.values())
+        try:
+            print("Waiting for instance to be ready...")
+            self._wait_until_ready(provider, list(mappings))
+            print(f"Waiting for {', '.join(labels)}...")
+            self._wait_for_runners(labels)
+            return set(labels)
+        except Exception as e:
+            warning(title="Not all runners came online", message=e)
+        registered = self.gh.get_runner_index(refresh=True).by_label
+        return {label for label in labels if label in registered}
+
+    def _remove_instances(self, mappings: dict[str, str]) -> bool:
+        """Remove instances started by this deployment and their runners.
+
+        Errors are reported as warnings rather than raised, so that a start
+        can go on retrying.
+
+        Returns
+        -------
+        bool
+            True if the instances were removed.
+
+        """
+        if not mappings:
+            return True
+        print(f"Removing instances {', '.join(mappings)}...")
+        for label in mappings.values():
+            try:
+                self.gh.remove_runner(label)
+            except MissingRunnerLabel:
+                print(f"Runner {label} does not exist, skipping...")
+            except Exception as e:
+                warning(title="Failed to remove runner", message=e)
+        instance_ids = list(mappings)
+        try:
+            provider = self.stop_type(**self.stop_params)
+            with self.timer.span("remove_instances", count=len(instance_ids)):
+                provider.remove_instances(instance_ids)
+                provider.wait_until_removed(instance_ids)
+        except Exception as e:
+            warning(
+                title="Failed to remove instances, check your provider console",
+                message=e,
+            )
+            return False
+        return True
+
+    def _streams_readiness(self) -> bool:
+        """Check if the provider reports readiness per instance."""
+        return (
+            type(self.provider).iter_ready is not CreateCloudInstance.iter_ready
+        )
+
+    def _iter_ready_labels(self, mappings: dict[str, str]) -> Iterator[str]:
+        """Yield the runner label of each instance as it becomes ready."""
+        with self.timer.span("wait_until_ready", count=len(mappings)):
+            for instance_id in self.provider.iter_ready(list(mappings)):
+                label = mappings[instance_id]
+                print(f"Instance {instance_id} is ready!")
+                print(f"Waiting for {label}...")
+                yield label
+
+    def _wait_for_each_runner(self, mappings: dict[str, str]):
+        """Wait for each runner as soon as its instance is ready.
+
+        Each runner gets the full timeout from the moment its instance is
+        ready, rather than from when the slowest instance is ready. All the
+        runners share one poll loop, which stops as soon as the provider
+        fails to report readiness.
+
+        """
+        print("Waiting for instance to be ready...")
+        with self.timer.span("wait_for_runners", count=len(mappings)):
+            online = self.gh.wait_for_arriving_runners(
+                self._iter_ready_labels(mappings), self.timeout, poll=self.poll
+            )
+        # A provider that never reports an instance ready must not pass
+        never_ready = [
+            instance_id
+            for instance_id, label in mappings.items()
+            if label not in online
+        ]
+        if never_ready:
+            raise RuntimeError(
+                f"Instances {never_ready} were never reported ready"
+            )
+
+    def start_runner_instances(self) -> dict[str, str]:
         """Start the runner instances.
 
         This function starts the runner instances and waits for them to be ready.
 
+        Returns
+        -------
+        dict[str, str]
+            A dictionary of instance IDs and their corresponding github runner labels.
+
         """
+        try:
+            with self.timer.span("start", count=self.count):
+                return self._start_runner_instances()
+        finally:
+            self.timer.write_step_summary("Runner start timings")
+
+    def _start_runner_instances(self) -> dict[str, str]:
+        """Start the runner instances, as timed by `start_runner_instances`."""
         print("Starting up...")
         # Create a GitHub instance
         print("Creating GitHub Actions Runner")
+        if self.min_count is not None:
+            return self._start_with_retries()
 
-        mappings = self.provider.create_instances()
+        mappings = self._create_instances(self.provider)
+        self.instances.update(mappings)
         instance_ids = list(mappings.keys())
         github_labels = list(mappings.values())
         # Output the instance mapping and labels so the stop action can use them
         self.provider.set_instance_mapping(mappings)
-        # Wait for the instance to be ready
-        print("Waiting for instance to be ready...")
-        self.provider.wait_until_ready(instance_ids)
-        print("Instance is ready!")
-        # Confirm the runner is registered with GitHub
-        for label in github_labels:
-            print(f"Waiting for {label}...")
-            self.gh.wait_for_runner(label, self.timeout)
+        if self.pipeline:
+            self._wait_pipelined(mappings)
+        elif self._streams_readiness():
+            self._wait_for_each_runner(mappings)
+        else:
+            # Wait for the instance to be ready
+            print("Waiting for instance to be ready...")
+            self._wait_until_ready(self.provider, instance_ids)
+            print("Instance is ready!")
+            # Confirm the runners are registered with GitHub
+            print(f"Waiting for {', '.join(github_labels)}...")
+            self._wait_for_runners(github_labels)
+        return mappings
 
 
 @dataclass
@@ -191,6 +574,13 @@ class TeardownInstance:
         The parameters to pass to the cloud provider.
     gh : GitHubInstance
         The GitHub instance to use.
+    max_workers : int
+        The maximum number of runners to remove concurrently. When greater
+        than 1, runner removal also overlaps with instance removal.
+        Defaults to 1, which removes runners one after another.
+    timer : Timer
+        Records how long each phase of the stop takes. A summary is written
+        to the job step summary once the instances are removed.
 
     Attributes
     ----------
@@ -199,12 +589,16 @@ class TeardownInstance:
     provider_type : Type[StopCloudInstance]
     cloud_params : dict
     gh : GitHub
+    max_workers : int
+    timer : Timer
 
     """
 
     provider_type: Type[StopCloudInstance]
     cloud_params: dict
     gh: GitHubInstance
+    max_workers: int = 1
+    timer: Timer = field(default_factory=Timer)
     provider: StopCloudInstance = field(init=False)
 
     def __post_init__(self):
@@ -216,42 +610,85 @@ class TeardownInstance:
         """
         self.provider = self.provider_type(**self.cloud_params)
 
-    def stop_runner_instances(self):
+    def _remove_runner(self, label: str):
+        """Remove a single runner, logging instead of raising on failure.
+
+        Parameters
+        ----------
+        label : str
+            The label of the runner to remove.
+
+        """
+        try:
+            print(f"Removing runner {label}")
+            with self.timer.span("remove_runner", label=label):
+                self.gh.remove_runner(label)
+        # This occurs when we have a runner that might already be shutdown.
+        # Since we are mainly using the ephemeral runners, we expect this to happen
+        except MissingRunnerLabel:
+            print(f"Runner {label} does not exist, skipping...")
+        # This is more of the case when we have a failure to remove the runner
+        # This is not a concern for the user (because we will remove the instance anyways),
+        # but we should log it for debugging purposes.
+        except Exception as e:
+            warning(title="Failed to remove runner", message=e)
+
+    def stop_runner_instances(self, mappings: dict[str, str] | None = None):
         """Stop the runner instances.
 
         This function stops the runner instances and waits for them to be removed.
 
+        Parameters
+        ----------
+        mappings : dict[str, str], optional
+            A dictionary of instance IDs and their corresponding github runner
+            labels to stop. Defaults to the provider's instance mapping.
+
         """
-        print("Shutting down...")
         try:
-            # Get the instance mapping from our input
-            mappings = self.provider.get_instance_mapping()
-        except Exception as e:
-            error(title="Malformed instance mapping", message=e)
-            exit(1)
-        # Remove the runners and instances
-        print("Removing GitHub Actions Runner")
-        instance_ids = list(mappings.keys())
-        labels = list(mappings.values())
-        for label in labels:
+            with self.timer.span("stop"):
+                self._stop_runner_instances(mappings)
+        finally:
+            self.timer.write_step_summary("Runner stop timings")
+
+    def _remove_instances(self, instance_ids: list[str]):
+        """Remove the instances, timing the call."""
+        print("Removing instances...")
+        with self.timer.span("remove_instances", count=len(instance_ids)):
+            self.provider.remove_instances(instance_ids)
+
+    def _stop_runner_instances(self, mappings: dict[str, str] | None):
+        """Stop the runner instances, as timed by `stop_runner_instances`."""
+        print("Shutting down...")
+        if mappings is None:
+            instance_ids = []
+            labels = []
             try:
-                print(f"Removing runner {label}")
-                self.gh.remove_runner(label)
-            # This occurs when we have a runner that might already be shutdown.
-            # Since we are mainly using the ephemeral runners, we expect this to happen
-            except MissingRunnerLabel:
-                print(f"Runner {label} does not exist, skipping...")
-                continue
-            # This is more of the case when we have a failure to remove the runner
-            # This is not a concern for the user (because we will remove the instance anyways),
-            # but we should log it for debugging purposes.
+                # Decode the instance mapping from our input as it is read
+                for instance_id, label in self.provider.iter_instance_mapping():
+                    instance_ids.append(instance_id)
+                    labels.append(label)
             except Exception as e:
-                warning(title="Failed to remove runner", message=e)
-        print("Removing instances...")
-        self.provider.remove_instances(instance_ids)
+                error(title="Malformed instance mapping", message=e)
+                exit(1)
+        else:
+            instance_ids = list(mappings.keys())
+            labels = list(mappings.values())
+        # Remove the runners and instances
+        print("Removing GitHub Actions Runner")
+        if self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                pool.map(self._remove_runner, labels)
+                # Terminate the instances while the runners are removed
+                self._remove_instances(instance_ids)
+        else:
+            for label in labels:
+                self._remove_runner(label)
+            self._remove_instances(instance_ids)
         print("Waiting for instance to be removed...")
         try:
-            self.provider.wait_until_removed(instance_ids)
+            with self.timer.span("wait_until_removed", count=len(instance_ids)):
+                self.provider.wait_until_removed(instance_ids)
         except Exception as e:
             # Print to stdout
             print(
@@ -1,14 +1,27 @@
 """Module to manage GitHub repository actions through the GitHub API."""
 
 import collections.abc
+import json
+import math
+import os
+import queue
 import random
 import string
+import threading
 import time
 import urllib.parse
+from collections import OrderedDict
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from json import JSONDecodeError
+from pathlib import Path
+from typing import Any
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from gha_runner.metrics import RequestMetrics
 
 
 class TokenRetrievalError(Exception):
@@ -29,6 +42,341 @@ class SelfHostedRunner:
     name: str
     os: str
     labels: list[str]
+    status: str = "online"
+    busy: bool = False
+
+
+@dataclass
+class WorkflowJob:
+    id: int
+    run_id: int
+    name: str
+    status: str
+    labels: list[str]
+
+
+@dataclass
+class PollStrategy:
+    """The intervals between checks while waiting for runners.
+
+    Starting at `initial`, each interval is multiplied by `factor` up to
+    `max_interval`, then randomly scaled by up to `jitter` either way so that
+    many waiters do not poll in lockstep.
+
+    Parameters
+    ----------
+    initial : float
+        The first interval in seconds.
+    factor : float
+        The growth factor applied after each check.
+    max_interval : float
+        The largest interval in seconds, before jitter.
+    jitter : float
+        The fraction by which each interval is randomly scaled.
+
+    Examples
+    --------
+    >>> gh.wait_for_runner("runner-abc", timeout=300,
+    ...                    poll=PollStrategy.adaptive())
+
+    """
+
+    initial: float = 15.0
+    factor: float = 1.0
+    max_interval: float = 15.0
+    jitter: float = 0.0
+
+    @classmethod
+    def fixed(cls, interval: float) -> "PollStrategy":
+        """Poll at a fixed interval, the historical behaviour."""
+        return cls(interval, 1.0, interval, 0.0)
+
+    @classmethod
+    def adaptive(
+        cls,
+        initial: float = 1.0,
+        factor: float = 2.0,
+        max_interval: float = 60.0,
+        jitter: float = 0.2,
+    ) -> "PollStrategy":
+        """Poll quickly at first, backing off exponentially with jitter.
+
+        The interval grows past the fixed 15 seconds of `fixed`, so that long
+        waits make fewer calls than fixed polling, not only short ones.
+
+        """
+        return cls(initial, factor, max_interval, jitter)
+
+    def intervals(self) -> collections.abc.Iterator[float]:
+        """Yield the interval in seconds before each successive check."""
+        interval = self.initial
+        while True:
+            scale = random.uniform(1 - self.jitter, 1 + self.jitter)
+            yield max(interval * scale, 0.0)
+            interval = min(interval * self.factor, self.max_interval)
+
+
+@dataclass
+class CachedResponse:
+    """A cached GET response used for conditional requests.
+
+    Parameters
+    ----------
+    etag : str | None
+        The ETag header of the response.
+    last_modified : str | None
+        The Last-Modified header of the response.
+    body : Any
+        The decoded response body.
+
+    """
+
+    etag: str | None
+    last_modified: str | None
+    body: Any
+
+
+@dataclass
+class RateLimit:
+    """The primary rate limit budget reported by the GitHub API.
+
+    Attributes
+    ----------
+    limit : int | None
+        The number of requests allowed per window, from `X-RateLimit-Limit`.
+    remaining : int | None
+        The number of requests left in the window, from
+        `X-RateLimit-Remaining`.
+    reset : float | None
+        The epoch time at which the window resets, from `X-RateLimit-Reset`.
+
+    """
+
+    limit: int | None = None
+    remaining: int | None = None
+    reset: float | None = None
+
+    def update(self, headers: collections.abc.Mapping):
+        """Update the budget from the headers of a response.
+
+        Responses without rate limit headers leave the budget unchanged.
+
+        """
+        try:
+            if "X-RateLimit-Limit" in headers:
+                self.limit = int(headers["X-RateLimit-Limit"])
+            if "X-RateLimit-Remaining" in headers:
+                self.remaining = int(headers["X-RateLimit-Remaining"])
+            if "X-RateLimit-Reset" in headers:
+                self.reset = float(headers["X-RateLimit-Reset"])
+        except ValueError:
+            pass
+
+    def pacing_delay(self, threshold: int) -> float:
+        """Return how long to wait so the budget lasts until it resets.
+
+        Parameters
+        ----------
+        threshold : int
+            The remaining budget below which requests are paced.
+
+        Returns
+        -------
+        float
+            The delay in seconds, 0 if the budget is above the threshold.
+
+        """
+        if self.remaining is None or self.reset is None:
+            return 0.0
+        if self.remaining >= threshold:
+            return 0.0
+        time_left = self.reset - time.time()
+        if time_left <= 0:
+            return 0.0
+        return time_left / (self.remaining + 1)
+
+
+@dataclass
+class RunnerIndex:
+    """Lookup tables for the self-hosted runners of a repository.
+
+    Parameters
+    ----------
+    by_label : dict[str, SelfHostedRunner]
+        A mapping of each runner label to its runner.
+    by_id : dict[int, SelfHostedRunner]
+        A mapping of each runner ID to its runner.
+    created_at : float
+        The `time.monotonic` timestamp at which the index was built.
+
+    """
+
+    by_label: dict[str, SelfHostedRunner]
+    by_id: dict[int, SelfHostedRunner]
+    created_at: float
+
+    @classmethod
+    def from_runners(
+        cls, runners: list[SelfHostedRunner] | None
+    ) -> "RunnerIndex":
+        """Build an index from a list of runners.
+
+        If several runners share a label, the first one listed wins, matching
+        the lookup order of a linear scan.
+
+        """
+        by_label: dict[str, SelfHostedRunner] = {}
+        by_id: dict[int, SelfHostedRunner] = {}
+        for runner in runners or []:
+            by_id[runner.id] = runner
+            for label in runner.labels:
+                by_label.setdefault(label, runner)
+        return cls(by_label, by_id, time.monotonic())
+
+    def age(self) -> float:
+        """Return the age of the index in seconds."""
+        return time.monotonic() - self.created_at
+
+    def discard(self, runner: SelfHostedRunner):
+        """Remove a runner from the index."""
+        self.by_id.pop(runner.id, None)
+        for label in runner.labels:
+            if self.by_label.get(label) is runner:
+                del self.by_label[label]
+
+
+SUPPORTED_RUNNER_PLATFORMS = {"linux": ["x64", "arm", "arm64"]}
+MAX_RUNNERS_PER_PAGE = 100
+
+
+def _github_headers(token: str, header_kwargs: dict | None = None) -> dict:
+    """Generate headers for API requests, adding authorization and specific API version.
+
+    Shared by the synchronous and asynchronous clients.
+
+    Parameters
+    ----------
+    token : str
+        The GitHub API token to authorize with.
+    header_kwargs : dict, optional
+        Additional headers to include in the request.
+
+    Returns
+    -------
+    dict
+        Headers including authorization, API version, and any additional headers.
+
+    """
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "X-Github-Api-Version": "2022-11-28",
+        "Accept": "application/vnd.github+json",
+    }
+    headers.update(header_kwargs or {})
+    return headers
+
+
+def _parse_runner_page(res) -> tuple[int, list[SelfHostedRunner]]:
+    """Parse a page of the runner listing API.
+
+    Parameters
+    ----------
+    res : Any
+        The decoded response body.
+
+    Returns
+    -------
+    tuple[int, list[SelfHostedRunner]]
+        The total number of runners in the repository and the runners on
+        this page.
+
+    Raises
+    ------
+    RunnerListError
+        If the response is not a mapping object.
+
+    """
+    # This allows for arbitrary mappable objects to be used
+    if not isinstance(res, collections.abc.Mapping):
+        # This could be related to the API or the request itself.
+        # ie the response is not a JSON object
+        raise RunnerListError(f"Did not receive mapping object: {res}")
+    runners = []
+    for runner in res["runners"]:
+        id = runner["id"]
+        name = runner["name"]
+        os = runner["os"]
+        labels = [label["name"] for label in runner["labels"]]
+        status = runner.get("status", "online")
+        busy = runner.get("busy", False)
+        runners.append(SelfHostedRunner(id, name, os, labels, status, busy))
+    return res["total_count"], runners
+
+
+def _check_runner_platform(platform: str, architecture: str):
+    """Check that a runner platform and architecture are supported.
+
+    Raises
+    ------
+    ValueError
+        If the platform or architecture is not supported.
+
+    """
+    supported_platforms = SUPPORTED_RUNNER_PLATFORMS
+    if platform not in supported_platforms:
+        raise ValueError(
+            f"Platform '{platform}' not supported. "
+            f"Supported platforms are {list(supported_platforms)}"
+        )
+    if architecture not in supported_platforms[platform]:
+        raise ValueError(
+            f"Architecture '{architecture}' not supported for platform '{platform}'. "
+            f"Supported architectures are {supported_platforms[platform]}"
+        )
+
+
+def _find_runner_asset(release: dict, platform: str, architecture: str) -> str:
+    """Find the runner download URL in an `actions/runner` release.
+
+    Raises
+    ------
+    RuntimeError
+        If the runner is not found for the given platform and architecture.
+
+    """
+    for asset in release["assets"]:
+        if platform in asset["name"] and architecture in asset["name"]:
+            return asset["browser_download_url"]
+    raise RuntimeError(
+        f"Runner release not found for platform {platform} and architecture {architecture}"
+    )
+
+
+def _read_release_cache(path: Path, ttl: float) -> str | None:
+    """Read a persisted runner release URL if it is younger than `ttl`.
+
+    Missing, expired or malformed cache files are treated as a cache miss.
+
+    """
+    try:
+        cached = json.loads(path.read_text())
+        if time.time() - cached["fetched_at"] < ttl:
+            return cached["url"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def _write_release_cache(path: Path, url: str):
+    """Persist a runner release URL, replacing the cache file atomically."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"url": url, "fetched_at": time.time()}))
+        os.replace(tmp, path)
+    except OSError as e:
+        # The cache is an optimization, so a read-only host is not an error
+        print(f"Unable to cache runner release in {path}: {e}")
 
 
 class GitHubInstance:
@@ -40,23 +388,171 @@ class GitHubInstance:
         GitHub API token for authentication.
     repo : str
         Full name of the GitHub repository in the format "owner/repo".
+    pool_size : int
+        The maximum number of pooled connections kept alive to the GitHub API.
+        Defaults to 10.
+    max_retries : int
+        The number of times to retry a request that failed with a transient
+        server error (502, 503 or 504). Defaults to 3.
+    backoff_factor : float
+        The backoff factor between retries, see `urllib3.util.Retry`.
+        Defaults to 0.5.
+    runner_cache_ttl : float
+        The time in seconds a runner listing is reused by `get_runner` and
+        `remove_runner`. Set to 0 to always fetch a fresh listing.
+        Defaults to 30 seconds.
+    runners_per_page : int
+        The page size used when listing runners, up to the API maximum of
+        100. Defaults to 30, the API default.
+    page_workers : int
+        The maximum number of runner pages fetched concurrently. Set to 1 to
+        fetch pages one after another. Defaults to 4.
+    etag_cache_size : int
+        The maximum number of GET responses kept for conditional requests,
+        evicting the least recently used. Set to 0 to disable conditional
+        requests. Defaults to 128.
+    release_cache_dir : str | os.PathLike, optional
+        A directory in which the latest runner release URL is persisted, so
+        repeated starts on the same host skip the lookup. Disabled by default.
+    release_cache_ttl : float
+        The time in seconds a persisted runner release URL is reused.
+        Defaults to 1 hour.
+    rate_limit_threshold : int
+        The remaining rate limit budget below which requests are paced until
+        the budget resets. Defaults to 50.
+    rate_limit_retries : int
+        The number of times to retry a rate limited request. Defaults to 3.
+    rate_limit_backoff : float
+        The initial backoff in seconds when a secondary rate limit does not
+        say how long to wait. Doubles on each retry. Defaults to 60 seconds.
+    max_rate_limit_wait : float
+        The maximum time in seconds to wait before a single request.
+        Defaults to 300 seconds.
 
     Attributes
     ----------
     headers : dict
         Headers for HTTP requests to GitHub API.
-    github : Github
-        Instance of Github object for interacting with the GitHub API.
+    session : requests.Session
+        The pooled session used for all requests to the GitHub API.
+    cache_hits : int
+        The number of runner lookups served from the cached index.
+    cache_misses : int
+        The number of runner lookups that required a fresh listing.
+    rate_limit : RateLimit
+        The rate limit budget reported by the latest API response.
+    metrics : RequestMetrics
+        The count, latency, response size, status codes and retries of the
+        requests made, by endpoint template.
 
+    Examples
+    --------
+    The session is closed when leaving the context manager:
+
+    >>> with GitHubInstance(token="...", repo="owner/repo") as gh:
+    ...     runners = gh.get_runners()
 
     """
 
     BASE_URL = "https://api.github.com"
 
-    def __init__(self, token: str, repo: str):
+    def __init__(
+        self,
+        token: str,
+        repo: str,
+        pool_size: int = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        runner_cache_ttl: float = 30.0,
+        runners_per_page: int = 30,
+        page_workers: int = 4,
+        etag_cache_size: int = 128,
+        release_cache_dir: str | os.PathLike | None = None,
+        release_cache_ttl: float = 3600.0,
+        rate_limit_threshold: int = 50,
+        rate_limit_retries: int = 3,
+        rate_limit_backoff: float = 60.0,
+        max_rate_limit_wait: float = 300.0,
+    ):
+        if not 1 <= runners_per_page <= MAX_RUNNERS_PER_PAGE:
+            raise ValueError(
+                f"runners_per_page must be between 1 and "
+                f"{MAX_RUNNERS_PER_PAGE}, got {runners_per_page}"
+            )
         self.token = token
         self.headers = self._headers({})
         self.repo = repo
+        self.session = self._create_session(
+            pool_size, max_retries, backoff_factor
+        )
+        self.runner_cache_ttl = runner_cache_ttl
+        self.runners_per_page = runners_per_page
+        self.page_workers = page_workers
+        self.etag_cache_size = etag_cache_size
+        self._etag_cache: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._etag_cache_lock = threading.Lock()
+        self.release_cache_dir = release_cache_dir
+        self.release_cache_ttl = release_cache_ttl
+        self.rate_limit = RateLimit()
+        self.rate_limit_threshold = rate_limit_threshold
+        self.rate_limit_retries = rate_limit_retries
+        self.rate_limit_backoff = rate_limit_backoff
+        self.max_rate_limit_wait = max_rate_limit_wait
+        self.metrics = RequestMetrics()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._runner_index: RunnerIndex | None = None
+        self._runner_index_lock = threading.Lock()
+        # The epoch time of the latest send slot handed out by _pacing_wait
+        self._last_send = 0.0
+        self._pacing_lock = threading.Lock()
+
+    def __enter__(self) -> "GitHubInstance":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the pooled session and release its connections."""
+        self.session.close()
+
+    @staticmethod
+    def _create_session(
+        pool_size: int, max_retries: int, backoff_factor: float
+    ) -> requests.Session:
+        """Create a session with a keep-alive connection pool.
+
+        Parameters
+        ----------
+        pool_size : int
+            The maximum number of connections to keep in the pool.
+        max_retries : int
+            The number of retries for transient server errors.
+        backoff_factor : float
+            The backoff factor between retries.
+
+        Returns
+        -------
+        requests.Session
+            A session with a retrying, pooled adapter mounted for HTTPS.
+
+        """
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(502, 503, 504),
+            # Return the last response so _do_request can report the error
+            raise_on_status=False,
+            # Rate limited responses are retried by _send instead
+            respect_retry_after_header=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_size, max_retries=retry
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        return session
 
     def _headers(self, header_kwargs):
         """Generate headers for API requests, adding authorization and specific API version.
@@ -74,33 +570,189 @@ class GitHubInstance:
             Headers including authorization, API version, and any additional headers.
 
         """
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "X-Github-Api-Version": "2022-11-28",
-            "Accept": "application/vnd.github+json",
-        }
-        headers.update(header_kwargs)
-        return headers
-
-    def _do_request(self, func, endpoint, **kwargs):
+        return _github_headers(self.token, header_kwargs)
+
+    def _do_request(self, method: str, endpoint, **kwargs):
         """Make a request to the GitHub API.
 
+        GET requests are sent as conditional requests when a previous response
+        for the endpoint carried an ETag or Last-Modified header. A 304 Not
+        Modified response returns the cached body, and does not count against
+        the rate limit.
+
+        Requests are paced and retried according to the rate limit budget,
+        see `_send`.
+
         This can be removed if this is added into PyGitHub.
         """
         endpoint_url = urllib.parse.urljoin(self.BASE_URL, endpoint)
         headers = self.headers
-        resp: requests.Response = func(endpoint_url, headers=headers, **kwargs)
+        cacheable = (
+            method == "GET"
+            and self.etag_cache_size > 0
+            and "params" not in kwargs
+        )
+        cached = None
+        if cacheable:
+            cached = self._get_cached_response(endpoint_url)
+        if cached is not None:
+            headers = dict(headers)
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+        resp = self._send(method, endpoint_url, headers=headers, **kwargs)
+        if cached is not None and resp.status_code == 304:
+            return cached.body
         if not resp.ok:
             raise RuntimeError(
                 f"Error in API call for {endpoint_url}: " f"{resp.content}"
             )
         else:
             try:
-                return resp.json()
+                body = resp.json()
             except JSONDecodeError:
                 return resp.content
+            if cacheable:
+                self._cache_response(endpoint_url, resp, body)
+            return body
+
+    def _send(self, method: str, endpoint_url: str, **kwargs):
+        """Send a request, pacing and retrying it around rate limits.
+
+        When the remaining primary rate limit budget drops below
+        `rate_limit_threshold`, requests are spread evenly over the time left
+        until the budget resets. Responses rejected by a primary or secondary
+        rate limit are retried up to `rate_limit_retries` times, waiting for
+        `Retry-After`, the budget reset, or an exponential backoff.
+
+        Each call is recorded in `metrics`, with its latency including any
+        retries.
+
+        Returns
+        -------
+        requests.Response
+            The last response received.
+
+        """
+        attempt = 0
+        retries = 0
+        start = time.perf_counter()
+        while True:
+            pause = self._pacing_wait()
+            if pause > 0:
+                time.sleep(pause)
+            try:
+                resp: requests.Response = self.session.request(
+                    method, endpoint_url, **kwargs
+                )
+            except Exception:
+                self.metrics.record(
+                    method,
+                    endpoint_url,
+                    None,
+                    time.perf_counter() - start,
+                    retries=retries + attempt,
+                )
+                raise
+            self.rate_limit.update(resp.headers)
+            # Transient server errors are retried by the adapter
+            server_retries = getattr(resp.raw, "retries", None)
+            if server_retries is not None:
+                retries += len(server_retries.history)
+            delay = self._rate_limit_retry_delay(resp, attempt)
+            if delay is None or attempt >= self.rate_limit_retries:
+                self.metrics.record(
+                    method,
+                    endpoint_url,
+                    resp.status_code,
+                    time.perf_counter() - start,
+                    response_bytes=len(resp.content),
+                    retries=retries + attempt,
+                    rate_limit_remaining=self.rate_limit.remaining,
+                )
+                return resp
+            delay = min(delay, self.max_rate_limit_wait)
+            print(f"Rate limited by the GitHub API, retrying in {delay:.0f}s")
+            time.sleep(delay)
+            attempt += 1
+
+    def _pacing_wait(self) -> float:
+        """Reserve the next send slot and return how long to wait for it.
 
-    def create_runner_tokens(self, count: int) -> list[str]:
+        While the budget is paced, each slot is at least the pacing delay
+        after the previous one, so concurrent requests are spaced out rather
+        than all sleeping the same delay and then sending at once.
+
+        """
+        with self._pacing_lock:
+            now = time.time()
+            delay = self.rate_limit.pacing_delay(self.rate_limit_threshold)
+            wait = 0.0
+            if delay > 0:
+                wait = self._last_send + delay - now
+                wait = min(max(wait, 0.0), self.max_rate_limit_wait)
+            self._last_send = max(self._last_send, now + wait)
+            return wait
+
+    def _rate_limit_retry_delay(
+        self, resp: requests.Response, attempt: int
+    ) -> float | None:
+        """Return how long to wait before retrying a rate limited response.
+
+        Returns
+        -------
+        float | None
+            The delay in seconds, or None if the response was not rate limited.
+
+        """
+        if resp.status_code not in (403, 429):
+            return None
+        retry_after = resp.headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                return max(float(retry_after), 0.0)
+            except ValueError:
+                pass
+        if self.rate_limit.remaining == 0 and self.rate_limit.reset:
+            # Wait until just after the primary budget resets
+            return max(self.rate_limit.reset - time.time(), 0.0) + 1
+        if resp.status_code == 429 or b"secondary rate limit" in (
+            resp.content.lower()
+        ):
+            return self.rate_limit_backoff * 2**attempt
+        # A plain 403 is a permission error, which retrying will not fix
+        return None
+
+    def _get_cached_response(
+        self, endpoint_url: str
+    ) -> CachedResponse | None:
+        """Get the cached response for an endpoint, marking it recently used."""
+        with self._etag_cache_lock:
+            cached = self._etag_cache.get(endpoint_url)
+            if cached is not None:
+                self._etag_cache.move_to_end(endpoint_url)
+            return cached
+
+    def _cache_response(
+        self, endpoint_url: str, resp: requests.Response, body
+    ):
+        """Cache a response body if it carries validators, evicting the LRU."""
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        with self._etag_cache_lock:
+            self._etag_cache[endpoint_url] = CachedResponse(
+                etag, last_modified, body
+            )
+            self._etag_cache.move_to_end(endpoint_url)
+            while len(self._etag_cache) > self.etag_cache_size:
+                self._etag_cache.popitem(last=False)
+
+    def create_runner_tokens(
+        self, count: int, max_workers: int = 1
+    ) -> list[str]:
         """Generate registration tokens for GitHub Actions runners.
         This can be removed if this is added into PyGitHub.
 
@@ -108,21 +760,46 @@ class GitHubInstance:
         ----------
         count : int
             The number of runner tokens to generate.
+        max_workers : int
+            The maximum number of tokens to request concurrently. Defaults to
+            1, which requests the tokens one after another.
         Returns
         -------
         list[str]
-            A list of runner registration tokens.
+            A list of runner registration tokens, in request order.
         Raises
         ------
-        TokenCreationError
-            If there is an error generating the tokens.
+        TokenRetrievalError
+            If there is an error generating the tokens. Remaining requests are
+            cancelled and the message reports how many tokens were created.
 
         """
-        tokens = []
-        for _ in range(count):
-            token = self.create_runner_token()
-            tokens.append(token)
-        return tokens
+        if max_workers <= 1 or count <= 1:
+            tokens = []
+            for _ in range(count):
+                try:
+                    tokens.append(self.create_runner_token())
+                except TokenRetrievalError as e:
+                    raise TokenRetrievalError(
+                        f"Created {len(tokens)} of {count} runner tokens: {e}"
+                    ) from e
+            return tokens
+        with ThreadPoolExecutor(max_workers=min(max_workers, count)) as pool:
+            futures = [
+                pool.submit(self.create_runner_token) for _ in range(count)
+            ]
+            _, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in not_done:
+                future.cancel()
+        # Requests that were already in flight have finished at this point
+        finished = [f for f in futures if not f.cancelled()]
+        errors = [f.exception() for f in finished if f.exception()]
+        if errors:
+            created = len(finished) - len(errors)
+            raise TokenRetrievalError(
+                f"Created {created} of {count} runner tokens: {errors[0]}"
+            ) from errors[0]
+        return [future.result() for future in futures]
 
     def create_runner_token(self) -> str:
         """Generate a registration token for GitHub Actions runners.
@@ -159,10 +836,10 @@ class GitHubInstance:
             The endpoint to make the request to.
         **kwargs : dict, optional
             Additional keyword arguments to pass to the request.
-            See the requests.post documentation for more information.
+            See the requests.Session.request documentation for more information.
 
         """
-        return self._do_request(requests.post, endpoint, **kwargs)
+        return self._do_request("POST", endpoint, **kwargs)
 
     def get(self, endpoint, **kwargs):
         """Make a GET request to the GitHub API.
@@ -173,9 +850,9 @@ class GitHubInstance:
             The endpoint to make the request to.
         **kwargs : dict, optional
             Additional keyword arguments to pass to the request.
-            See the requests.get documentation for more information.
+            See the requests.Session.request documentation for more information.
         """
-        return self._do_request(requests.get, endpoint, **kwargs)
+        return self._do_request("GET", endpoint, **kwargs)
 
     def delete(self, endpoint, **kwargs):
         """Make a DELETE request to the GitHub API.
@@ -186,13 +863,44 @@ class GitHubInstance:
             The endpoint to make the request to.
         **kwargs : dict, optional
             Additional keyword arguments to pass to the request.
-            See the requests.delete documentation for more information.
+            See the requests.Session.request documentation for more information.
+        """
+        return self._do_request("DELETE", endpoint, **kwargs)
+
+    def _get_runner_page(
+        self, page: int, per_page: int
+    ) -> tuple[int, list[SelfHostedRunner]]:
+        """Get a single page of the self-hosted runners in the repository.
+
+        Returns
+        -------
+        tuple[int, list[SelfHostedRunner]]
+            The total number of runners and the runners on this page.
+
+        Raises
+        ------
+        RunnerListError
+            If there is an error getting the page of runners.
+
         """
-        return self._do_request(requests.delete, endpoint, **kwargs)
+        try:
+            res = self.get(
+                f"repos/{self.repo}/actions/runners"
+                f"?per_page={per_page}&page={page}"
+            )
+        except RuntimeError as e:
+            # This occurs when we receive a status code is > 400
+            raise RunnerListError(f"Error getting runners: {e}")
+            # Other exceptions are bubbled up to the caller
+        return _parse_runner_page(res)
 
     def get_runners(self) -> list[SelfHostedRunner] | None:
         """Get a list of self-hosted runners in the repository.
 
+        The first page is fetched to learn the total number of runners, after
+        which the remaining pages are fetched concurrently using up to
+        `page_workers` threads and merged in page order.
+
         Returns
         -------
         list[SelfHostedRunner] | None
@@ -205,39 +913,106 @@ class GitHubInstance:
             If there is an error getting the list of runners. Either because of
             an error in the request or the response is not a mapping object.
         """
-        runners = []
-        per_page = 30 # GH API default
-        page = 1
-        total_runners = float("inf")
-        # paginate through the pages until we have all the runners
-        while (len(runners) < total_runners):
-            try:
-                res = self.get(f"repos/{self.repo}/actions/runners?per_page={per_page}&page={page}")
-                # This allows for arbitrary mappable objects to be used
-                if not isinstance(res, collections.abc.Mapping):
-                    # This could be related to the API or the request itself.
-                    # ie the response is not a JSON object
-                    raise RunnerListError(f"Did not receive mapping object: {res}")
-                total_runners = res["total_count"]
-                page += 1
-                # protect from bug/issue where total_count is higher than actual # of runners
-                if len(res["runners"]) < 1:
+        per_page = self.runners_per_page
+        total_runners, runners = self._get_runner_page(1, per_page)
+        next_page = 2
+        # protect from bug/issue where total_count is higher than actual # of runners
+        exhausted = len(runners) < 1
+        if not exhausted and self.page_workers > 1:
+            # total_count is known now, so fetch the remaining pages at once
+            last_page = math.ceil(total_runners / per_page)
+            with ThreadPoolExecutor(max_workers=self.page_workers) as pool:
+                pages = list(
+                    pool.map(
+                        lambda page: self._get_runner_page(page, per_page),
+                        range(next_page, last_page + 1),
+                    )
+                )
+            for total_runners, page_runners in pages:
+                next_page += 1
+                if len(page_runners) < 1:
+                    exhausted = True
                     break
-                for runner in res["runners"]:
-                    id = runner["id"]
-                    name = runner["name"]
-                    os = runner["os"]
-                    labels = [label["name"] for label in runner["labels"]]
-                    runners.append(SelfHostedRunner(id, name, os, labels))
-            except RuntimeError as e:
-                # This occurs when we receive a status code is > 400
-                raise RunnerListError(f"Error getting runners: {e}")
-                # Other exceptions are bubbled up to the caller
+                runners.extend(page_runners)
+        # paginate through the pages until we have all the runners, this also
+        # picks up runners registered while the pages above were fetched
+        while not exhausted and len(runners) < total_runners:
+            total_runners, page_runners = self._get_runner_page(
+                next_page, per_page
+            )
+            next_page += 1
+            if len(page_runners) < 1:
+                break
+            runners.extend(page_runners)
         return runners if len(runners) > 0 else None
 
-    def get_runner(self, label: str) -> SelfHostedRunner:
+    def get_runner_index(self, refresh: bool = False) -> RunnerIndex:
+        """Get the label and ID index of the runners in the repository.
+
+        The index is built from a single `get_runners` listing and reused
+        until it is older than `runner_cache_ttl`.
+
+        Parameters
+        ----------
+        refresh : bool
+            If True, always rebuild the index from a fresh listing.
+
+        Returns
+        -------
+        RunnerIndex
+            The index of the runners in the repository.
+
+        """
+        # Concurrent lookups share a single listing instead of racing
+        with self._runner_index_lock:
+            index = self._runner_index
+            if (
+                refresh
+                or index is None
+                or index.age() >= self.runner_cache_ttl
+            ):
+                self.cache_misses += 1
+                index = RunnerIndex.from_runners(self.get_runners())
+                self._runner_index = index
+            else:
+                self.cache_hits += 1
+            return index
+
+    def _runner_index_since(self, since: float) -> RunnerIndex:
+        """Get a runner index built at or after the `time.monotonic` `since`.
+
+        Concurrent callers with the same `since` share a single listing.
+
+        """
+        with self._runner_index_lock:
+            index = self._runner_index
+            if index is None or index.created_at < since:
+                self.cache_misses += 1
+                index = RunnerIndex.from_runners(self.get_runners())
+                self._runner_index = index
+            return index
+
+    def invalidate_runner_index(self):
+        """Discard the cached runner index."""
+        with self._runner_index_lock:
+            self._runner_index = None
+
+    def get_runner(
+        self, label: str, refresh: bool = False
+    ) -> SelfHostedRunner:
         """Get a runner by a given label for a repository.
 
+        A runner missing from the cached index may have registered since
+        it was built, so the index is rebuilt once before giving up.
+
+        Parameters
+        ----------
+        label : str
+            The label of the runner.
+        refresh : bool
+            If True, look the runner up in a fresh listing instead of the
+            cached index.
+
         Returns
         -------
         SelfHostedRunner
@@ -249,15 +1024,22 @@ class GitHubInstance:
             If the runner with the given label is not found.
 
         """
-        runners = self.get_runners()
-        if runners is not None:
-            for runner in runners:
-                if label in runner.labels:
-                    return runner
-        raise MissingRunnerLabel(f"Runner {label} not found")
+        requested_at = time.monotonic()
+        runner = self.get_runner_index(refresh=refresh).by_label.get(label)
+        if runner is None:
+            # Only lists again if the index predates this lookup
+            index = self._runner_index_since(requested_at)
+            runner = index.by_label.get(label)
+        if runner is None:
+            raise MissingRunnerLabel(f"Runner {label} not found")
+        return runner
 
     def wait_for_runner(
-        self, label: str, timeout: int, wait: int = 15
+        self,
+        label: str,
+        timeout: int,
+        wait: int = 15,
+        poll: PollStrategy | None = None,
     ) -> SelfHostedRunner:
         """Wait for the runner with the given label to be online.
 
@@ -269,6 +1051,9 @@ class GitHubInstance:
             The time in seconds to wait between checks. Defaults to 15 seconds.
         timeout : int
             The maximum time in seconds to wait for the runner to be online.
+        poll : PollStrategy, optional
+            The strategy for the time between checks. Overrides `wait`.
+            No sleep extends past `timeout`.
 
         Returns
         -------
@@ -276,26 +1061,216 @@ class GitHubInstance:
             The runner with the given label.
 
         """
+        intervals = (poll or PollStrategy.fixed(wait)).intervals()
         max = time.time() + timeout
+        print(f"Waiting for runner {label}...")
+        while True:
+            # Check after every sleep, including the last one up to `timeout`
+            try:
+                return self.get_runner(label, refresh=True)
+            except MissingRunnerLabel:
+                pass
+            now = time.time()
+            if now >= max:
+                raise RuntimeError(f"Timeout reached: Runner {label} not found")
+            print(f"Runner {label} not found. Waiting...")
+            time.sleep(min(next(intervals), max - now))
+
+    def wait_for_runners(
+        self,
+        labels: list[str],
+        timeout: int,
+        wait: int = 15,
+        poll: PollStrategy | None = None,
+        cancel: threading.Event | None = None,
+    ) -> dict[str, SelfHostedRunner]:
+        """Wait for all runners with the given labels to be online.
+
+        The runner list is fetched once per poll, and every label found in
+        that listing is resolved at once.
+
+        Parameters
+        ----------
+        labels : list[str]
+            The labels of the runners to wait for.
+        timeout : int
+            The maximum time in seconds to wait for all runners to be online.
+        wait : int
+            The time in seconds to wait between checks. Defaults to 15 seconds.
+        poll : PollStrategy, optional
+            The strategy for the time between checks. Overrides `wait`.
+            No sleep extends past `timeout`.
+        cancel : threading.Event, optional
+            An event that stops the wait as soon as it is set, e.g. when the
+            instances the runners are on failed to start.
+
+        Returns
+        -------
+        dict[str, SelfHostedRunner]
+            A mapping of each label to its runner, in the order of `labels`.
+
+        Raises
+        ------
+        RuntimeError
+            If the timeout is reached before all runners are online, or the
+            wait is cancelled. The message lists the labels that were not
+            found.
+
+        """
+        intervals = (poll or PollStrategy.fixed(wait)).intervals()
+        max = time.time() + timeout
+        found: dict[str, SelfHostedRunner] = {}
+        pending = set(labels)
+        while True:
+            for runner in self.get_runners() or []:
+                for label in runner.labels:
+                    if label in pending:
+                        found[label] = runner
+                        pending.discard(label)
+            if not pending:
+                return {label: found[label] for label in labels}
+            # Report the missing labels in the order they were given
+            missing = [label for label in labels if label in pending]
+            now = time.time()
+            if now > max:
+                raise RuntimeError(
+                    f"Timeout reached: Runners {missing} not found"
+                )
+            print(f"Waiting for runners {missing}...")
+            delay = min(next(intervals), max - now)
+            if cancel is None:
+                time.sleep(delay)
+            elif cancel.wait(delay):
+                raise RuntimeError(
+                    f"Stopped waiting: Runners {missing} not found"
+                )
+
+    def wait_for_arriving_runners(
+        self,
+        labels: collections.abc.Iterable[str],
+        timeout: int,
+        wait: int = 15,
+        poll: PollStrategy | None = None,
+    ) -> dict[str, SelfHostedRunner]:
+        """Wait for runners whose labels arrive over time.
+
+        This suits runners started on instances that become ready one by one.
+        `labels` is consumed in a background thread, and all arrived labels
+        share one poll loop, so the runner list is fetched once per poll
+        however many runners are waited for. Each runner has `timeout`
+        seconds from the moment its label arrives. Before returning or
+        raising, the wait stops consuming `labels` and closes it if it is a
+        generator, which waits for the label being produced, if any.
+
+        Parameters
+        ----------
+        labels : Iterable[str]
+            The labels of the runners to wait for, produced as each runner
+            can be expected to register.
+        timeout : int
+            The maximum time in seconds to wait for each runner to be online.
+        wait : int
+            The time in seconds to wait between checks. Defaults to 15 seconds.
+        poll : PollStrategy, optional
+            The strategy for the time between checks. Overrides `wait`.
+
+        Returns
+        -------
+        dict[str, SelfHostedRunner]
+            A mapping of each label to its runner, in the order of arrival.
+
+        Raises
+        ------
+        RuntimeError
+            If the timeout of a runner is reached before it is online.
+        Exception
+            Any error raised while iterating `labels`, as soon as it occurs.
+
+        """
+        arrivals: queue.Queue[str | None] = queue.Queue()
+        failed = threading.Event()
+        errors: list[BaseException] = []
+        stop = threading.Event()
+
+        def feed():
+            iterator = iter(labels)
+            try:
+                for label in iterator:
+                    if stop.is_set():
+                        break
+                    arrivals.put(label)
+            except BaseException as e:
+                errors.append(e)
+                failed.set()
+            finally:
+                # Close a generator as soon as the wait is over, so it does
+                # not go on watching instances in the background
+                close = getattr(iterator, "close", None)
+                if close is not None:
+                    close()
+                arrivals.put(None)
+
+        strategy = poll or PollStrategy.fixed(wait)
+        intervals = strategy.intervals()
+        deadlines: dict[str, float] = {}
+        found: dict[str, SelfHostedRunner] = {}
+        pending: set[str] = set()
+        done = False
+        feeder = threading.Thread(target=feed, daemon=True)
+        feeder.start()
         try:
-            runner = self.get_runner(label)
-            return runner
-        except MissingRunnerLabel:
-            print(f"Waiting for runner {label}...")
             while True:
-                if time.time() > max:
+                # With nothing to poll for, block until the next label arrives
+                block = not pending and not done
+                if block:
+                    # Start backing off afresh for a new wave of runners
+                    intervals = strategy.intervals()
+                while not done:
+                    try:
+                        label = arrivals.get(block=block)
+                    except queue.Empty:
+                        break
+                    block = False
+                    if label is None:
+                        done = True
+                    else:
+                        deadlines[label] = time.time() + timeout
+                        pending.add(label)
+                if errors:
+                    raise errors[0]
+                if pending:
+                    for runner in self.get_runners() or []:
+                        for label in runner.labels:
+                            if label in pending:
+                                found[label] = runner
+                                pending.discard(label)
+                if done and not pending:
+                    return {label: found[label] for label in deadlines}
+                if not pending:
+                    continue
+                missing = [label for label in deadlines if label in pending]
+                now = time.time()
+                expired = [
+                    label for label in missing if now > deadlines[label]
+                ]
+                if expired:
                     raise RuntimeError(
-                        f"Timeout reached: Runner {label} not found"
+                        f"Timeout reached: Runners {expired} not found"
                     )
-                try:
-                    runner = self.get_runner(label)
-                    return runner
-                except MissingRunnerLabel:
-                    print(f"Runner {label} not found. Waiting...")
-                    time.sleep(wait)
+                print(f"Waiting for runners {missing}...")
+                deadline = min(deadlines[label] for label in missing)
+                failed.wait(max(min(next(intervals), deadline - now), 0.0))
+        finally:
+            # Stop consuming labels, and wait for the iterator to be closed
+            stop.set()
+            feeder.join()
 
     def remove_runner(self, label: str):
         """Remove a runner by a given label.
+
+        The runner is looked up in the cached runner index, and dropped from
+        it once deleted.
+
         Parameters
         ----------
         label : str
@@ -309,7 +1284,108 @@ class GitHubInstance:
         try:
             self.delete(f"repos/{self.repo}/actions/runners/{runner.id}")
         except Exception as e:
+            # The runner may or may not still exist, so the index is stale
+            self.invalidate_runner_index()
             raise RuntimeError(f"Error removing runner {label}. Error: {e}")
+        # Another removal may invalidate the index concurrently
+        with self._runner_index_lock:
+            index = self._runner_index
+            if index is not None:
+                index.discard(runner)
+
+    def remove_runners(
+        self, runners: list[SelfHostedRunner], max_workers: int = 1
+    ) -> dict[int, Exception]:
+        """Remove many runners by ID, without looking each of them up.
+
+        Unlike `remove_runner`, a failure does not stop the other removals.
+
+        Parameters
+        ----------
+        runners : list[SelfHostedRunner]
+            The runners to remove, as returned by `get_runners`.
+        max_workers : int
+            The maximum number of runners to remove concurrently. Defaults to
+            1, which removes the runners one after another.
+
+        Returns
+        -------
+        dict[int, Exception]
+            The error for each runner ID that could not be removed.
+
+        """
+
+        def delete(runner: SelfHostedRunner):
+            self.delete(f"repos/{self.repo}/actions/runners/{runner.id}")
+
+        errors = {}
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as pool:
+            futures = {pool.submit(delete, runner): runner for runner in runners}
+            for future, runner in futures.items():
+                if future.exception() is not None:
+                    errors[runner.id] = future.exception()
+        self.invalidate_runner_index()
+        return errors
+
+    def get_queued_jobs(self) -> list[WorkflowJob]:
+        """Get the workflow jobs in the repository waiting for a runner.
+
+        Jobs are collected from both queued and in-progress workflow runs, as
+        a running workflow can still have jobs waiting for a runner.
+
+        Returns
+        -------
+        list[WorkflowJob]
+            The queued workflow jobs.
+
+        Raises
+        ------
+        RuntimeError
+            If there is an error getting the workflow runs or jobs.
+
+        """
+        jobs = []
+        for run_status in ("queued", "in_progress"):
+            page = 1
+            while True:
+                res = self.get(
+                    f"repos/{self.repo}/actions/runs?status={run_status}"
+                    f"&per_page=100&page={page}"
+                )
+                runs = res["workflow_runs"]
+                for run in runs:
+                    jobs.extend(
+                        job
+                        for job in self._get_run_jobs(run["id"])
+                        if job.status == "queued"
+                    )
+                if len(runs) < 100:
+                    break
+                page += 1
+        return jobs
+
+    def _get_run_jobs(self, run_id: int) -> list[WorkflowJob]:
+        """Get the jobs of the latest attempt of a workflow run."""
+        jobs = []
+        page = 1
+        while True:
+            res = self.get(
+                f"repos/{self.repo}/actions/runs/{run_id}/jobs"
+                f"?filter=latest&per_page=100&page={page}"
+            )
+            for job in res["jobs"]:
+                jobs.append(
+                    WorkflowJob(
+                        job["id"],
+                        job["run_id"],
+                        job["name"],
+                        job["status"],
+                        job["labels"],
+                    )
+                )
+            if len(res["jobs"]) < 100:
+                return jobs
+            page += 1
 
     @staticmethod
     def generate_random_label() -> str:
@@ -349,6 +1425,10 @@ class GitHubInstance:
     ) -> str:
         """Return the latest runner for the given platform and architecture.
 
+        If `release_cache_dir` is set, the URL is read from a cache file for
+        the platform and architecture while it is younger than
+        `release_cache_ttl`, skipping the request entirely.
+
         Parameters
         ----------
         platform : str
@@ -369,23 +1449,54 @@ class GitHubInstance:
             If the platform or architecture is not supported.
 
         """
-        repo = "actions/runner"
-        supported_platforms = {"linux": ["x64", "arm", "arm64"]}
-        if platform not in supported_platforms:
-            raise ValueError(
-                f"Platform '{platform}' not supported. "
-                f"Supported platforms are {list(supported_platforms)}"
+        _check_runner_platform(platform, architecture)
+        cache_path = None
+        if self.release_cache_dir is not None:
+            cache_path = (
+                Path(self.release_cache_dir)
+                / f"runner-release-{platform}-{architecture}.json"
             )
-        if architecture not in supported_platforms[platform]:
-            raise ValueError(
-                f"Architecture '{architecture}' not supported for platform '{platform}'. "
-                f"Supported architectures are {supported_platforms[platform]}"
-            )
-        release = self._get_latest_release(repo)
-        assets = release["assets"]
-        for asset in assets:
-            if platform in asset["name"] and architecture in asset["name"]:
-                return asset["browser_download_url"]
-        raise RuntimeError(
-            f"Runner release not found for platform {platform} and architecture {architecture}"
+            url = _read_release_cache(cache_path, self.release_cache_ttl)
+            if url is not None:
+                return url
+        release = self._get_latest_release("actions/runner")
+        url = _find_runner_asset(release, platform, architecture)
+        if cache_path is not None:
+            _write_release_cache(cache_path, url)
+        return url
+
+    @staticmethod
+    def get_runner_release(
+        platform: str, architecture: str, version: str
+    ) -> str:
+        """Return the runner download URL for a pinned release version.
+
+        The URL is built from the `actions/runner` release naming scheme, so
+        no request is made to the GitHub API.
+
+        Parameters
+        ----------
+        platform : str
+            The platform of the runner to download.
+        architecture : str
+            The architecture of the runner to download.
+        version : str
+            The runner version, with or without a leading "v" (e.g. "2.321.0").
+
+        Returns
+        -------
+        str
+            The download URL of the runner.
+
+        Raises
+        ------
+        ValueError
+            If the platform or architecture is not supported.
+
+        """
+        _check_runner_platform(platform, architecture)
+        version = version.removeprefix("v")
+        return (
+            "https://github.com/actions/runner/releases/download/"
+            f"v{version}/actions-runner-{platform}-{architecture}-{version}.tar.gz"
         )
@@ -1,7 +1,80 @@
 import json
-from typing import Dict, Any, NamedTuple, Optional, Type
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Mapping, NamedTuple
+from typing import Optional, Type
 from copy import deepcopy
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def loads_json(value: str) -> Any:
+    """Parse a JSON string, with `orjson` if it is installed.
+
+    Values `orjson` rejects but `json` accepts, such as `NaN`, fall back to
+    `json.loads`. Unlike `json.loads`, `orjson` parses integers over 64 bits
+    as floats.
+
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(value)
+
+
+class LazyJSON:
+    """A JSON parameter that is only parsed when it is first used.
+
+    Parameters
+    ----------
+    raw : str
+        The JSON string, parsed with `loads_json`.
+
+    Attributes
+    ----------
+    raw : str
+    value : Any
+        The parsed value, parsed on first access and then reused.
+
+    Examples
+    --------
+    >>> tags = LazyJSON('[{"Key": "Name", "Value": "test"}]')
+    >>> tags.value[0]["Key"]
+    'Name'
+
+    """
+
+    __slots__ = ("raw", "_value", "_parsed")
+
+    def __init__(self, raw: str):
+        self.raw = raw
+        self._parsed = False
+        self._value = None
+
+    @property
+    def value(self) -> Any:
+        if not self._parsed:
+            self._value = loads_json(self.raw)
+            self._parsed = True
+        return self._value
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LazyJSON):
+            return self.raw == other.raw
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.raw)
+
+    def __repr__(self) -> str:
+        if self._parsed:
+            return f"LazyJSON({self._value!r})"
+        return f"LazyJSON(raw={self.raw!r})"
+
 
 def check_required(env: Dict[str, str], required: list[str]):
     """Check if required environment variables are set.
@@ -24,14 +97,137 @@ def check_required(env: Dict[str, str], required: list[str]):
         raise ValueError(f"Missing required environment variables: {missing}")
 
 
+class InputValidationError(ValueError):
+    """Exception raised when one or more inputs are missing or invalid.
+
+    Attributes
+    ----------
+    errors : list[str]
+        A message for each missing or invalid input.
+
+    """
+
+    def __init__(self, errors: list[str]):
+        self.errors = errors
+        super().__init__("\n".join(errors))
+
+
 class ParamConfig(NamedTuple):
     """Configuration for a single parameter."""
 
     env_var: str
     key: str
-    is_json: bool
-    allow_empty: bool
-    type_val: Type
+    is_json: bool = False
+    allow_empty: bool = False
+    type_val: Type = str
+    required: bool = False
+    lazy: bool = False
+
+
+def _value_parser(
+    is_json: bool, type_hint: Optional[Type], lazy: bool = False
+) -> Callable[[str], Any]:
+    """Return the function parsing a value, see `EnvVarBuilder._parse_value`."""
+    if is_json:
+        return LazyJSON if lazy else json.loads
+    if type_hint is not None:
+        return type_hint
+    return lambda value: None
+
+
+class ParamSchema:
+    """A precompiled set of parameters, parsed from the environment at once.
+
+    Rather than calling `EnvVarBuilder.update_state` once per variable, the
+    parameters of an action are declared once. All variables are parsed and
+    checked in a single pass, and every missing or invalid variable is
+    reported together.
+
+    Parameters
+    ----------
+    configs : Iterable[ParamConfig]
+        The parameters, in order. When several parameters share a key, the
+        last one set wins, as with successive `update_state` calls.
+    required : list[str], optional
+        Additional environment variables that must be set, as checked by
+        `check_required`.
+
+    Examples
+    --------
+    >>> schema = ParamSchema(
+    ...     [
+    ...         ParamConfig("INPUT_AWS_IMAGE_ID", "image_id", required=True),
+    ...         ParamConfig("INPUT_AWS_TAGS", "tags", is_json=True),
+    ...         ParamConfig("INPUT_INSTANCE_COUNT", "count", type_val=int),
+    ...     ],
+    ...     required=["GH_PAT"],
+    ... )
+    >>> params = EnvVarBuilder(env).update_from_schema(schema).build()
+
+    """
+
+    def __init__(
+        self, configs: Iterable[ParamConfig], required: list[str] | None = None
+    ):
+        self.configs = tuple(configs)
+        required_vars = dict.fromkeys(required or [])
+        required_vars.update(
+            (config.env_var, None) for config in self.configs if config.required
+        )
+        self.required = list(required_vars)
+        # Resolve each parser once, instead of on every parse
+        self._compiled = tuple(
+            (
+                config.env_var,
+                config.key,
+                config.allow_empty,
+                _value_parser(
+                    config.is_json, config.type_val, config.lazy
+                ),
+            )
+            for config in self.configs
+        )
+
+    def parse(self, env: Mapping[str, str]) -> dict:
+        """Parse and check the environment variables of the schema.
+
+        Parameters
+        ----------
+        env : Mapping[str, str]
+            The environment variables.
+
+        Returns
+        -------
+        dict
+            The parsed parameters by key. Unset and, unless allowed, empty
+            variables are left out. Lazy JSON parameters are `LazyJSON`
+            values, which are only checked when used.
+
+        Raises
+        ------
+        InputValidationError
+            If any required variables are missing, or any values can not be
+            parsed. All errors are reported at once.
+
+        """
+        errors = []
+        missing = [var for var in self.required if not env.get(var)]
+        if missing:
+            errors.append(
+                f"Missing required environment variables: {missing}"
+            )
+        params = {}
+        for env_var, key, allow_empty, parse in self._compiled:
+            value = env.get(env_var)
+            if value is None or not (allow_empty or value.strip()):
+                continue
+            try:
+                params[key] = parse(value)
+            except (ValueError, TypeError) as e:
+                errors.append(f"Invalid value for {env_var}: {e}")
+        if errors:
+            raise InputValidationError(errors)
+        return params
 
 
 class EnvVarBuilder:
@@ -44,38 +240,53 @@ class EnvVarBuilder:
     ----------
     env : Dict[str, str]
         The environment variables.
-    params : dict
-        The dictionary of parsed parameters.
+    params : dict | Mapping
+        The dictionary of parsed parameters, or a read-only view of them if
+        `frozen` is True.
+    frozen : bool
 
     Parameters
     ----------
     env: Dict[str, str]
         The environment variables.
+    frozen: bool
+        If True, `params` and `build` return a read-only view of the
+        parameters instead of a deep copy. Defaults to False.
 
     Examples
     --------
     >>> env = {"MY_VAR": "123", "JSON_VAR": '{"key": "value"}'}
     >>> builder = EnvVarBuilder(env)
     >>> result = (builder
-    ...     .with_var("MY_VAR", "my_key", type_hint=int)
-    ...     .with_var("JSON_VAR", "json_key", is_json=True)
+    ...     .update_state("MY_VAR", "my_key", type_hint=int)
+    ...     .update_state("JSON_VAR", "json_key", is_json=True)
     ...     .build())
     >>> # result = {"my_key": 123, "json_key": {"key": "value"}}
 
     Notes
     -----
-    - The builder creates deep copies of values to prevent mutation
+    - The builder returns deep copies of values to prevent mutation, unless
+      `frozen` is True
+    - A frozen view is never changed by later updates, but nested JSON values
+      are shared with it rather than copied, so they must not be mutated
     - JSON parsing is performed before type conversion
     - Empty strings are ignored by default unless allow_empty is True
 
     """
 
-    def __init__(self, env: Dict[str, str]):
+    def __init__(self, env: Dict[str, str], frozen: bool = False):
         self.env = env
+        self.frozen = frozen
         self._params = {}
+        # Whether a frozen view of _params has been handed out
+        self._shared = False
 
     def _parse_value(
-        self, value: str, is_json: bool, type_hint: Optional[Type]
+        self,
+        value: str,
+        is_json: bool,
+        type_hint: Optional[Type],
+        lazy: bool = False,
     ) -> Any:
         """Parse the value based on the configuration.
 
@@ -89,11 +300,15 @@ class EnvVarBuilder:
             If True, include empty strings in the result, by default False
         type_hint : Type, optional
             Type to convert the value to (if not JSON), by default str
+        lazy : bool, optional
+            If True, defer JSON parsing until the value is used, by default
+            False
 
         Returns
         -------
         Any
-            The parsed value as the specified type or JSON object
+            The parsed value as the specified type or JSON object, or a
+            `LazyJSON` if lazy is True
 
         Notes
         -----
@@ -101,7 +316,7 @@ class EnvVarBuilder:
 
         """
         if is_json:
-            return json.loads(value)
+            return LazyJSON(value) if lazy else json.loads(value)
         if type_hint is not None:
             return type_hint(value)
 
@@ -110,13 +325,17 @@ class EnvVarBuilder:
         value = self.env.get(config.env_var)
         if value is not None and (config.allow_empty or value.strip()):
             parsed_value = self._parse_value(
-                value, config.is_json, config.type_val
+                value, config.is_json, config.type_val, config.lazy
             )
             self._update_params(config.key, parsed_value)
 
     def _update_params(self, key: str, value: Any):
-        self._params = deepcopy(self._params)
-        self._params[key] = deepcopy(value)
+        # Parsed values are new objects, so they are stored without copying.
+        # The parameters are only copied if a frozen view of them is out.
+        if self._shared:
+            self._params = dict(self._params)
+            self._shared = False
+        self._params[key] = value
 
     def update_state(
         self,
@@ -125,9 +344,13 @@ class EnvVarBuilder:
         is_json: bool = False,
         allow_empty: bool = False,
         type_hint: Type = str,
+        lazy: bool = False,
     ) -> "EnvVarBuilder":
         """Update the state of the builder with a single parameter.
 
+        Set `lazy` with `is_json` to store the value as a `LazyJSON`, which is
+        only parsed if the provider reads its `value`.
+
         Returns
         -------
         EnvVarBuilder
@@ -142,14 +365,59 @@ class EnvVarBuilder:
         -----
         - Empty strings are ignored by default unless allow_empty is True
         - JSON parsing is performed before type conversion if is_json is True
+        - Lazy JSON values are not checked until they are used
 
         """
-        config = ParamConfig(var_name, key, is_json, allow_empty, type_hint)
+        config = ParamConfig(
+            var_name, key, is_json, allow_empty, type_hint, lazy=lazy
+        )
 
         self._parse_single_param(config)
         return self
 
+    def update_from_schema(self, schema: ParamSchema) -> "EnvVarBuilder":
+        """Update the state of the builder with all parameters of a schema.
+
+        Parameters
+        ----------
+        schema : ParamSchema
+            The parameters to parse.
+
+        Returns
+        -------
+        EnvVarBuilder
+            Returns self for method chaining
+
+        Raises
+        ------
+        InputValidationError
+            If any required variables are missing, or any values can not be
+            parsed. The builder is left unchanged.
+
+        """
+        for key, value in schema.parse(self.env).items():
+            self._update_params(key, value)
+        return self
+
     @property
-    def params(self) -> dict:
-        """Returns a copyt of the dictionary of parsed parameters."""
+    def params(self) -> dict | Mapping[str, Any]:
+        """Returns a copy of the dictionary of parsed parameters.
+
+        If the builder is frozen, a read-only view is returned instead.
+        """
+        if self.frozen:
+            self._shared = True
+            return MappingProxyType(self._params)
         return deepcopy(self._params)
+
+    def build(self) -> dict | Mapping[str, Any]:
+        """Return the parsed parameters, see `params`.
+
+        Returns
+        -------
+        dict | Mapping[str, Any]
+            A copy of the parsed parameters, or a read-only view of them if
+            the builder is frozen.
+
+        """
+        return self.params
@@ -0,0 +1,159 @@
+import base64
+import hashlib
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Iterator
+
+# Prefix of a mapping compressed inline, and of a reference to a spill file
+INLINE_PREFIX = "z1:"
+SPILL_PREFIX = "f1:"
+# Workflow outputs are limited to 1 MB each, stay well below it by default
+DEFAULT_MAX_INLINE = 256 * 1024
+_CHUNK_SIZE = 64 * 1024
+
+
+def encode_mapping(
+    mapping: dict[str, str],
+    spill_dir: str | os.PathLike | None = None,
+    max_inline: int = DEFAULT_MAX_INLINE,
+) -> str:
+    """Encode an instance mapping compactly for a workflow output.
+
+    The mapping is written as tab-separated lines, compressed with zlib and
+    base64 encoded. If the result is longer than `max_inline` and a
+    `spill_dir` is given, the compressed mapping is written to a file there
+    instead, and only a short reference to it is returned.
+
+    Parameters
+    ----------
+    mapping : dict[str, str]
+        A dictionary of instance IDs and their corresponding github runner labels.
+    spill_dir : str | os.PathLike, optional
+        A directory shared with the stop action (e.g. through an artifact),
+        in which large mappings are written.
+    max_inline : int
+        The maximum length of an inline encoded mapping. Defaults to 256 KiB.
+
+    Returns
+    -------
+    str
+        The encoded mapping, to be decoded with `iter_mapping`.
+
+    Raises
+    ------
+    ValueError
+        If an instance ID or label contains a tab or a newline.
+
+    """
+    lines = []
+    for instance_id, label in mapping.items():
+        entry = f"{instance_id}\t{label}"
+        if entry.count("\t") != 1 or "\n" in entry or "\r" in entry:
+            raise ValueError(f"Can not encode mapping entry {entry!r}")
+        lines.append(entry)
+    compressed = zlib.compress("\n".join(lines).encode(), 9)
+    encoded = INLINE_PREFIX + base64.urlsafe_b64encode(compressed).decode()
+    if len(encoded) <= max_inline or spill_dir is None:
+        return encoded
+    key = hashlib.sha256(compressed).hexdigest()[:16]
+    path = Path(spill_dir) / f"mapping-{key}.z"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(compressed)
+    return f"{SPILL_PREFIX}{key}"
+
+
+def _inline_chunks(data: str) -> Iterator[bytes]:
+    """Decode base64 text in chunks."""
+    # Chunks of a multiple of 4 characters decode independently
+    for start in range(0, len(data), _CHUNK_SIZE):
+        yield base64.urlsafe_b64decode(data[start : start + _CHUNK_SIZE])
+
+
+def _file_chunks(path: Path) -> Iterator[bytes]:
+    """Read a file in chunks."""
+    with open(path, "rb") as f:
+        while chunk := f.read(_CHUNK_SIZE):
+            yield chunk
+
+
+def iter_mapping(
+    encoded: str, spill_dir: str | os.PathLike | None = None
+) -> Iterator[tuple[str, str]]:
+    """Decode an instance mapping one entry at a time.
+
+    The mapping is decompressed incrementally, so the decoded text is never
+    held in memory at once. Plain JSON mappings, as written by
+    `json.dumps`, are also accepted.
+
+    Parameters
+    ----------
+    encoded : str
+        The mapping, as returned by `encode_mapping`.
+    spill_dir : str | os.PathLike, optional
+        The directory spilled mappings were written to.
+
+    Yields
+    ------
+    tuple[str, str]
+        Each instance ID and its github runner label, in order.
+
+    Raises
+    ------
+    ValueError
+        If the mapping is malformed, or is spilled and no `spill_dir` is
+        given.
+
+    """
+    encoded = encoded.strip()
+    if encoded.startswith(INLINE_PREFIX):
+        chunks = _inline_chunks(encoded[len(INLINE_PREFIX) :])
+    elif encoded.startswith(SPILL_PREFIX):
+        if spill_dir is None:
+            raise ValueError("A spill_dir is needed to decode this mapping")
+        key = encoded[len(SPILL_PREFIX) :]
+        if not key.isalnum():
+            raise ValueError(f"Invalid mapping reference {key!r}")
+        chunks = _file_chunks(Path(spill_dir) / f"mapping-{key}.z")
+    else:
+        mapping = json.loads(encoded)
+        if not isinstance(mapping, dict):
+            raise ValueError("Instance mapping is not a JSON object")
+        yield from mapping.items()
+        return
+    decompressor = zlib.decompressobj()
+    rest = b""
+    try:
+        for chunk in chunks:
+            lines = (rest + decompressor.decompress(chunk)).split(b"\n")
+            rest = lines.pop()
+            for line in lines:
+                yield _parse_line(line)
+        rest += decompressor.flush()
+        if not decompressor.eof:
+            raise ValueError("truncated data")
+        if rest:
+            yield _parse_line(rest)
+    except (zlib.error, ValueError) as e:
+        raise ValueError(f"Malformed instance mapping: {e}") from e
+
+
+def _parse_line(line: bytes) -> tuple[str, str]:
+    """Parse an instance ID and label from a line of a mapping."""
+    instance_id, label = line.decode().split("\t")
+    return instance_id, label
+
+
+def decode_mapping(
+    encoded: str, spill_dir: str | os.PathLike | None = None
+) -> dict[str, str]:
+    """Decode an instance mapping, see `iter_mapping`.
+
+    Returns
+    -------
+    dict[str, str]
+        A dictionary of instance IDs and their corresponding github runner labels.
+
+    """
+    return dict(iter_mapping(encoded, spill_dir))
@@ -0,0 +1,59 @@
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+@contextmanager
+def locked_json_state(path: str | os.PathLike, **defaults) -> Iterator[dict]:
+    """Lock, load and yield a JSON state file, saving it on exit.
+
+    A lock file next to it, named after the state file with a `.lock`
+    suffix, is locked with `fcntl.flock` for the duration of the block, so
+    separate processes and threads on the same host can safely share it. Changes are only
+    saved if the block exits without an exception, and the file is replaced
+    atomically.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        The path of the state file. It is created if it does not exist.
+    **defaults : dict, optional
+        Default values for keys missing from the state.
+
+    Yields
+    ------
+    dict
+        The state, to be updated in place.
+
+    Examples
+    --------
+    >>> with locked_json_state("pool.json", idle={}) as state:
+    ...     state["idle"]["i-123"] = "runner-abc"
+
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Lock a separate file, as the state file itself is replaced on every
+    # save and a lock on the replaced file would no longer exclude anyone
+    with open(path.with_name(path.name + ".lock"), "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            try:
+                content = path.read_text()
+            except FileNotFoundError:
+                content = ""
+            state = json.loads(content) if content.strip() else {}
+            for key, value in defaults.items():
+                state.setdefault(key, value)
+            yield state
+            tmp = path.with_name(
+                f"{path.name}.{os.getpid()}-{threading.get_ident()}.tmp"
+            )
+            tmp.write_text(json.dumps(state))
+            os.replace(tmp, path)
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
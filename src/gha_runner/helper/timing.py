@@ -0,0 +1,150 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Iterator
+
+
+@dataclass
+class Span:
+    """The timing of a single phase of starting or stopping runners.
+
+    Parameters
+    ----------
+    name : str
+        The name of the phase (e.g. "create_instances").
+    start : float
+        The epoch time at which the phase started.
+    duration : float
+        The duration of the phase in seconds.
+    attributes : dict
+        Extra details about the phase, such as the runner label.
+    error : str, optional
+        The error that ended the phase, if any.
+
+    """
+
+    name: str
+    start: float
+    duration: float
+    attributes: dict = field(default_factory=dict)
+    error: str | None = None
+
+
+class JsonLinesSink:
+    """Append each span to a file as a line of JSON.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        The file to append to.
+
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, span: Span):
+        line = json.dumps(asdict(span), default=str)
+        with self._lock, open(self.path, "a") as f:
+            f.write(line + "\n")
+
+
+class Timer:
+    """Record the duration of each phase and pass it on to sinks.
+
+    A sink is any callable taking a `Span`, called as each span ends. Spans
+    can be recorded from several threads at once.
+
+    Parameters
+    ----------
+    sinks : list[Callable[[Span], None]], optional
+        The sinks to send spans to.
+
+    Attributes
+    ----------
+    spans : list[Span]
+        The spans recorded so far, in the order they ended.
+    sinks : list[Callable[[Span], None]]
+
+    Examples
+    --------
+    >>> timer = Timer([JsonLinesSink("timings.jsonl")])
+    >>> with timer.span("create_instances", count=2):
+    ...     provider.create_instances()
+
+    """
+
+    def __init__(self, sinks: list[Callable[[Span], None]] | None = None):
+        self.sinks = list(sinks or [])
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[dict]:
+        """Time the block as a span named `name`.
+
+        Parameters
+        ----------
+        name : str
+            The name of the phase.
+        **attributes : dict, optional
+            Extra details about the phase.
+
+        Yields
+        ------
+        dict
+            The attributes of the span, which the block can add to.
+
+        """
+        start = time.time()
+        begin = time.perf_counter()
+        error = None
+        try:
+            yield attributes
+        except BaseException as e:
+            error = repr(e)
+            raise
+        finally:
+            span = Span(
+                name=name,
+                start=start,
+                duration=time.perf_counter() - begin,
+                attributes=attributes,
+                error=error,
+            )
+            with self._lock:
+                self.spans.append(span)
+            for sink in self.sinks:
+                sink(span)
+
+    def totals(self) -> dict[str, tuple[int, float]]:
+        """Return the number of spans and their total duration by name."""
+        totals: dict[str, tuple[int, float]] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            count, duration = totals.get(span.name, (0, 0.0))
+            totals[span.name] = (count + 1, duration + span.duration)
+        return totals
+
+    def summary(self) -> str:
+        """Return a Markdown table of the time spent in each phase."""
+        lines = [
+            "| Phase | Count | Total (s) |",
+            "| --- | ---: | ---: |",
+        ]
+        for name, (count, duration) in self.totals().items():
+            lines.append(f"| {name} | {count} | {duration:.2f} |")
+        return "\n".join(lines) + "\n"
+
+    def write_step_summary(self, title: str = "Runner timings"):
+        """Append the summary to the job step summary, if there is one."""
+        path = os.environ.get("GITHUB_STEP_SUMMARY")
+        if not path or not self.spans:
+            return
+        with open(path, "a") as summary:
+            summary.write(f"### {title}\n\n{self.summary()}\n")
@@ -1,9 +1,39 @@
 import os
+import sys
+import threading
+import uuid
+
+
+def _format_file_command(name: str, value: str) -> str:
+    """Format a name and value for an environment file such as GITHUB_OUTPUT.
+
+    Multiline values use the heredoc format, with a random delimiter that
+    does not occur in the value.
+
+    """
+    if "\n" not in value and "\r" not in value:
+        return f"{name}={value}\n"
+    delimiter = f"ghadelimiter_{uuid.uuid4()}"
+    while delimiter in value:
+        delimiter = f"ghadelimiter_{uuid.uuid4()}"
+    return f"{name}<<{delimiter}\n{value}\n{delimiter}\n"
+
+
+def _append(path: str | os.PathLike, content: str):
+    """Append content to a file in a single write."""
+    data = content.encode()
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
 
 
 def output(name: str, value: str):
     with open(os.environ["GITHUB_OUTPUT"], "a") as output:
-        output.write(f"{name}={value}\n")
+        output.write(_format_file_command(name, str(value)))
 
 
 def warning(title: str, message):
@@ -12,3 +42,105 @@ def warning(title: str, message):
 
 def error(title: str, message):
     print(f"::error title={title}::{message}")
+
+
+class WorkflowCommands:
+    """A buffered writer for GitHub Actions workflow commands.
+
+    Outputs, saved state, step summary Markdown and annotations are buffered,
+    then each file is written in a single append, and the annotations in a
+    single print, when the writer is flushed or its context exits.
+
+    Parameters
+    ----------
+    output_path : str | os.PathLike, optional
+        The outputs file. Defaults to the `GITHUB_OUTPUT` environment variable.
+    state_path : str | os.PathLike, optional
+        The state file. Defaults to the `GITHUB_STATE` environment variable.
+    summary_path : str | os.PathLike, optional
+        The step summary file. Defaults to the `GITHUB_STEP_SUMMARY`
+        environment variable.
+
+    Examples
+    --------
+    >>> with WorkflowCommands() as cmds:
+    ...     cmds.output("mapping", json.dumps(mapping))
+    ...     cmds.output("instances", "\\n".join(mapping))
+    ...     cmds.summary("Started 100 runners\\n")
+
+    """
+
+    def __init__(
+        self,
+        output_path: str | os.PathLike | None = None,
+        state_path: str | os.PathLike | None = None,
+        summary_path: str | os.PathLike | None = None,
+    ):
+        self.output_path = output_path
+        self.state_path = state_path
+        self.summary_path = summary_path
+        self._outputs: list[str] = []
+        self._state: list[str] = []
+        self._summary: list[str] = []
+        self._annotations: list[str] = []
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "WorkflowCommands":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
+    def output(self, name: str, value: str):
+        """Set a step output, see `output`."""
+        with self._lock:
+            self._outputs.append(_format_file_command(name, str(value)))
+
+    def state(self, name: str, value: str):
+        """Save state for the post step of the action."""
+        with self._lock:
+            self._state.append(_format_file_command(name, str(value)))
+
+    def summary(self, markdown: str):
+        """Add Markdown to the job step summary."""
+        with self._lock:
+            self._summary.append(markdown)
+
+    def warning(self, title: str, message):
+        """Add a warning annotation, see `warning`."""
+        with self._lock:
+            self._annotations.append(f"::warning title={title}::{message}\n")
+
+    def error(self, title: str, message):
+        """Add an error annotation, see `error`."""
+        with self._lock:
+            self._annotations.append(f"::error title={title}::{message}\n")
+
+    def flush(self):
+        """Write out everything buffered so far.
+
+        Raises
+        ------
+        KeyError
+            If there are outputs, state or a summary to write, but no path
+            was given and the environment variable is not set. Nothing is
+            written or discarded in that case.
+
+        """
+        with self._lock:
+            writes = []
+            for path, env_var, lines in [
+                (self.output_path, "GITHUB_OUTPUT", self._outputs),
+                (self.state_path, "GITHUB_STATE", self._state),
+                (self.summary_path, "GITHUB_STEP_SUMMARY", self._summary),
+            ]:
+                if lines:
+                    writes.append((path or os.environ[env_var], "".join(lines)))
+            annotations = "".join(self._annotations)
+            self._outputs, self._state, self._summary = [], [], []
+            self._annotations = []
+        if annotations:
+            sys.stdout.write(annotations)
+            sys.stdout.flush()
+        for path, content in writes:
+            _append(path, content)
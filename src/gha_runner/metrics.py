@@ -0,0 +1,253 @@
+"""Module to collect metrics on the requests made to the GitHub API.
+
+Requests are grouped by endpoint template, where the repository and numeric
+IDs are replaced by placeholders, so that for example every runner removal is
+counted against `DELETE /repos/{owner}/{repo}/actions/runners/{id}`.
+"""
+
+import re
+import threading
+import urllib.parse
+from dataclasses import dataclass, field
+
+# Upper bounds in seconds of the request latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_REPO_PATH = re.compile(r"^/repos/[^/]+/[^/]+")
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_template(url: str) -> str:
+    """Return the endpoint template of a GitHub API URL.
+
+    Parameters
+    ----------
+    url : str
+        The full URL or path of the request.
+
+    Returns
+    -------
+    str
+        The path with the repository and numeric IDs replaced by
+        placeholders, and without the query string.
+
+    Examples
+    --------
+    >>> endpoint_template("https://api.github.com/repos/o/r/actions/runners/7")
+    '/repos/{owner}/{repo}/actions/runners/{id}'
+
+    """
+    path = urllib.parse.urlsplit(url).path or "/"
+    path = _REPO_PATH.sub("/repos/{owner}/{repo}", path)
+    return _ID_SEGMENT.sub("/{id}", path)
+
+
+@dataclass
+class EndpointMetrics:
+    """The metrics of the requests made to a single endpoint template.
+
+    Parameters
+    ----------
+    count : int
+        The number of requests made.
+    latency_buckets : list[int]
+        The number of requests whose latency was at most each bound of
+        `LATENCY_BUCKETS`, not cumulative.
+    latency_sum : float
+        The total latency in seconds, including retries.
+    response_bytes : int
+        The total size of the response bodies.
+    statuses : dict[str, int]
+        The number of requests by final status code, or "error" for requests
+        that did not receive a response.
+    retries : int
+        The number of retries, for both server errors and rate limits.
+    rate_limit_remaining : int, optional
+        The rate limit budget reported by the latest response.
+
+    """
+
+    count: int = 0
+    latency_buckets: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1)
+    )
+    latency_sum: float = 0.0
+    response_bytes: int = 0
+    statuses: dict[str, int] = field(default_factory=dict)
+    retries: int = 0
+    rate_limit_remaining: int | None = None
+
+    def observe_latency(self, latency: float):
+        """Add a request latency in seconds to the histogram."""
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if latency <= bound:
+                break
+        else:
+            i = len(LATENCY_BUCKETS)
+        self.latency_buckets[i] += 1
+        self.latency_sum += latency
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+class RequestMetrics:
+    """Thread-safe metrics of the requests made to the GitHub API.
+
+    Examples
+    --------
+    >>> gh = GitHubInstance(token="...", repo="owner/repo")
+    >>> gh.get_runners()
+    >>> print(gh.metrics.to_prometheus())
+
+    """
+
+    def __init__(self):
+        self._endpoints: dict[tuple[str, str], EndpointMetrics] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        status: int | None,
+        latency: float,
+        response_bytes: int = 0,
+        retries: int = 0,
+        rate_limit_remaining: int | None = None,
+    ):
+        """Record a request.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method of the request.
+        url : str
+            The URL of the request.
+        status : int | None
+            The final status code, or None if no response was received.
+        latency : float
+            The time in seconds the request took, including retries.
+        response_bytes : int
+            The size of the response body.
+        retries : int
+            The number of times the request was retried.
+        rate_limit_remaining : int, optional
+            The rate limit budget reported by the response.
+
+        """
+        key = (method, endpoint_template(url))
+        status_label = "error" if status is None else str(status)
+        with self._lock:
+            metrics = self._endpoints.setdefault(key, EndpointMetrics())
+            metrics.count += 1
+            metrics.observe_latency(latency)
+            metrics.response_bytes += response_bytes
+            metrics.statuses[status_label] = (
+                metrics.statuses.get(status_label, 0) + 1
+            )
+            metrics.retries += retries
+            if rate_limit_remaining is not None:
+                metrics.rate_limit_remaining = rate_limit_remaining
+
+    def snapshot(self) -> dict[tuple[str, str], EndpointMetrics]:
+        """Return a copy of the metrics by method and endpoint template.
+
+        Returns
+        -------
+        dict[tuple[str, str], EndpointMetrics]
+            The metrics, sorted by descending request count.
+
+        """
+        with self._lock:
+            copies = {
+                key: EndpointMetrics(
+                    count=m.count,
+                    latency_buckets=list(m.latency_buckets),
+                    latency_sum=m.latency_sum,
+                    response_bytes=m.response_bytes,
+                    statuses=dict(m.statuses),
+                    retries=m.retries,
+                    rate_limit_remaining=m.rate_limit_remaining,
+                )
+                for key, m in self._endpoints.items()
+            }
+        return dict(
+            sorted(copies.items(), key=lambda item: item[1].count, reverse=True)
+        )
+
+    def reset(self):
+        """Discard all the metrics recorded so far."""
+        with self._lock:
+            self._endpoints.clear()
+
+    def to_prometheus(self, prefix: str = "gha_runner_github") -> str:
+        """Export the metrics in the Prometheus text exposition format.
+
+        Parameters
+        ----------
+        prefix : str
+            The prefix of the metric names. Defaults to "gha_runner_github".
+
+        Returns
+        -------
+        str
+            The metrics, one sample per line.
+
+        """
+        snapshot = self.snapshot()
+        requests = [
+            f"# HELP {prefix}_requests_total Requests by final status.",
+            f"# TYPE {prefix}_requests_total counter",
+        ]
+        latency = [
+            f"# HELP {prefix}_request_duration_seconds Request latency.",
+            f"# TYPE {prefix}_request_duration_seconds histogram",
+        ]
+        size = [
+            f"# HELP {prefix}_response_bytes_total Response body bytes.",
+            f"# TYPE {prefix}_response_bytes_total counter",
+        ]
+        retries = [
+            f"# HELP {prefix}_retries_total Retried requests.",
+            f"# TYPE {prefix}_retries_total counter",
+        ]
+        remaining = [
+            f"# HELP {prefix}_rate_limit_remaining Latest rate limit budget.",
+            f"# TYPE {prefix}_rate_limit_remaining gauge",
+        ]
+        for (method, endpoint), m in snapshot.items():
+            labels = f'method="{method}",endpoint="{_escape(endpoint)}"'
+            for status, count in sorted(m.statuses.items()):
+                requests.append(
+                    f'{prefix}_requests_total{{{labels},status="{status}"}} '
+                    f"{count}"
+                )
+            cumulative = 0
+            bounds = [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"]
+            for bound, count in zip(bounds, m.latency_buckets):
+                cumulative += count
+                latency.append(
+                    f"{prefix}_request_duration_seconds_bucket"
+                    f'{{{labels},le="{bound}"}} {cumulative}'
+                )
+            latency.append(
+                f"{prefix}_request_duration_seconds_sum{{{labels}}} "
+                f"{m.latency_sum}"
+            )
+            latency.append(
+                f"{prefix}_request_duration_seconds_count{{{labels}}} "
+                f"{m.count}"
+            )
+            size.append(
+                f"{prefix}_response_bytes_total{{{labels}}} {m.response_bytes}"
+            )
+            retries.append(f"{prefix}_retries_total{{{labels}}} {m.retries}")
+            if m.rate_limit_remaining is not None:
+                remaining.append(
+                    f"{prefix}_rate_limit_remaining{{{labels}}} "
+                    f"{m.rate_limit_remaining}"
+                )
+        return "\n".join(requests + latency + size + retries + remaining) + "\n"
@@ -0,0 +1,201 @@
+"""Module to clean up runners and instances leaked by jobs that never stopped.
+
+When a workflow is cancelled or a runner crashes, the stop action may never
+run, leaving the runner registered offline and its instance running. The
+reaper is meant to run on a schedule: it finds the offline runners started by
+this package and removes them along with their instances.
+"""
+
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Type
+
+from gha_runner.clouddeployment import StopCloudInstance
+from gha_runner.gh import GitHubInstance, SelfHostedRunner
+from gha_runner.helper.state import locked_json_state
+from gha_runner.helper.workflow_cmds import warning
+
+# Matches the labels from `GitHubInstance.generate_random_label`
+RUNNER_LABEL_PATTERN = re.compile(r"runner-[a-z0-9]{8}")
+
+
+def find_generated_label(runner: SelfHostedRunner) -> str | None:
+    """Return the label generated for a runner by this package, if any.
+
+    Parameters
+    ----------
+    runner : SelfHostedRunner
+        The runner to inspect.
+
+    Returns
+    -------
+    str | None
+        The first label in the `runner-xxxxxxxx` format, or None.
+
+    """
+    for label in runner.labels:
+        if RUNNER_LABEL_PATTERN.fullmatch(label):
+            return label
+    return None
+
+
+@dataclass
+class ReapResult:
+    """The outcome of a single reaper run.
+
+    Parameters
+    ----------
+    offline : int
+        The number of offline runners started by this package.
+    removed : list[str]
+        The labels of the runners removed.
+    instances : dict[str, str]
+        The instances terminated, mapped to their runner labels.
+    failed : list[str]
+        The labels of the runners that could not be removed.
+
+    """
+
+    offline: int = 0
+    removed: list[str] = field(default_factory=list)
+    instances: dict[str, str] = field(default_factory=dict)
+    failed: list[str] = field(default_factory=list)
+
+
+@dataclass
+class Reaper:
+    """Remove runners that have been offline for too long, and their instances.
+
+    The runner API does not report when a runner went offline, so the time
+    each runner was first seen offline is persisted between runs.
+
+    Parameters
+    ----------
+    stop_type : Type[StopCloudInstance]
+        The type of cloud provider used to find and remove instances.
+    stop_params : dict
+        The parameters to pass to the stop provider.
+    gh : GitHubInstance
+        The GitHub instance to use.
+    state_path : str | os.PathLike
+        The file in which offline runners are tracked between runs.
+    offline_threshold : float
+        The time in seconds a runner must have been seen offline for before
+        it is removed. Defaults to 3600 seconds.
+    max_workers : int
+        The maximum number of runners to remove concurrently. Defaults to 10.
+    dry_run : bool
+        If True, only report the runners that would be removed. Defaults to
+        False.
+
+    Attributes
+    ----------
+    stop_type : Type[StopCloudInstance]
+    stop_params : dict
+    gh : GitHubInstance
+    state_path : str | os.PathLike
+    offline_threshold : float
+    max_workers : int
+    dry_run : bool
+
+    Examples
+    --------
+    >>> reaper = Reaper(StopAWSInstance, {"region_name": "us-east-1"}, gh,
+    ...                 state_path="reaper.json")
+    >>> result = reaper.reap()
+
+    """
+
+    stop_type: Type[StopCloudInstance]
+    stop_params: dict
+    gh: GitHubInstance
+    state_path: str | os.PathLike
+    offline_threshold: float = 3600.0
+    max_workers: int = 10
+    dry_run: bool = False
+
+    def _state(self):
+        """Lock, load and yield the offline runners, saving them on exit."""
+        return locked_json_state(self.state_path, offline_since={})
+
+    def find_expired(self) -> tuple[int, dict[str, SelfHostedRunner]]:
+        """Find the runners that have been offline past the threshold.
+
+        Runners seen offline for the first time start being tracked, and
+        runners that came back online or are gone stop being tracked.
+
+        Returns
+        -------
+        tuple[int, dict[str, SelfHostedRunner]]
+            The number of offline runners started by this package, and the
+            expired runners by label.
+
+        """
+        offline = {}
+        for runner in self.gh.get_runners() or []:
+            label = find_generated_label(runner)
+            if label is not None and runner.status == "offline":
+                offline[label] = runner
+        now = time.time()
+        with self._state() as state:
+            since = {
+                label: state["offline_since"].get(label, now)
+                for label in offline
+            }
+            state["offline_since"] = since
+        expired = {
+            label: runner
+            for label, runner in offline.items()
+            if now - since[label] >= self.offline_threshold
+        }
+        return len(offline), expired
+
+    def reap(self) -> ReapResult:
+        """Remove the expired runners and terminate their instances.
+
+        Returns
+        -------
+        ReapResult
+            What was removed, or only would be in dry-run mode.
+
+        """
+        offline, expired = self.find_expired()
+        result = ReapResult(offline=offline)
+        print(f"Offline: {offline}, expired: {len(expired)}")
+        if not expired:
+            return result
+        provider = self.stop_type(**self.stop_params)
+        instances = provider.find_instances(list(expired))
+        if self.dry_run:
+            print(
+                f"Dry run: would remove runners {', '.join(expired)} and "
+                f"instances {', '.join(instances) or 'none'}"
+            )
+            result.removed = list(expired)
+            result.instances = instances
+            return result
+        errors = self.gh.remove_runners(
+            list(expired.values()), max_workers=self.max_workers
+        )
+        for label, runner in expired.items():
+            if runner.id in errors:
+                warning(
+                    title=f"Failed to remove runner {label}",
+                    message=errors[runner.id],
+                )
+                result.failed.append(label)
+            else:
+                result.removed.append(label)
+        with self._state() as state:
+            for label in result.removed:
+                state["offline_since"].pop(label, None)
+        # Instances are leaked whether or not their runner could be removed
+        if instances:
+            try:
+                provider.remove_instances(list(instances))
+                result.instances = instances
+            except Exception as e:
+                warning(title="Failed to remove instances", message=e)
+        return result
@@ -0,0 +1,273 @@
+"""Module to keep a warm pool of idle, registered runners.
+
+Cold starting a runner means booting an instance and downloading the runner,
+which takes minutes. A warm pool keeps runners registered ahead of time, hands
+them out to jobs immediately, and refills itself in the background. The pool
+state is persisted to a file, so that separate start and stop action
+invocations on the same host can share it.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Type
+
+from gha_runner.clouddeployment import (
+    CreateCloudInstance,
+    DeployInstance,
+    StopCloudInstance,
+    TeardownInstance,
+)
+from gha_runner.gh import GitHubInstance
+from gha_runner.helper.state import locked_json_state
+
+
+@dataclass
+class WarmPool:
+    """A pool of pre-provisioned runners shared across jobs.
+
+    Parameters
+    ----------
+    create_type : Type[CreateCloudInstance]
+        The type of cloud provider used to create instances.
+    stop_type : Type[StopCloudInstance]
+        The type of cloud provider used to remove instances.
+    cloud_params : dict
+        The parameters to pass to the create provider.
+    stop_params : dict
+        The parameters to pass to the stop provider.
+    gh : GitHubInstance
+        The GitHub instance to use.
+    size : int
+        The number of idle runners to keep in the pool.
+    state_path : str | os.PathLike
+        The file in which the pool state is persisted.
+    timeout : int
+        The timeout to use when waiting for runners to come online. A refill
+        that has not finished after this long is considered abandoned.
+        Defaults to 600 seconds.
+
+    Attributes
+    ----------
+    create_type : Type[CreateCloudInstance]
+    stop_type : Type[StopCloudInstance]
+    cloud_params : dict
+    stop_params : dict
+    gh : GitHubInstance
+    size : int
+    state_path : str | os.PathLike
+    timeout : int
+
+    Notes
+    -----
+    The state file holds the `idle` and `leased` instance mappings, plus the
+    refills in flight. It is read and updated with `locked_json_state`, which
+    holds an `fcntl.flock` lock on a `.lock` file next to it, so only
+    processes on the same host can share a pool.
+
+    """
+
+    create_type: Type[CreateCloudInstance]
+    stop_type: Type[StopCloudInstance]
+    cloud_params: dict
+    stop_params: dict
+    gh: GitHubInstance
+    size: int
+    state_path: str | os.PathLike
+    timeout: int = 600
+    _refill_thread: threading.Thread | None = field(
+        default=None, init=False, repr=False
+    )
+
+    def _state(self):
+        """Lock, load and yield the pool state, saving it on exit."""
+        return locked_json_state(
+            self.state_path, idle={}, leased={}, refilling={}
+        )
+
+    def idle(self) -> dict[str, str]:
+        """Return the idle runners in the pool.
+
+        Returns
+        -------
+        dict[str, str]
+            A dictionary of instance IDs and their corresponding github runner labels.
+
+        """
+        with self._state() as state:
+            return dict(state["idle"])
+
+    def leased(self) -> dict[str, str]:
+        """Return the runners handed out to jobs.
+
+        Returns
+        -------
+        dict[str, str]
+            A dictionary of instance IDs and their corresponding github runner labels.
+
+        """
+        with self._state() as state:
+            return dict(state["leased"])
+
+    def _deploy(self, count: int) -> dict[str, str]:
+        """Start `count` new runners and return their mapping.
+
+        If the start fails, the instances it created are removed before the
+        error is raised.
+
+        """
+        deploy = DeployInstance(
+            provider_type=self.create_type,
+            cloud_params=dict(self.cloud_params),
+            gh=self.gh,
+            count=count,
+            timeout=self.timeout,
+        )
+        try:
+            return deploy.start_runner_instances()
+        except BaseException:
+            print("Removing the runners of a failed start...")
+            self._teardown(deploy.instances)
+            raise
+
+    def _teardown(self, mappings: dict[str, str]):
+        """Remove runners and their instances."""
+        if not mappings:
+            return
+        teardown = TeardownInstance(
+            provider_type=self.stop_type,
+            cloud_params=dict(self.stop_params),
+            gh=self.gh,
+        )
+        teardown.stop_runner_instances(mappings)
+
+    def acquire(self, count: int) -> dict[str, str]:
+        """Hand out runners from the pool to a job.
+
+        Idle runners are handed out oldest first. Runners that are no longer
+        registered with GitHub, offline or already busy are discarded, and
+        any shortfall is started on demand.
+
+        Parameters
+        ----------
+        count : int
+            The number of runners needed.
+
+        Returns
+        -------
+        dict[str, str]
+            A dictionary of instance IDs and their corresponding github runner labels.
+
+        """
+        with self._state() as state:
+            taken = dict(list(state["idle"].items())[:count])
+            for instance_id in taken:
+                del state["idle"][instance_id]
+            state["leased"].update(taken)
+        # Removed runners are no longer registered, crashed ones stay
+        # registered but go offline, and busy ones are already running a job
+        registered = self.gh.get_runner_index(refresh=True).by_label
+        stale = {}
+        leased = {}
+        for instance_id, label in taken.items():
+            runner = registered.get(label)
+            if runner is None or runner.status != "online" or runner.busy:
+                stale[instance_id] = label
+            else:
+                leased[instance_id] = label
+        try:
+            if len(leased) < count:
+                print(
+                    f"Warm pool has {len(leased)} of {count} runners, "
+                    f"starting {count - len(leased)} more..."
+                )
+                try:
+                    started = self._deploy(count - len(leased))
+                except BaseException:
+                    # Return the healthy runners to the pool for other jobs
+                    with self._state() as state:
+                        for instance_id, label in leased.items():
+                            state["leased"].pop(instance_id, None)
+                            state["idle"][instance_id] = label
+                    raise
+                with self._state() as state:
+                    state["leased"].update(started)
+                leased.update(started)
+        finally:
+            if stale:
+                print(f"Discarding stale runners {', '.join(stale.values())}")
+                self.release(stale)
+        return leased
+
+    def release(self, mappings: dict[str, str]):
+        """Tear down runners handed out by `acquire` once a job is done.
+
+        Parameters
+        ----------
+        mappings : dict[str, str]
+            A dictionary of instance IDs and their corresponding github runner labels.
+
+        """
+        with self._state() as state:
+            for instance_id in mappings:
+                state["leased"].pop(instance_id, None)
+        self._teardown(mappings)
+
+    def refill(self) -> dict[str, str]:
+        """Start runners until the pool holds `size` idle runners.
+
+        Runners being started by other refills, including those in other
+        processes, count towards the pool size.
+
+        Returns
+        -------
+        dict[str, str]
+            A dictionary of the instance IDs and github runner labels added.
+
+        """
+        key = f"{os.getpid()}-{threading.get_ident()}-{time.time()}"
+        with self._state() as state:
+            now = time.time()
+            # Drop refills that crashed without cleaning up after themselves
+            state["refilling"] = {
+                k: v
+                for k, v in state["refilling"].items()
+                if now - v["started"] < self.timeout
+            }
+            in_flight = sum(v["count"] for v in state["refilling"].values())
+            missing = self.size - len(state["idle"]) - in_flight
+            if missing <= 0:
+                return {}
+            state["refilling"][key] = {"count": missing, "started": now}
+        started: dict[str, str] = {}
+        try:
+            started = self._deploy(missing)
+        finally:
+            with self._state() as state:
+                state["refilling"].pop(key, None)
+                state["idle"].update(started)
+        return started
+
+    def start_refill(self) -> threading.Thread:
+        """Refill the pool in a background thread.
+
+        Returns
+        -------
+        threading.Thread
+            The refill thread. At most one refill thread runs per pool object.
+
+        """
+        if self._refill_thread is None or not self._refill_thread.is_alive():
+            self._refill_thread = threading.Thread(
+                target=self.refill, name="warm-pool-refill"
+            )
+            self._refill_thread.start()
+        return self._refill_thread
+
+    def drain(self):
+        """Tear down every idle runner in the pool."""
+        with self._state() as state:
+            idle = state["idle"]
+            state["idle"] = {}
+        self._teardown(idle)
@@ -0,0 +1,84 @@
+from itertools import count
+from unittest.mock import Mock
+
+import pytest
+
+from gha_runner.clouddeployment import CreateCloudInstance, StopCloudInstance
+from gha_runner.gh import GitHubInstance, RunnerIndex, SelfHostedRunner
+
+instance_numbers = count()
+# The extra labels each started runner registers with
+runner_labels = {}
+
+
+class MockFleetStart(CreateCloudInstance):
+    def __init__(self, gh_runner_tokens, runner_labels=(), **kwargs):
+        self.count = len(gh_runner_tokens)
+        self.runner_labels = list(runner_labels)
+
+    def create_instances(self):
+        numbers = [next(instance_numbers) for _ in range(self.count)]
+        for n in numbers:
+            runner_labels[f"runner-{n}"] = self.runner_labels
+        return {f"i-{n}": f"runner-{n}" for n in numbers}
+
+    def wait_until_ready(self, ids, **kwargs):
+        pass
+
+    def set_instance_mapping(self, mapping):
+        pass
+
+
+class MockFleetStop(StopCloudInstance):
+    removed = []
+
+    def __init__(self, **kwargs):
+        pass
+
+    def remove_instances(self, ids):
+        MockFleetStop.removed.extend(ids)
+
+    def wait_until_removed(self, ids, **kwargs):
+        pass
+
+    def get_instance_mapping(self):
+        raise AssertionError("The caller passes its own mapping")
+
+
+@pytest.fixture
+def gh_mock():
+    """A GitHub instance on which started runners register at once.
+
+    `gh_mock.runners` maps the label of each registered runner to whether it
+    is busy.
+
+    """
+    MockFleetStop.removed = []
+    gh_mock = Mock(spec=GitHubInstance)
+    gh_mock.create_runner_tokens.side_effect = lambda n, **kwargs: [
+        "token"
+    ] * n
+    gh_mock.get_latest_runner_release.return_value = "https://example.com"
+    gh_mock.get_queued_jobs.return_value = []
+    gh_mock.runners = {}
+
+    def wait_for_runners(labels, timeout, **kwargs):
+        for label in labels:
+            gh_mock.runners[label] = False
+
+    gh_mock.wait_for_runners.side_effect = wait_for_runners
+    gh_mock.get_runner_index.side_effect = lambda refresh=False: (
+        RunnerIndex.from_runners(
+            [
+                SelfHostedRunner(
+                    id=i,
+                    name=label,
+                    os="linux",
+                    labels=[label, *runner_labels.get(label, [])],
+                    busy=busy,
+                )
+                for i, (label, busy) in enumerate(gh_mock.runners.items())
+            ]
+        )
+    )
+    yield gh_mock
@@ -1,7 +1,12 @@
 import re
 from gha_runner.helper.input import (
     EnvVarBuilder,
+    InputValidationError,
+    LazyJSON,
+    ParamConfig,
+    ParamSchema,
     check_required,
+    loads_json,
 )
 import pytest
 
@@ -86,3 +91,132 @@ def test_check_required():
         ),
     ):
         check_required(env, required)
+
+
+def test_env_builder_frozen():
+    env = {"INPUT_TAGS": '[{"Key": "Name", "Value": "test"}]', "INPUT_A": "a"}
+    builder = EnvVarBuilder(env, frozen=True).update_state(
+        "INPUT_TAGS", "tags", is_json=True
+    )
+    first = builder.build()
+    assert first == {"tags": [{"Key": "Name", "Value": "test"}]}
+    with pytest.raises(TypeError):
+        first["tags"] = []
+    # Views handed out are not changed by later updates
+    second = builder.update_state("INPUT_A", "a").params
+    assert first == {"tags": [{"Key": "Name", "Value": "test"}]}
+    assert second == {"tags": first["tags"], "a": "a"}
+    # Nested values are shared instead of copied
+    assert second["tags"] is first["tags"]
+
+
+def test_env_builder_params_are_copies():
+    builder = EnvVarBuilder({"INPUT_TAGS": '{"Key": "Name"}'}).update_state(
+        "INPUT_TAGS", "tags", is_json=True
+    )
+    params = builder.build()
+    params["tags"]["Key"] = "Other"
+    assert builder.params == {"tags": {"Key": "Name"}}
+
+
+AWS_SCHEMA = ParamSchema(
+    [
+        ParamConfig("INPUT_AWS_IMAGE_ID", "image_id", required=True),
+        ParamConfig("INPUT_AWS_INSTANCE_TYPE", "instance_type"),
+        ParamConfig("GITHUB_REPOSITORY", "repo"),
+        ParamConfig("INPUT_GH_REPO", "repo"),
+        ParamConfig("INPUT_INSTANCE_COUNT", "instance_count", type_val=int),
+        ParamConfig("INPUT_AWS_TAGS", "tags", is_json=True),
+        ParamConfig("INPUT_AWS_HOME_DIR", "home_dir", allow_empty=True),
+    ],
+    required=["GH_PAT"],
+)
+
+
+def test_schema_matches_update_state():
+    env = {
+        "GH_PAT": "123",
+        "INPUT_AWS_IMAGE_ID": "ami-1234567890",
+        "INPUT_AWS_INSTANCE_TYPE": "",
+        "INPUT_GH_REPO": "owner/test",
+        "GITHUB_REPOSITORY": "owner/test_other",
+        "INPUT_INSTANCE_COUNT": "2",
+        "INPUT_AWS_TAGS": '{"Key": "Name", "Value": "test"}',
+        "INPUT_AWS_HOME_DIR": "",
+    }
+    params = EnvVarBuilder(env).update_from_schema(AWS_SCHEMA).params
+    expected = EnvVarBuilder(env)
+    for config in AWS_SCHEMA.configs:
+        expected.update_state(
+            config.env_var,
+            config.key,
+            config.is_json,
+            config.allow_empty,
+            config.type_val,
+        )
+    assert params == expected.params
+    assert params["repo"] == "owner/test"
+    assert params["instance_count"] == 2
+    assert AWS_SCHEMA.required == ["GH_PAT", "INPUT_AWS_IMAGE_ID"]
+
+
+def test_schema_reports_all_errors():
+    env = {
+        "INPUT_INSTANCE_COUNT": "two",
+        "INPUT_AWS_TAGS": "{not json",
+    }
+    builder = EnvVarBuilder(env)
+    with pytest.raises(InputValidationError) as e:
+        builder.update_from_schema(AWS_SCHEMA)
+    errors = e.value.errors
+    assert len(errors) == 3
+    assert errors[0] == (
+        "Missing required environment variables: "
+        "['GH_PAT', 'INPUT_AWS_IMAGE_ID']"
+    )
+    assert errors[1].startswith("Invalid value for INPUT_INSTANCE_COUNT:")
+    assert errors[2].startswith("Invalid value for INPUT_AWS_TAGS:")
+    assert isinstance(e.value, ValueError)
+    assert builder.params == {}
+
+
+def test_lazy_json():
+    env = {"INPUT_TAGS": '[{"Key": "Name"}]', "INPUT_BAD": "{not json"}
+    params = (
+        EnvVarBuilder(env)
+        .update_state("INPUT_TAGS", "tags", is_json=True, lazy=True)
+        .update_state("INPUT_BAD", "bad", is_json=True, lazy=True)
+        .params
+    )
+    tags = params["tags"]
+    assert isinstance(tags, LazyJSON)
+    assert repr(tags) == "LazyJSON(raw='[{\"Key\": \"Name\"}]')"
+    assert tags.value == [{"Key": "Name"}]
+    # The parsed value is memoized
+    assert tags.value is tags.value
+    # Invalid values only fail when used
+    with pytest.raises(ValueError):
+        params["bad"].value
+
+
+def test_lazy_json_schema():
+    schema = ParamSchema(
+        [ParamConfig("INPUT_MAPPING", "mapping", is_json=True, lazy=True)]
+    )
+    params = schema.parse({"INPUT_MAPPING": '{"i-1": "runner-1"}'})
+    assert params["mapping"] == LazyJSON('{"i-1": "runner-1"}')
+    assert params["mapping"].value == {"i-1": "runner-1"}
+
+
+@pytest.mark.parametrize(
+    "raw", ['{"a": [1, 2.5, null, "\\u00e9"]}', "[1e400]", "NaN"]
+)
+def test_loads_json_matches_json(raw):
+    import json
+    import math
+
+    result = loads_json(raw)
+    if raw == "NaN":
+        assert math.isnan(result)
+    else:
+        assert result == json.loads(raw)
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from gha_runner.helper import mapping as mapping_module
+from gha_runner.helper.mapping import (
+    decode_mapping,
+    encode_mapping,
+    iter_mapping,
+)
+
+
+def fleet(count):
+    return {f"i-{i:017x}": f"runner-{i:08d}" for i in range(count)}
+
+
+@pytest.mark.parametrize("count", [0, 1, 500])
+def test_round_trip(count):
+    mapping = fleet(count)
+    encoded = encode_mapping(mapping)
+    assert encoded.startswith("z1:")
+    assert decode_mapping(encoded) == mapping
+    assert list(iter_mapping(encoded)) == list(mapping.items())
+
+
+def test_encoding_is_compact():
+    mapping = fleet(500)
+    assert len(encode_mapping(mapping)) < len(json.dumps(mapping)) / 2
+
+
+def test_decodes_across_chunks(monkeypatch):
+    monkeypatch.setattr(mapping_module, "_CHUNK_SIZE", 16)
+    mapping = fleet(100)
+    assert decode_mapping(encode_mapping(mapping)) == mapping
+
+
+def test_decodes_plain_json():
+    assert decode_mapping('{"i-123": "runner-1"}') == {"i-123": "runner-1"}
+    with pytest.raises(ValueError):
+        decode_mapping('["i-123"]')
+
+
+def test_spill_to_file(tmp_path):
+    mapping = fleet(500)
+    encoded = encode_mapping(mapping, spill_dir=tmp_path, max_inline=100)
+    assert encoded.startswith("f1:")
+    assert len(encoded) == 19
+    assert decode_mapping(encoded, spill_dir=tmp_path) == mapping
+    with pytest.raises(ValueError, match="spill_dir"):
+        decode_mapping(encoded)
+    with pytest.raises(ValueError, match="Invalid mapping reference"):
+        decode_mapping("f1:../secret", spill_dir=tmp_path)
+
+
+def test_malformed_mapping():
+    encoded = encode_mapping(fleet(50))
+    with pytest.raises(ValueError, match="Malformed instance mapping"):
+        decode_mapping(encoded[:-12])
+    with pytest.raises(ValueError, match="Malformed instance mapping"):
+        decode_mapping("z1:not-base64!")
+
+
+def test_encode_rejects_separators():
+    with pytest.raises(ValueError):
+        encode_mapping({"i-1": "runner\t1"})
+    with pytest.raises(ValueError):
+        encode_mapping({"i-1\n": "runner-1"})
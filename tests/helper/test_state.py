@@ -0,0 +1,54 @@
+import json
+import multiprocessing
+import threading
+
+from gha_runner.helper.state import locked_json_state
+
+
+def increment(path, times):
+    for _ in range(times):
+        with locked_json_state(path, count=0) as state:
+            state["count"] += 1
+
+
+def test_locked_json_state(tmp_path):
+    path = tmp_path / "state.json"
+    with locked_json_state(path, idle={}) as state:
+        state["idle"]["i-123"] = "runner-abc"
+    assert json.loads(path.read_text()) == {"idle": {"i-123": "runner-abc"}}
+
+
+def test_locked_json_state_not_saved_on_error(tmp_path):
+    path = tmp_path / "state.json"
+    try:
+        with locked_json_state(path, count=0) as state:
+            state["count"] = 1
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert not path.exists()
+
+
+def test_locked_json_state_processes(tmp_path):
+    path = tmp_path / "state.json"
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(target=increment, args=(path, 100)) for _ in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert json.loads(path.read_text()) == {"count": 400}
+
+
+def test_locked_json_state_threads(tmp_path):
+    path = tmp_path / "state.json"
+    workers = [
+        threading.Thread(target=increment, args=(path, 100)) for _ in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert json.loads(path.read_text()) == {"count": 400}
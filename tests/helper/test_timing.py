@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from gha_runner.helper.timing import JsonLinesSink, Timer
+
+
+def test_span_records_duration_and_attributes():
+    received = []
+    timer = Timer([received.append])
+    with timer.span("create_instances", count=2) as attributes:
+        attributes["region"] = "us-east-1"
+    (span,) = timer.spans
+    assert received == [span]
+    assert span.name == "create_instances"
+    assert span.duration >= 0
+    assert span.attributes == {"count": 2, "region": "us-east-1"}
+    assert span.error is None
+
+
+def test_span_records_error():
+    timer = Timer()
+    with pytest.raises(RuntimeError):
+        with timer.span("wait_for_runners"):
+            raise RuntimeError("Timeout")
+    assert timer.spans[0].error == "RuntimeError('Timeout')"
+
+
+def test_json_lines_sink(tmp_path):
+    path = tmp_path / "timings.jsonl"
+    timer = Timer([JsonLinesSink(path)])
+    with timer.span("remove_runner", label="runner-1"):
+        pass
+    with timer.span("remove_runner", label="runner-2"):
+        pass
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["attributes"]["label"] for line in lines] == [
+        "runner-1",
+        "runner-2",
+    ]
+    assert set(lines[0]) == {"name", "start", "duration", "attributes", "error"}
+
+
+def test_write_step_summary(tmp_path, monkeypatch):
+    path = tmp_path / "summary.md"
+    monkeypatch.setenv("GITHUB_STEP_SUMMARY", str(path))
+    timer = Timer()
+    timer.write_step_summary()
+    assert not path.exists()
+    for _ in range(2):
+        with timer.span("remove_runner"):
+            pass
+    timer.write_step_summary("Stop")
+    summary = path.read_text()
+    assert summary.startswith("### Stop\n")
+    assert "| remove_runner | 2 |" in summary
@@ -1,6 +1,11 @@
 import pytest
 from unittest.mock import mock_open, patch
-from gha_runner.helper.workflow_cmds import output, warning, error
+from gha_runner.helper.workflow_cmds import (
+    WorkflowCommands,
+    error,
+    output,
+    warning,
+)
 
 
 def test_output(monkeypatch):
@@ -44,3 +49,60 @@ def test_output_missing_env_var(monkeypatch):
     monkeypatch.delenv("GITHUB_OUTPUT", raising=False)
     with pytest.raises(KeyError):
         output("test_name", "test_value")
+
+
+def test_output_multiline(tmp_path, monkeypatch):
+    path = tmp_path / "output"
+    monkeypatch.setenv("GITHUB_OUTPUT", str(path))
+    output("mapping", "line 1\nline 2")
+    header, first, second, footer, end = path.read_text().split("\n")
+    name, delimiter = header.split("<<")
+    assert name == "mapping"
+    assert delimiter.startswith("ghadelimiter_")
+    assert (first, second, footer, end) == ("line 1", "line 2", delimiter, "")
+
+
+def test_workflow_commands_buffered(tmp_path, monkeypatch, capsys):
+    for var in ("GITHUB_OUTPUT", "GITHUB_STATE", "GITHUB_STEP_SUMMARY"):
+        monkeypatch.setenv(var, str(tmp_path / var))
+    with WorkflowCommands() as cmds:
+        cmds.output("count", 2)
+        cmds.output("labels", "runner-1\nrunner-2")
+        cmds.state("mapping", "{}")
+        cmds.summary("## Runners\n")
+        cmds.warning("Slow start", "runner-2")
+        # Nothing is written until the commands are flushed
+        assert not (tmp_path / "GITHUB_OUTPUT").exists()
+        assert capsys.readouterr().out == ""
+    outputs = (tmp_path / "GITHUB_OUTPUT").read_text()
+    delimiter = outputs.split("\n")[1].split("<<")[1]
+    assert outputs == (
+        f"count=2\nlabels<<{delimiter}\nrunner-1\nrunner-2\n{delimiter}\n"
+    )
+    assert (tmp_path / "GITHUB_STATE").read_text() == "mapping={}\n"
+    assert (tmp_path / "GITHUB_STEP_SUMMARY").read_text() == "## Runners\n"
+    assert capsys.readouterr().out == "::warning title=Slow start::runner-2\n"
+
+
+def test_workflow_commands_flush_appends(tmp_path):
+    path = tmp_path / "output"
+    path.write_text("existing=1\n")
+    cmds = WorkflowCommands(output_path=path)
+    cmds.output("a", "1")
+    cmds.flush()
+    cmds.flush()
+    cmds.output("b", "2")
+    cmds.flush()
+    assert path.read_text() == "existing=1\na=1\nb=2\n"
+
+
+def test_workflow_commands_missing_env_var(monkeypatch):
+    monkeypatch.delenv("GITHUB_OUTPUT", raising=False)
+    cmds = WorkflowCommands()
+    # Annotations alone do not need any file
+    cmds.error("Title", "Message")
+    cmds.flush()
+    cmds.output("a", "1")
+    with pytest.raises(KeyError):
+        cmds.flush()
+    assert cmds._outputs == ["a=1\n"]
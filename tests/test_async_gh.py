@@ -0,0 +1,164 @@
+import asyncio
+import json
+
+import pytest
+from unittest.mock import patch
+
+httpx = pytest.importorskip("httpx")
+
+from gha_runner.async_gh import AsyncGitHubInstance  # noqa: E402
+from gha_runner.gh import (  # noqa: E402
+    MissingRunnerLabel,
+    RunnerListError,
+    TokenRetrievalError,
+)
+
+
+def make_instance(handler):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AsyncGitHubInstance(token="fake-token", repo="test/test", client=client)
+
+
+def runner_json(i):
+    return {
+        "id": i,
+        "name": f"test-runner-{i}",
+        "os": "linux",
+        "labels": [{"name": f"test-label-{i}"}],
+    }
+
+
+def test_headers():
+    gh = make_instance(lambda request: httpx.Response(200))
+    assert gh.headers["Authorization"] == "Bearer fake-token"
+    assert gh.headers["X-Github-Api-Version"] == "2022-11-28"
+
+
+def test_context_manager_closes_client():
+    async def run():
+        async with make_instance(lambda r: httpx.Response(200)) as gh:
+            pass
+        return gh
+
+    gh = asyncio.run(run())
+    assert gh.client.is_closed
+
+
+def test_create_runner_tokens():
+    counter = iter(range(5))
+
+    def handler(request):
+        assert request.url.path.endswith("runners/registration-token")
+        assert request.headers["Authorization"] == "Bearer fake-token"
+        return httpx.Response(200, json={"token": f"token-{next(counter)}"})
+
+    gh = make_instance(handler)
+    tokens = asyncio.run(gh.create_runner_tokens(5, max_concurrency=2))
+    assert sorted(tokens) == [f"token-{i}" for i in range(5)]
+
+
+def test_create_runner_tokens_error():
+    gh = make_instance(lambda request: httpx.Response(400))
+    with pytest.raises(
+        TokenRetrievalError, match="Created 0 of 3 runner tokens: *"
+    ):
+        asyncio.run(gh.create_runner_tokens(3))
+
+
+def test_get_runners_pagination():
+    def handler(request):
+        page = int(request.url.params["page"])
+        ids = range(30 * (page - 1), min(30 * page, 45))
+        runners = [runner_json(i) for i in ids]
+        return httpx.Response(200, json={"total_count": 45, "runners": runners})
+
+    gh = make_instance(handler)
+    runners = asyncio.run(gh.get_runners())
+    assert [runner.id for runner in runners] == list(range(45))
+
+
+def test_get_runners_empty():
+    gh = make_instance(
+        lambda r: httpx.Response(200, json={"total_count": 0, "runners": []})
+    )
+    assert asyncio.run(gh.get_runners()) is None
+
+
+def test_get_runners_error():
+    gh = make_instance(lambda request: httpx.Response(500))
+    with pytest.raises(RunnerListError, match="Error getting runners: *"):
+        asyncio.run(gh.get_runners())
+
+
+def test_get_runners_no_json():
+    gh = make_instance(lambda request: httpx.Response(200, content=b""))
+    with pytest.raises(
+        RunnerListError, match="Did not receive mapping object: *"
+    ):
+        asyncio.run(gh.get_runners())
+
+
+def test_get_runner_missing_label():
+    gh = make_instance(
+        lambda r: httpx.Response(
+            200, json={"total_count": 1, "runners": [runner_json(1)]}
+        )
+    )
+    assert asyncio.run(gh.get_runner("test-label-1")).id == 1
+    with pytest.raises(MissingRunnerLabel):
+        asyncio.run(gh.get_runner("nonexistent-label"))
+
+
+@patch("asyncio.sleep")
+def test_wait_for_runners(mock_sleep):
+    responses = iter(
+        [
+            {"total_count": 0, "runners": []},
+            {"total_count": 1, "runners": [runner_json(1)]},
+            {"total_count": 2, "runners": [runner_json(1), runner_json(2)]},
+        ]
+    )
+    gh = make_instance(lambda r: httpx.Response(200, json=next(responses)))
+    runners = asyncio.run(
+        gh.wait_for_runners(["test-label-1", "test-label-2"], timeout=60)
+    )
+    assert [runner.id for runner in runners.values()] == [1, 2]
+    assert mock_sleep.call_count == 2
+
+
+def test_remove_runner():
+    deleted = []
+
+    def handler(request):
+        if request.method == "DELETE":
+            deleted.append(request.url.path)
+            return httpx.Response(204)
+        return httpx.Response(
+            200, json={"total_count": 1, "runners": [runner_json(7)]}
+        )
+
+    gh = make_instance(handler)
+    asyncio.run(gh.remove_runner("test-label-7"))
+    assert deleted == ["/repos/test/test/actions/runners/7"]
+
+
+def test_get_latest_runner_release():
+    body = {
+        "assets": [
+            {
+                "name": "actions-runner-linux-x64-2.0.0.tar.gz",
+                "browser_download_url": "https://example.com/runner.tar.gz",
+            }
+        ]
+    }
+    gh = make_instance(lambda r: httpx.Response(200, content=json.dumps(body)))
+    url = asyncio.run(gh.get_latest_runner_release("linux", "x64"))
+    assert url == "https://example.com/runner.tar.gz"
+    with pytest.raises(ValueError):
+        asyncio.run(gh.get_latest_runner_release("linux", "invalid"))
+
+
+def test_generate_random_label():
+    label = AsyncGitHubInstance.generate_random_label()
+    assert label.startswith("runner-")
+    assert len(label) == 15
@@ -0,0 +1,176 @@
+import pytest
+from conftest import MockFleetStart, MockFleetStop
+
+from gha_runner.autoscaler import Autoscaler, count_queued_jobs, scale_fleets
+from gha_runner.gh import WorkflowJob
+
+LABELS = ["self-hosted", "linux", "gpu"]
+
+
+def job(i, labels=LABELS):
+    return WorkflowJob(id=i, run_id=1, name="test", status="queued", labels=labels)
+
+
+@pytest.fixture
+def autoscaler(gh_mock, tmp_path):
+    yield Autoscaler(
+        create_type=MockFleetStart,
+        stop_type=MockFleetStop,
+        cloud_params={},
+        stop_params={},
+        gh=gh_mock,
+        labels=LABELS,
+        state_path=tmp_path / "fleet.json",
+        max_runners=5,
+        cooldown=0,
+    )
+
+
+def test_count_queued_jobs():
+    jobs = [job(1), job(2, ["self-hosted", "GPU"]), job(3, ["ubuntu-latest"])]
+    assert count_queued_jobs(jobs, [LABELS, ["ubuntu-latest"]]) == [2, 1]
+
+
+def test_scale_up_to_backlog(autoscaler, gh_mock):
+    gh_mock.get_queued_jobs.return_value = [job(i) for i in range(3)]
+    decision = autoscaler.scale()
+    assert decision.desired == 3
+    assert decision.scale_up == 3
+    gh_mock.create_runner_tokens.assert_called_once_with(3, max_workers=1)
+    with autoscaler._state() as state:
+        assert len(state["fleet"]) == 3
+
+
+def test_failed_scale_up_records_instances(autoscaler, gh_mock):
+    gh_mock.get_queued_jobs.return_value = [job(1), job(2)]
+    gh_mock.wait_for_runners.side_effect = RuntimeError("Timeout reached")
+    with pytest.raises(RuntimeError, match="Timeout reached"):
+        autoscaler.scale()
+    with autoscaler._state() as state:
+        assert len(state["fleet"]) == 2
+    # The runners never registered, so they are stopped once timed out
+    autoscaler.timeout = -1
+    gh_mock.get_queued_jobs.return_value = []
+    decision = autoscaler.scale()
+    assert len(decision.finished) == 2
+    assert sorted(MockFleetStop.removed) == sorted(decision.finished)
+
+
+def test_scale_up_capped_at_max(autoscaler, gh_mock):
+    gh_mock.get_queued_jobs.return_value = [job(i) for i in range(20)]
+    assert autoscaler.scale().scale_up == 5
+
+
+def test_scale_down_idle_runners(autoscaler, gh_mock):
+    gh_mock.get_queued_jobs.return_value = [job(i) for i in range(3)]
+    autoscaler.scale()
+    busy_label = next(iter(gh_mock.runners))
+    gh_mock.runners[busy_label] = True
+    gh_mock.get_queued_jobs.return_value = []
+    decision = autoscaler.scale()
+    assert decision.desired == 1
+    assert len(decision.scale_down) == 2
+    assert busy_label not in decision.scale_down.values()
+    assert sorted(MockFleetStop.removed) == sorted(decision.scale_down)
+
+
+def test_scale_down_respects_cooldown(autoscaler, gh_mock):
+    autoscaler.cooldown = 3600
+    gh_mock.get_queued_jobs.return_value = [job(1)]
+    autoscaler.scale()
+    gh_mock.get_queued_jobs.return_value = []
+    assert autoscaler.scale().scale_down == {}
+    assert MockFleetStop.removed == []
+
+
+def test_min_runners(autoscaler):
+    autoscaler.min_runners = 2
+    assert autoscaler.scale().scale_up == 2
+
+
+def test_finished_runners_are_stopped(autoscaler, gh_mock):
+    autoscaler.timeout = -1
+    gh_mock.get_queued_jobs.return_value = [job(1)]
+    autoscaler.scale()
+    # The ephemeral runner ran its job and deregistered
+    gh_mock.runners.clear()
+    gh_mock.get_queued_jobs.return_value = []
+    decision = autoscaler.scale()
+    assert len(decision.finished) == 1
+    assert MockFleetStop.removed == list(decision.finished)
+
+
+def test_dry_run(autoscaler, gh_mock, capsys):
+    autoscaler.dry_run = True
+    gh_mock.get_queued_jobs.return_value = [job(1), job(2)]
+    decision = autoscaler.scale()
+    assert decision.scale_up == 2
+    gh_mock.create_runner_tokens.assert_not_called()
+    assert "Dry run: would start 2 and stop 0 instances" in capsys.readouterr().out
+
+
+def test_invalid_bounds(gh_mock, tmp_path):
+    with pytest.raises(ValueError):
+        Autoscaler(
+            create_type=MockFleetStart,
+            stop_type=MockFleetStop,
+            cloud_params={},
+            stop_params={},
+            gh=gh_mock,
+            labels=LABELS,
+            state_path=tmp_path / "fleet.json",
+            min_runners=3,
+            max_runners=2,
+        )
+
+
+def test_scale_fleets(autoscaler, gh_mock, tmp_path):
+    cpu = Autoscaler(
+        create_type=MockFleetStart,
+        stop_type=MockFleetStop,
+        cloud_params={},
+        stop_params={},
+        gh=gh_mock,
+        labels=["self-hosted", "linux", "x64"],
+        state_path=tmp_path / "cpu.json",
+        max_runners=5,
+    )
+    gh_mock.get_queued_jobs.return_value = [
+        job(1),
+        job(2),
+        job(3, ["self-hosted", "x64"]),
+    ]
+    gpu_decision, cpu_decision = scale_fleets([autoscaler, cpu])
+    # Jobs are fetched once and each is counted against one fleet only
+    gh_mock.get_queued_jobs.assert_called_once()
+    assert gpu_decision.scale_up == 2
+    assert cpu_decision.scale_up == 1
+
+
+def test_scale_fleets_shared_state(autoscaler):
+    with pytest.raises(ValueError, match="own state_path"):
+        scale_fleets([autoscaler, autoscaler])
+
+
+def test_runner_labels_passed_to_provider(autoscaler, gh_mock):
+    gh_mock.get_queued_jobs.return_value = [job(1)]
+    autoscaler.scale()
+    (runner,) = gh_mock.get_runner_index().by_id.values()
+    assert set(LABELS) <= set(runner.labels)
+
+
+def test_mismatched_runners_are_stopped(autoscaler, gh_mock, capsys):
+    class IgnoresLabelsStart(MockFleetStart):
+        def __init__(self, gh_runner_tokens, **kwargs):
+            super().__init__(gh_runner_tokens)
+
+    autoscaler.create_type = IgnoresLabelsStart
+    gh_mock.get_queued_jobs.return_value = [job(1)]
+    autoscaler.scale()
+    decision = autoscaler.scale()
+    # The runner can not take the gpu job, so it is not counted as capacity
+    assert len(decision.mismatched) == 1
+    assert decision.current == 0
+    assert decision.scale_up == 0
+    assert MockFleetStop.removed == list(decision.mismatched)
+    assert "do not carry the labels" in capsys.readouterr().out
@@ -1,12 +1,15 @@
+import time
+
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import ANY, Mock, patch
 from gha_runner.clouddeployment import (
     CreateCloudInstance,
     DeployInstance,
     StopCloudInstance,
     TeardownInstance,
 )
-from gha_runner.gh import GitHubInstance, MissingRunnerLabel
+from gha_runner.gh import GitHubInstance, MissingRunnerLabel, PollStrategy
+from gha_runner.helper.mapping import encode_mapping, iter_mapping
 
 
 class MockStartCloudInstance(CreateCloudInstance):
@@ -73,15 +76,100 @@ def deploy_instance(gh_mock):
 
 def test_deploy_instance_creation(deploy_instance, gh_mock):
     assert isinstance(deploy_instance.provider, MockStartCloudInstance)
-    gh_mock.create_runner_tokens.assert_called_once_with(1)
+    gh_mock.create_runner_tokens.assert_called_once_with(1, max_workers=1)
     gh_mock.get_latest_runner_release.assert_called_once_with(
         platform="linux", architecture="x64"
     )
 
 
+def test_deploy_instance_pinned_runner_version(gh_mock):
+    deploy = DeployInstance(
+        provider_type=MockStartCloudInstance,
+        cloud_params={"arch": "arm64"},
+        gh=gh_mock,
+        count=1,
+        timeout=30,
+        runner_version="2.321.0",
+    )
+    gh_mock.get_latest_runner_release.assert_not_called()
+    assert deploy.cloud_params["runner_release"] == (
+        "https://github.com/actions/runner/releases/download/"
+        "v2.321.0/actions-runner-linux-arm64-2.321.0.tar.gz"
+    )
+
+
+def test_deploy_instance_pipelined(gh_mock):
+    deploy = DeployInstance(
+        provider_type=MockStartCloudInstance,
+        cloud_params={},
+        gh=gh_mock,
+        count=1,
+        timeout=30,
+        token_workers=4,
+        pipeline=True,
+    )
+    gh_mock.create_runner_tokens.assert_called_once_with(1, max_workers=4)
+    assert deploy.cloud_params["gh_runner_tokens"] == ["token1"]
+    assert deploy.cloud_params["runner_release"] == (
+        gh_mock.get_latest_runner_release.return_value
+    )
+    deploy.start_runner_instances()
+    gh_mock.wait_for_runners.assert_called_once_with(
+        ["runner-1"], 30, poll=deploy.poll, cancel=ANY
+    )
+
+
+def test_deploy_instance_pipelined_ready_error(gh_mock):
+    class FailingReady(MockStartCloudInstance):
+        def wait_until_ready(self, ids, **kwargs):
+            raise RuntimeError("Instance failed")
+
+    deploy = DeployInstance(
+        provider_type=FailingReady,
+        cloud_params={},
+        gh=gh_mock,
+        count=1,
+        timeout=30,
+        pipeline=True,
+    )
+    with pytest.raises(RuntimeError, match="Instance failed"):
+        deploy.start_runner_instances()
+
+
+def test_deploy_instance_pipelined_stops_polling_on_ready_error():
+    class SlowFailingReady(MockStartCloudInstance):
+        def wait_until_ready(self, ids, **kwargs):
+            time.sleep(0.05)
+            raise RuntimeError("Instance failed")
+
+    gh = GitHubInstance(token="fake-token", repo="test/test")
+    with (
+        patch.object(gh, "create_runner_tokens", return_value=["token1"]),
+        patch.object(gh, "get_latest_runner_release", return_value="url"),
+    ):
+        deploy = DeployInstance(
+            provider_type=SlowFailingReady,
+            cloud_params={},
+            gh=gh,
+            count=1,
+            timeout=600,
+            poll=PollStrategy.fixed(600),
+            pipeline=True,
+        )
+    start = time.monotonic()
+    with patch.object(gh, "get_runners", return_value=[]) as mock_get:
+        with pytest.raises(RuntimeError, match="Instance failed"):
+            deploy.start_runner_instances()
+    # The readiness error ends the wait long before the poll interval
+    assert time.monotonic() - start < 5
+    assert mock_get.call_count == 1
+
+
 def test_deploy_instance_start_runners(deploy_instance, gh_mock):
     deploy_instance.start_runner_instances()
-    gh_mock.wait_for_runner.assert_called_once_with("runner-1", 30)
+    gh_mock.wait_for_runners.assert_called_once_with(
+        ["runner-1"], 30, poll=deploy_instance.poll, cancel=None
+    )
 
 
 def test_teardown_instance_stop_runner(gh_mock):
@@ -167,3 +255,373 @@ def test_teardown_instance_failed_wait(gh_mock, capsys):
     actual_output = catpured_output.strip().split("\n")
     assert actual_output == expected_output
     assert exit_info.value.code == 1
+
+
+class MockFleetStopCloudInstance(MockStopCloudInstance):
+    def __init__(self):
+        self.instances = {f"i-{i}": f"runner-{i}" for i in range(4)}
+        self.removed = []
+
+    def remove_instances(self, ids):
+        self.removed.extend(ids)
+
+
+def test_teardown_instance_parallel(gh_mock, capsys):
+    def remove_runner(label):
+        if label == "runner-1":
+            raise MissingRunnerLabel(label)
+        if label == "runner-2":
+            raise Exception("Testing")
+
+    gh_mock.remove_runner.side_effect = remove_runner
+    teardown = TeardownInstance(
+        provider_type=MockFleetStopCloudInstance,
+        cloud_params={},
+        gh=gh_mock,
+        max_workers=4,
+    )
+    teardown.stop_runner_instances()
+    assert sorted(c.args[0] for c in gh_mock.remove_runner.call_args_list) == [
+        f"runner-{i}" for i in range(4)
+    ]
+    assert teardown.provider.removed == [f"i-{i}" for i in range(4)]
+    actual_output = capsys.readouterr().out.strip().split("\n")
+    assert "Runner runner-1 does not exist, skipping..." in actual_output
+    assert "::warning title=Failed to remove runner::Testing" in actual_output
+    assert actual_output[-2:] == [
+        "Waiting for instance to be removed...",
+        "Instances removed!",
+    ]
+
+
+class MockStreamingStartCloudInstance(MockStartCloudInstance):
+    def __init__(self, **kwargs):
+        self.instances = {"i-1": "runner-1", "i-2": "runner-2"}
+
+    def wait_until_ready(self, ids, **kwargs):
+        raise AssertionError("The batch waiter should not be used")
+
+    def iter_ready(self, ids, **kwargs):
+        yield "i-2"
+        yield "i-1"
+
+
+def test_iter_ready_falls_back_to_batch_wait():
+    provider = MockStartCloudInstance()
+    with patch.object(provider, "wait_until_ready") as mock_wait:
+        assert list(provider.iter_ready(["i-1", "i-2"])) == ["i-1", "i-2"]
+    mock_wait.assert_called_once_with(["i-1", "i-2"])
+
+
+def test_deploy_instance_streaming_readiness(gh_mock, capsys):
+    deploy = DeployInstance(
+        provider_type=MockStreamingStartCloudInstance,
+        cloud_params={},
+        gh=gh_mock,
+        count=2,
+        timeout=30,
+    )
+    arrived = []
+
+    def wait_for_arriving_runners(labels, timeout, poll):
+        arrived.extend(labels)
+        return {label: Mock() for label in arrived}
+
+    gh_mock.wait_for_arriving_runners.side_effect = wait_for_arriving_runners
+    deploy.start_runner_instances()
+    # Both runners share one poll loop, fed in the order instances are ready
+    assert arrived == ["runner-2", "runner-1"]
+    gh_mock.wait_for_arriving_runners.assert_called_once_with(
+        ANY, 30, poll=deploy.poll
+    )
+    gh_mock.wait_for_runner.assert_not_called()
+    gh_mock.wait_for_runners.assert_not_called()
+    output = capsys.readouterr().out
+    assert output.index("Instance i-2 is ready!") < output.index(
+        "Instance i-1 is ready!"
+    )
+
+
+def test_deploy_instance_streaming_never_ready(gh_mock):
+    class SkippingReady(MockStreamingStartCloudInstance):
+        def iter_ready(self, ids, **kwargs):
+            yield "i-1"
+
+    gh_mock.wait_for_arriving_runners.side_effect = (
+        lambda labels, timeout, poll: {label: Mock() for label in labels}
+    )
+    deploy = DeployInstance(
+        provider_type=SkippingReady,
+        cloud_params={},
+        gh=gh_mock,
+        count=2,
+        timeout=30,
+    )
+    with pytest.raises(RuntimeError, match=r"\['i-2'\] were never reported"):
+        deploy.start_runner_instances()
+
+
+def test_deploy_instance_streaming_runner_timeout(gh_mock):
+    gh_mock.wait_for_arriving_runners.side_effect = RuntimeError(
+        "Timeout reached"
+    )
+    deploy = DeployInstance(
+        provider_type=MockStreamingStartCloudInstance,
+        cloud_params={},
+        gh=gh_mock,
+        count=2,
+        timeout=30,
+    )
+    with pytest.raises(RuntimeError, match="Timeout reached"):
+        deploy.start_runner_instances()
+
+
+class MockBatchStartCloudInstance(MockStartCloudInstance):
+    created = 0
+
+    def __init__(self, gh_runner_tokens=(), **kwargs):
+        # One instance per runner token, numbered across retries
+        self.instances = {}
+        for _ in gh_runner_tokens:
+            MockBatchStartCloudInstance.created += 1
+            i = MockBatchStartCloudInstance.created
+            self.instances[f"i-{i}"] = f"runner-{i}"
+        self.mapping = None
+
+    def set_instance_mapping(self, mapping):
+        self.mapping = mapping
+
+
+class MockRecordingStop(MockStopCloudInstance):
+    removed = []
+
+    def remove_instances(self, ids):
+        MockRecordingStop.removed.extend(ids)
+
+
+@pytest.fixture
+def batch_providers():
+    MockBatchStartCloudInstance.created = 0
+    MockRecordingStop.removed = []
+
+
+def online_index(labels):
+    index = Mock()
+    index.by_label = {label: Mock() for label in labels}
+    return index
+
+
+def partial_deploy(gh_mock, count, min_count, **kwargs):
+    gh_mock.create_runner_tokens.return_value = ["token"] * count
+    return DeployInstance(
+        provider_type=MockBatchStartCloudInstance,
+        cloud_params={},
+        gh=gh_mock,
+        count=count,
+        timeout=30,
+        min_count=min_count,
+        stop_type=MockRecordingStop,
+        **kwargs,
+    )
+
+
+def test_deploy_instance_min_count_requires_stop_type(gh_mock):
+    with pytest.raises(ValueError, match="requires a stop_type"):
+        DeployInstance(
+            provider_type=MockStartCloudInstance,
+            cloud_params={},
+            gh=gh_mock,
+            count=1,
+            timeout=30,
+            min_count=1,
+        )
+
+
+def test_deploy_instance_min_count_above_count(gh_mock):
+    with pytest.raises(ValueError, match="can not be greater than count"):
+        partial_deploy(gh_mock, count=2, min_count=3)
+
+
+def test_deploy_instance_publishes_mapping_before_waiting(
+    gh_mock, batch_providers
+):
+    deploy = partial_deploy(gh_mock, count=2, min_count=2)
+    # The start is cancelled while waiting for the runners
+    gh_mock.wait_for_runners.side_effect = KeyboardInterrupt
+    with pytest.raises(KeyboardInterrupt):
+        deploy.start_runner_instances()
+    # The stop action can still find every instance created
+    assert deploy.provider.mapping == {"i-1": "runner-1", "i-2": "runner-2"}
+
+
+def test_deploy_instance_unpublishes_removed_instances(
+    gh_mock, batch_providers
+):
+    deploy = partial_deploy(gh_mock, count=2, min_count=2, max_retries=1)
+    published = []
+    deploy.provider.set_instance_mapping = published.append
+    gh_mock.wait_for_runners.side_effect = [RuntimeError("Timeout"), None]
+    gh_mock.get_runner_index.return_value = online_index(["runner-1"])
+    deploy.start_runner_instances()
+    assert published == [
+        {"i-1": "runner-1", "i-2": "runner-2"},
+        {"i-1": "runner-1"},
+        {"i-1": "runner-1", "i-3": "runner-3"},
+    ]
+
+
+def test_deploy_instance_retries_failed_runners(gh_mock, batch_providers):
+    deploy = partial_deploy(gh_mock, count=3, min_count=3)
+    # runner-2 never registers, so it is replaced by runner-4
+    gh_mock.wait_for_runners.side_effect = [RuntimeError("Timeout"), None]
+    gh_mock.get_runner_index.return_value = online_index(
+        ["runner-1", "runner-3"]
+    )
+    started = deploy.start_runner_instances()
+    assert started == {
+        "i-1": "runner-1",
+        "i-3": "runner-3",
+        "i-4": "runner-4",
+    }
+    assert deploy.instance_states == {
+        "i-1": "online",
+        "i-2": "failed",
+        "i-3": "online",
+        "i-4": "online",
+    }
+    assert MockRecordingStop.removed == ["i-2"]
+    assert deploy.provider.mapping == started
+
+
+def test_deploy_instance_failed_removal_keeps_retrying(
+    gh_mock, batch_providers, tmp_path, monkeypatch
+):
+    summary = tmp_path / "summary.md"
+    monkeypatch.setenv("GITHUB_STEP_SUMMARY", str(summary))
+    deploy = partial_deploy(gh_mock, count=2, min_count=2)
+    deploy.stop_type = MockFailableWaitStop
+    gh_mock.wait_for_runners.side_effect = [RuntimeError("Timeout"), None]
+    gh_mock.get_runner_index.return_value = online_index(["runner-1"])
+    started = deploy.start_runner_instances()
+    assert started == {"i-1": "runner-1", "i-3": "runner-3"}
+    gh_mock.remove_runner.assert_called_once_with("runner-2")
+    # The instance that could not be removed is left for the stop action
+    assert deploy.provider.mapping == {
+        "i-1": "runner-1",
+        "i-2": "runner-2",
+        "i-3": "runner-3",
+    }
+    assert "Runner stop timings" not in summary.read_text()
+
+
+def test_deploy_instance_retries_failed_creation(gh_mock, batch_providers):
+    class FlakyStart(MockBatchStartCloudInstance):
+        attempts = 0
+
+        def create_instances(self):
+            FlakyStart.attempts += 1
+            if FlakyStart.attempts == 1:
+                raise RuntimeError("Capacity error")
+            return self.instances
+
+    deploy = partial_deploy(gh_mock, count=2, min_count=2)
+    deploy.provider_type = FlakyStart
+    deploy.provider = FlakyStart(gh_runner_tokens=["token"] * 2)
+    started = deploy.start_runner_instances()
+    assert FlakyStart.attempts == 2
+    assert list(started.values()) == ["runner-5", "runner-6"]
+    assert MockRecordingStop.removed == []
+
+
+def test_deploy_instance_accepts_min_count(gh_mock, batch_providers):
+    deploy = partial_deploy(gh_mock, count=3, min_count=2, max_retries=0)
+    gh_mock.wait_for_runners.side_effect = RuntimeError("Timeout")
+    gh_mock.get_runner_index.return_value = online_index(
+        ["runner-1", "runner-2"]
+    )
+    started = deploy.start_runner_instances()
+    assert started == {"i-1": "runner-1", "i-2": "runner-2"}
+    assert MockRecordingStop.removed == ["i-3"]
+
+
+def test_deploy_instance_below_min_count(gh_mock, batch_providers, capsys):
+    deploy = partial_deploy(gh_mock, count=3, min_count=2, max_retries=1)
+    gh_mock.wait_for_runners.side_effect = RuntimeError("Timeout")
+    gh_mock.get_runner_index.return_value = online_index(["runner-1"])
+    with pytest.raises(RuntimeError, match="Only 1 of a minimum 2"):
+        deploy.start_runner_instances()
+    # The failed instances of each attempt, then every runner left online
+    assert MockRecordingStop.removed == ["i-2", "i-3", "i-4", "i-5", "i-1"]
+    # Nothing is left for the stop action to remove
+    assert deploy.provider.mapping == {}
+    assert "::error title=Failed to start runners::" in capsys.readouterr().out
+
+
+def test_deploy_instance_timings(gh_mock, tmp_path, monkeypatch):
+    summary = tmp_path / "summary.md"
+    monkeypatch.setenv("GITHUB_STEP_SUMMARY", str(summary))
+    deploy = DeployInstance(
+        provider_type=MockStartCloudInstance,
+        cloud_params={},
+        gh=gh_mock,
+        count=1,
+        timeout=30,
+    )
+    deploy.start_runner_instances()
+    assert [span.name for span in deploy.timer.spans] == [
+        "create_runner_tokens",
+        "get_runner_release",
+        "create_instances",
+        "wait_until_ready",
+        "wait_for_runners",
+        "start",
+    ]
+    assert "| wait_for_runners | 1 |" in summary.read_text()
+
+
+def test_teardown_instance_timings(gh_mock):
+    teardown = TeardownInstance(
+        provider_type=MockStopCloudInstance,
+        cloud_params={},
+        gh=gh_mock,
+    )
+    teardown.stop_runner_instances()
+    spans = teardown.timer.spans
+    assert [span.name for span in spans] == [
+        "remove_runner",
+        "remove_instances",
+        "wait_until_removed",
+        "stop",
+    ]
+    assert spans[0].attributes == {"label": "runner-1"}
+
+
+def test_teardown_instance_streams_encoded_mapping(gh_mock):
+    mapping = {f"i-{i}": f"runner-{i}" for i in range(3)}
+
+    class EncodedStop(MockFleetStopCloudInstance):
+        def iter_instance_mapping(self):
+            return iter_mapping(encode_mapping(mapping))
+
+    teardown = TeardownInstance(
+        provider_type=EncodedStop, cloud_params={}, gh=gh_mock
+    )
+    teardown.stop_runner_instances()
+    assert teardown.provider.removed == list(mapping)
+    assert [c.args[0] for c in gh_mock.remove_runner.call_args_list] == list(
+        mapping.values()
+    )
+
+
+def test_teardown_instance_malformed_encoded_mapping(gh_mock, capsys):
+    class BadStop(MockStopCloudInstance):
+        def iter_instance_mapping(self):
+            return iter_mapping("z1:not-base64!")
+
+    teardown = TeardownInstance(
+        provider_type=BadStop, cloud_params={}, gh=gh_mock
+    )
+    with pytest.raises(SystemExit):
+        teardown.stop_runner_instances()
+    assert "Malformed instance mapping" in capsys.readouterr().out
+    gh_mock.remove_runner.assert_not_called()
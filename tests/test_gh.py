@@ -1,3 +1,5 @@
+import time
+
 import pytest
 from unittest.mock import Mock, patch
 import responses
@@ -6,6 +8,9 @@ from gha_runner.gh import (
     SelfHostedRunner,
     TokenRetrievalError,
     MissingRunnerLabel,
+    PollStrategy,
+    RateLimit,
+    RunnerIndex,
     RunnerListError,
 )
 
@@ -28,6 +33,118 @@ def test_init(github_instance):
     assert github_instance.BASE_URL == "https://api.github.com"
 
 
+def test_session_pool(github_instance):
+    adapter = github_instance.session.get_adapter("https://api.github.com")
+    assert adapter._pool_maxsize == 10
+    assert adapter.max_retries.total == 3
+    assert 503 in adapter.max_retries.status_forcelist
+
+
+def test_session_pool_configured():
+    gh = GitHubInstance(
+        token="fake-token", repo="test/test", pool_size=25, max_retries=0
+    )
+    adapter = gh.session.get_adapter("https://api.github.com")
+    assert adapter._pool_maxsize == 25
+    assert adapter.max_retries.total == 0
+
+
+def test_context_manager_closes_session():
+    gh = GitHubInstance(token="fake-token", repo="test/test")
+    with patch.object(gh.session, "close") as mock_close:
+        with gh as entered:
+            assert entered is gh
+            mock_close.assert_not_called()
+    mock_close.assert_called_once()
+
+
+@responses.activate
+def test_requests_share_session(github_instance):
+    responses.add(
+        responses.GET,
+        "https://api.github.com/repos/test/test/actions/runners",
+        json={},
+        status=200,
+    )
+    with patch.object(
+        github_instance.session,
+        "request",
+        wraps=github_instance.session.request,
+    ) as mock_request:
+        github_instance.get("repos/test/test/actions/runners")
+        github_instance.get("repos/test/test/actions/runners")
+    assert mock_request.call_count == 2
+
+
+@responses.activate
+def test_conditional_request_uses_cached_body(github_instance):
+    url = "https://api.github.com/repos/actions/runner/releases/latest"
+    responses.add(
+        responses.GET,
+        url,
+        json={"tag_name": "v1"},
+        headers={"ETag": '"abc"', "Last-Modified": "Mon, 01 Jan 2024"},
+        status=200,
+    )
+    responses.add(responses.GET, url, status=304)
+    first = github_instance.get("repos/actions/runner/releases/latest")
+    second = github_instance.get("repos/actions/runner/releases/latest")
+    assert first == second == {"tag_name": "v1"}
+    assert "If-None-Match" not in responses.calls[0].request.headers
+    assert responses.calls[1].request.headers["If-None-Match"] == '"abc"'
+    assert (
+        responses.calls[1].request.headers["If-Modified-Since"]
+        == "Mon, 01 Jan 2024"
+    )
+
+
+@responses.activate
+def test_conditional_request_updates_on_change(github_instance):
+    url = "https://api.github.com/repos/test/test/actions/runners"
+    responses.add(
+        responses.GET, url, json={"v": 1}, headers={"ETag": '"1"'}
+    )
+    responses.add(
+        responses.GET, url, json={"v": 2}, headers={"ETag": '"2"'}
+    )
+    responses.add(responses.GET, url, status=304)
+    assert github_instance.get("repos/test/test/actions/runners") == {"v": 1}
+    assert github_instance.get("repos/test/test/actions/runners") == {"v": 2}
+    assert github_instance.get("repos/test/test/actions/runners") == {"v": 2}
+    assert responses.calls[2].request.headers["If-None-Match"] == '"2"'
+
+
+@responses.activate
+def test_conditional_request_cache_is_lru():
+    gh = GitHubInstance(token="fake-token", repo="test/test", etag_cache_size=2)
+    for name in ["a", "b", "c"]:
+        responses.add(
+            responses.GET,
+            f"https://api.github.com/{name}",
+            json={},
+            headers={"ETag": name},
+        )
+    gh.get("a")
+    gh.get("b")
+    gh.get("a")
+    gh.get("c")
+    assert list(gh._etag_cache) == [
+        "https://api.github.com/a",
+        "https://api.github.com/c",
+    ]
+
+
+@responses.activate
+def test_conditional_request_disabled():
+    gh = GitHubInstance(token="fake-token", repo="test/test", etag_cache_size=0)
+    url = "https://api.github.com/repos/test/test/actions/runners"
+    responses.add(responses.GET, url, json={}, headers={"ETag": '"1"'})
+    gh.get("repos/test/test/actions/runners")
+    gh.get("repos/test/test/actions/runners")
+    assert "If-None-Match" not in responses.calls[1].request.headers
+    assert len(gh._etag_cache) == 0
+
+
 def test_headers(github_instance):
     headers = github_instance._headers({})
     assert headers["Authorization"] == "Bearer fake-token"
@@ -71,6 +188,47 @@ def test_create_runner_tokens(github_instance):
     assert github_instance.create_runner_tokens(3) == tokens
 
 
+@responses.activate
+def test_create_runner_tokens_concurrent(github_instance):
+    responses.add(
+        responses.POST,
+        "https://api.github.com/repos/test/test/actions/runners/registration-token",
+        json={"token": "test-token"},
+        status=200,
+    )
+    tokens = github_instance.create_runner_tokens(5, max_workers=3)
+    assert tokens == ["test-token"] * 5
+    assert len(responses.calls) == 5
+
+
+def test_create_runner_tokens_concurrent_preserves_order(github_instance):
+    def token():
+        # Later requests finish first
+        index = next(counter)
+        time.sleep(0.01 * (4 - index))
+        return f"token-{index}"
+
+    counter = iter(range(5))
+    with patch.object(github_instance, "create_runner_token", side_effect=token):
+        tokens = github_instance.create_runner_tokens(5, max_workers=5)
+    assert tokens == [f"token-{i}" for i in range(5)]
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_create_runner_tokens_error_reports_created(
+    github_instance, max_workers
+):
+    with patch.object(
+        github_instance,
+        "create_runner_token",
+        side_effect=["token-1", TokenRetrievalError("boom")],
+    ):
+        with pytest.raises(
+            TokenRetrievalError, match="Created 1 of 2 runner tokens: boom"
+        ):
+            github_instance.create_runner_tokens(2, max_workers=max_workers)
+
+
 @responses.activate
 def test_get_runners(github_instance):
     responses.add(
@@ -191,6 +349,69 @@ def test_get_runners_pagination(github_instance):
     assert runners[49].name == "test-runner-50"
 
 
+@responses.activate
+@pytest.mark.parametrize("page_workers", [1, 4])
+def test_get_runners_per_page(page_workers):
+    gh = GitHubInstance(
+        token="fake-token",
+        repo="test/test",
+        runners_per_page=100,
+        page_workers=page_workers,
+    )
+    for page in range(1, 4):
+        ids = range(100 * (page - 1) + 1, min(100 * page, 250) + 1)
+        responses.add(
+            responses.GET,
+            f"https://api.github.com/repos/test/test/actions/runners?per_page=100&page={page}",
+            json={
+                "total_count": 250,
+                "runners": [
+                    {
+                        "id": i,
+                        "name": f"test-runner-{i}",
+                        "os": "linux",
+                        "labels": [{"name": f"test-label-{i}"}],
+                    }
+                    for i in ids
+                ],
+            },
+            status=200,
+        )
+    runners = gh.get_runners()
+    assert [runner.id for runner in runners] == list(range(1, 251))
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_get_runners_concurrent_page_error(github_instance):
+    responses.add(
+        responses.GET,
+        "https://api.github.com/repos/test/test/actions/runners?per_page=30&page=1",
+        json={
+            "total_count": 40,
+            "runners": [
+                {"id": 1, "name": "r", "os": "linux", "labels": []}
+            ],
+        },
+        status=200,
+    )
+    responses.add(
+        responses.GET,
+        "https://api.github.com/repos/test/test/actions/runners?per_page=30&page=2",
+        status=500,
+    )
+    with pytest.raises(RunnerListError, match="Error getting runners: *"):
+        github_instance.get_runners()
+
+
+@pytest.mark.parametrize("per_page", [0, 101])
+def test_runners_per_page_out_of_range(per_page):
+    with pytest.raises(ValueError, match="runners_per_page must be between"):
+        GitHubInstance(
+            token="fake-token", repo="test/test", runners_per_page=per_page
+        )
+
+
 def test_get_runner_by_label(github_instance, mock_runner):
     with patch.object(
         github_instance, "get_runners", return_value=[mock_runner]
@@ -206,6 +427,135 @@ def test_get_runner_missing_label(github_instance):
             github_instance.get_runner("nonexistent-label")
 
 
+def test_runner_index_from_runners(mock_runner):
+    other = SelfHostedRunner(
+        id=2, name="other", os="linux", labels=["test-label", "other"]
+    )
+    index = RunnerIndex.from_runners([mock_runner, other])
+    assert index.by_label == {"test-label": mock_runner, "other": other}
+    assert index.by_id == {1: mock_runner, 2: other}
+    index.discard(mock_runner)
+    assert index.by_label == {"other": other}
+    assert index.by_id == {2: other}
+
+
+def test_get_runner_uses_cached_index(github_instance, mock_runner):
+    with patch.object(
+        github_instance, "get_runners", return_value=[mock_runner]
+    ) as mock_get_runners:
+        github_instance.get_runner("test-label")
+        github_instance.get_runner("test-label")
+        with pytest.raises(MissingRunnerLabel):
+            github_instance.get_runner("other-label")
+    # A miss lists the runners once more before giving up
+    assert mock_get_runners.call_count == 2
+    assert github_instance.cache_misses == 2
+    assert github_instance.cache_hits == 2
+
+
+def test_get_runner_registered_after_index(github_instance, mock_runner):
+    with patch.object(
+        github_instance, "get_runners", side_effect=[[], [mock_runner]]
+    ):
+        github_instance.get_runner_index()
+        # The runner registered after the index was built
+        assert github_instance.get_runner("test-label") == mock_runner
+
+
+def test_get_runner_cache_expires(mock_runner):
+    gh = GitHubInstance(
+        token="fake-token", repo="test/test", runner_cache_ttl=0
+    )
+    with patch.object(
+        gh, "get_runners", return_value=[mock_runner]
+    ) as mock_get_runners:
+        gh.get_runner("test-label")
+        gh.get_runner("test-label")
+    assert mock_get_runners.call_count == 2
+    assert gh.cache_hits == 0
+
+
+def test_get_runner_refresh(github_instance, mock_runner):
+    with patch.object(
+        github_instance, "get_runners", side_effect=[[], [mock_runner]]
+    ):
+        with pytest.raises(MissingRunnerLabel):
+            github_instance.get_runner("test-label")
+        assert github_instance.get_runner("test-label", refresh=True)
+
+
+@responses.activate
+def test_remove_runners_single_listing(github_instance):
+    runners = [
+        SelfHostedRunner(id=i, name=f"r{i}", os="linux", labels=[f"l{i}"])
+        for i in range(3)
+    ]
+    for runner in runners:
+        responses.add(
+            responses.DELETE,
+            f"https://api.github.com/repos/test/test/actions/runners/{runner.id}",
+            status=204,
+        )
+    with patch.object(
+        github_instance, "get_runners", return_value=runners
+    ) as mock_get_runners:
+        for runner in runners:
+            github_instance.remove_runner(runner.labels[0])
+    # Deleted runners are dropped from the index
+    assert github_instance._runner_index.by_label == {}
+    assert mock_get_runners.call_count == 1
+
+
+def test_remove_runner_index_invalidated_concurrently(
+    github_instance, mock_runner
+):
+    with patch.object(
+        github_instance, "get_runners", return_value=[mock_runner]
+    ):
+        github_instance.get_runner_index()
+    # Another worker's failed removal invalidates the index meanwhile
+    with patch.object(
+        github_instance,
+        "delete",
+        side_effect=lambda endpoint: github_instance.invalidate_runner_index(),
+    ):
+        github_instance.remove_runner("test-label")
+    assert github_instance._runner_index is None
+
+
+@responses.activate
+def test_remove_runners_bulk(github_instance):
+    runners = [
+        SelfHostedRunner(id=i, name=f"r{i}", os="linux", labels=[f"l{i}"])
+        for i in range(4)
+    ]
+    for runner in runners:
+        responses.add(
+            responses.DELETE,
+            f"https://api.github.com/repos/test/test/actions/runners/{runner.id}",
+            status=500 if runner.id == 2 else 204,
+        )
+    errors = github_instance.remove_runners(runners, max_workers=3)
+    assert list(errors) == [2]
+    assert len(responses.calls) == 4
+    assert github_instance._runner_index is None
+
+
+@responses.activate
+def test_remove_runner_error_invalidates_index(github_instance, mock_runner):
+    responses.add(
+        responses.DELETE,
+        f"https://api.github.com/repos/test/test/actions/runners/{mock_runner.id}",
+        status=500,
+    )
+    with patch.object(
+        github_instance, "get_runners", return_value=[mock_runner]
+    ):
+        with pytest.raises(RuntimeError):
+            github_instance.remove_runner("test-label")
+    assert github_instance._runner_index is None
+
+
 @responses.activate
 def test_remove_runner(github_instance, mock_runner):
     with patch.object(github_instance, "get_runner", return_value=mock_runner):
@@ -254,6 +604,68 @@ def test_get_latest_runner_release(github_instance):
     assert url == "https://example.com/runner.tar.gz"
 
 
+@responses.activate
+def test_get_latest_runner_release_disk_cache(tmp_path):
+    responses.add(
+        responses.GET,
+        "https://api.github.com/repos/actions/runner/releases/latest",
+        json={
+            "assets": [
+                {
+                    "name": "actions-runner-linux-x64-2.0.0.tar.gz",
+                    "browser_download_url": "https://example.com/runner.tar.gz",
+                }
+            ]
+        },
+        status=200,
+    )
+    for _ in range(2):
+        gh = GitHubInstance(
+            token="fake-token", repo="test/test", release_cache_dir=tmp_path
+        )
+        url = gh.get_latest_runner_release("linux", "x64")
+        assert url == "https://example.com/runner.tar.gz"
+    assert len(responses.calls) == 1
+    assert (tmp_path / "runner-release-linux-x64.json").exists()
+
+
+@responses.activate
+def test_get_latest_runner_release_disk_cache_expired(tmp_path):
+    responses.add(
+        responses.GET,
+        "https://api.github.com/repos/actions/runner/releases/latest",
+        json={
+            "assets": [
+                {
+                    "name": "actions-runner-linux-x64-2.0.0.tar.gz",
+                    "browser_download_url": "https://example.com/new.tar.gz",
+                }
+            ]
+        },
+        status=200,
+    )
+    (tmp_path / "runner-release-linux-x64.json").write_text(
+        '{"url": "https://example.com/old.tar.gz", "fetched_at": 0}'
+    )
+    gh = GitHubInstance(
+        token="fake-token", repo="test/test", release_cache_dir=tmp_path
+    )
+    assert (
+        gh.get_latest_runner_release("linux", "x64")
+        == "https://example.com/new.tar.gz"
+    )
+
+
+def test_get_runner_release_pinned():
+    url = GitHubInstance.get_runner_release("linux", "x64", "v2.321.0")
+    assert url == (
+        "https://github.com/actions/runner/releases/download/"
+        "v2.321.0/actions-runner-linux-x64-2.321.0.tar.gz"
+    )
+    with pytest.raises(ValueError):
+        GitHubInstance.get_runner_release("linux", "invalid", "2.321.0")
+
+
 def test_get_latest_runner_release_invalid_platform(github_instance):
     with pytest.raises(ValueError):
         github_instance.get_latest_runner_release("invalid", "x64")
@@ -276,7 +688,8 @@ def test_wait_for_runner_success(mock_sleep, github_instance, mock_runner):
         ],
     ):
         runner = github_instance.wait_for_runner("test-label", timeout=30)
-        assert mock_sleep.call_count == 1
+        # Every failed check is followed by a sleep
+        assert mock_sleep.call_count == 2
         assert runner == mock_runner
 
 
@@ -319,6 +732,29 @@ def test_wait_for_runner_timeout(mock_time, mock_sleep, github_instance):
         assert mock_sleep.call_count == 1
 
 
+@patch("time.sleep")
+@patch("time.time")
+def test_wait_for_runner_checks_after_last_sleep(
+    mock_time, mock_sleep, github_instance, mock_runner
+):
+    mock_time.side_effect = [0, 29]
+    with patch.object(
+        github_instance,
+        "get_runner",
+        side_effect=[MissingRunnerLabel("Initial fail"), mock_runner],
+    ):
+        assert (
+            github_instance.wait_for_runner("test-label", timeout=30)
+            == mock_runner
+        )
+    mock_sleep.assert_called_once_with(1)
+
+
+def test_poll_strategy_adaptive_backs_off_past_fixed():
+    intervals = PollStrategy.adaptive(jitter=0).intervals()
+    assert max(next(intervals) for _ in range(10)) > 15
+
+
 @responses.activate
 def test_get_latest_release(github_instance):
     json = {
@@ -415,3 +851,302 @@ def test_get_latest_reunner_release_error(github_instance):
         match=f"Runner release not found for platform {platform} and architecture {arch}",
     ):
         github_instance.get_latest_runner_release("linux", "x64")
+
+
+@patch("time.sleep")  # Prevent actual sleeping in tests
+def test_wait_for_runners_single_listing_per_poll(mock_sleep, github_instance):
+    runner_a = SelfHostedRunner(id=1, name="a", os="linux", labels=["label-a"])
+    runner_b = SelfHostedRunner(id=2, name="b", os="linux", labels=["label-b"])
+    with patch.object(
+        github_instance,
+        "get_runners",
+        side_effect=[None, [runner_b], [runner_a, runner_b]],
+    ) as mock_get_runners:
+        runners = github_instance.wait_for_runners(
+            ["label-a", "label-b"], timeout=60
+        )
+    assert runners == {"label-a": runner_a, "label-b": runner_b}
+    assert list(runners) == ["label-a", "label-b"]
+    assert mock_get_runners.call_count == 3
+    assert mock_sleep.call_count == 2
+
+
+@patch("time.sleep")  # Prevent actual sleeping in tests
+@patch("time.time")  # Control time for timeout logic
+def test_wait_for_runners_timeout(mock_time, mock_sleep, github_instance):
+    mock_time.side_effect = [0, 29, 31]
+    runner_a = SelfHostedRunner(id=1, name="a", os="linux", labels=["label-a"])
+    with patch.object(
+        github_instance, "get_runners", return_value=[runner_a]
+    ):
+        with pytest.raises(RuntimeError) as excinfo:
+            github_instance.wait_for_runners(
+                ["label-a", "label-b"], timeout=30
+            )
+    assert "Timeout reached: Runners ['label-b'] not found" in str(
+        excinfo.value
+    )
+    assert mock_sleep.call_count == 1
+
+
+@responses.activate
+def test_rate_limit_budget_tracked(github_instance):
+    responses.add(
+        responses.GET,
+        "https://api.github.com/rate_limit",
+        json={},
+        headers={
+            "X-RateLimit-Limit": "5000",
+            "X-RateLimit-Remaining": "4999",
+            "X-RateLimit-Reset": "1700000000",
+        },
+    )
+    github_instance.get("rate_limit")
+    assert github_instance.rate_limit == RateLimit(
+        limit=5000, remaining=4999, reset=1700000000
+    )
+
+
+@patch("time.sleep")
+@responses.activate
+def test_rate_limit_retry_after(mock_sleep, github_instance):
+    url = "https://api.github.com/repos/test/test/actions/runners"
+    responses.add(responses.GET, url, status=429, headers={"Retry-After": "7"})
+    responses.add(responses.GET, url, json={"ok": True})
+    assert github_instance.get("repos/test/test/actions/runners") == {
+        "ok": True
+    }
+    mock_sleep.assert_called_once_with(7.0)
+
+
+@patch("time.sleep")
+@responses.activate
+def test_rate_limit_secondary_backoff(mock_sleep, github_instance):
+    url = "https://api.github.com/repos/test/test/actions/runners"
+    for _ in range(4):
+        responses.add(
+            responses.GET,
+            url,
+            status=403,
+            body="You have exceeded a secondary rate limit",
+        )
+    with pytest.raises(RuntimeError, match="secondary rate limit"):
+        github_instance.get("repos/test/test/actions/runners")
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [60, 120, 240]
+    assert len(responses.calls) == 4
+
+
+@patch("time.sleep")
+@responses.activate
+def test_rate_limit_forbidden_not_retried(mock_sleep, github_instance):
+    url = "https://api.github.com/repos/test/test/actions/runners"
+    responses.add(responses.GET, url, status=403, body="Forbidden")
+    with pytest.raises(RuntimeError):
+        github_instance.get("repos/test/test/actions/runners")
+    mock_sleep.assert_not_called()
+
+
+@patch("time.sleep")
+@patch("time.time", return_value=1000)
+@responses.activate
+def test_rate_limit_exhausted_waits_for_reset(
+    mock_time, mock_sleep, github_instance
+):
+    url = "https://api.github.com/repos/test/test/actions/runners"
+    responses.add(
+        responses.GET,
+        url,
+        status=403,
+        headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1030"},
+    )
+    responses.add(
+        responses.GET,
+        url,
+        json={},
+        headers={"X-RateLimit-Remaining": "4999", "X-RateLimit-Reset": "4600"},
+    )
+    github_instance.get("repos/test/test/actions/runners")
+    # The exhausted budget also paces the retry itself
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [31, 30]
+
+
+@patch("time.sleep")
+@patch("time.time", return_value=1000)
+def test_rate_limit_pacing(mock_time, mock_sleep):
+    rate_limit = RateLimit(limit=5000, remaining=9, reset=1100)
+    assert rate_limit.pacing_delay(threshold=50) == 10
+    assert rate_limit.pacing_delay(threshold=5) == 0
+    assert RateLimit().pacing_delay(threshold=50) == 0
+
+
+@patch("time.time", return_value=1000)
+def test_rate_limit_pacing_reserves_slots(mock_time, github_instance):
+    github_instance.rate_limit = RateLimit(limit=5000, remaining=9, reset=1100)
+    github_instance.rate_limit_threshold = 50
+    github_instance._last_send = 1000
+    # Concurrent senders are spaced out instead of all waiting the same delay
+    waits = [github_instance._pacing_wait() for _ in range(3)]
+    assert waits == [10, 20, 30]
+
+
+def test_wait_for_arriving_runners_shares_polls(github_instance):
+    labels = [f"label-{i}" for i in range(40)]
+    runners = [
+        SelfHostedRunner(id=i, name=label, os="linux", labels=[label])
+        for i, label in enumerate(labels)
+    ]
+    with patch.object(
+        github_instance, "get_runners", return_value=runners
+    ) as mock_get:
+        found = github_instance.wait_for_arriving_runners(
+            iter(labels), timeout=30, poll=PollStrategy.fixed(0)
+        )
+    assert list(found) == labels
+    assert mock_get.call_count < len(labels)
+
+
+def test_wait_for_arriving_runners_stops_on_error(github_instance):
+    def labels():
+        yield "label-a"
+        time.sleep(0.05)
+        raise RuntimeError("Instance failed")
+
+    with patch.object(github_instance, "get_runners", return_value=[]):
+        start = time.monotonic()
+        with pytest.raises(RuntimeError, match="Instance failed"):
+            github_instance.wait_for_arriving_runners(
+                labels(), timeout=600, poll=PollStrategy.fixed(600)
+            )
+    assert time.monotonic() - start < 5
+
+
+def test_wait_for_arriving_runners_closes_labels(github_instance):
+    consumed = []
+    closed = []
+
+    def labels():
+        try:
+            for label in ["label-a", "label-b", "label-c"]:
+                consumed.append(label)
+                yield label
+                time.sleep(0.05)
+        finally:
+            closed.append(True)
+
+    with patch.object(github_instance, "get_runners", return_value=[]):
+        with pytest.raises(RuntimeError, match="Timeout reached"):
+            github_instance.wait_for_arriving_runners(labels(), timeout=-1)
+    # The labels stop being consumed once the wait is over
+    assert closed == [True]
+    assert consumed == ["label-a", "label-b"]
+
+
+@patch("time.time")
+def test_wait_for_arriving_runners_timeout(mock_time, github_instance):
+    mock_time.side_effect = [0, 31]
+    with patch.object(github_instance, "get_runners", return_value=None):
+        with pytest.raises(
+            RuntimeError, match=r"Runners \['label-a'\] not found"
+        ):
+            github_instance.wait_for_arriving_runners(
+                iter(["label-a"]), timeout=30
+            )
+
+
+def test_poll_strategy_fixed():
+    intervals = PollStrategy.fixed(15).intervals()
+    assert [next(intervals) for _ in range(3)] == [15, 15, 15]
+
+
+def test_poll_strategy_adaptive_backoff():
+    poll = PollStrategy.adaptive(initial=1, factor=2, max_interval=6, jitter=0)
+    intervals = poll.intervals()
+    assert [next(intervals) for _ in range(5)] == [1, 2, 4, 6, 6]
+
+
+def test_poll_strategy_jitter_bounds():
+    intervals = PollStrategy.adaptive(initial=10, jitter=0.2).intervals()
+    assert 8 <= next(intervals) <= 12
+
+
+@patch("time.sleep")
+@patch("time.time")
+def test_wait_for_runners_never_sleeps_past_timeout(
+    mock_time, mock_sleep, github_instance
+):
+    mock_time.side_effect = [0, 1, 3, 7, 9.5, 11]
+    poll = PollStrategy.adaptive(initial=1, factor=2, max_interval=8, jitter=0)
+    with patch.object(github_instance, "get_runners", return_value=None):
+        with pytest.raises(RuntimeError, match="Timeout reached"):
+            github_instance.wait_for_runners(["label-a"], timeout=10, poll=poll)
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [1, 2, 3, 0.5]
+
+
+@responses.activate
+def test_get_queued_jobs(github_instance):
+    responses.add(
+        responses.GET,
+        "https://api.github.com/repos/test/test/actions/runs?status=queued&per_page=100&page=1",
+        json={"workflow_runs": [{"id": 10}]},
+    )
+    responses.add(
+        responses.GET,
+        "https://api.github.com/repos/test/test/actions/runs?status=in_progress&per_page=100&page=1",
+        json={"workflow_runs": [{"id": 11}]},
+    )
+    for run_id, status in [(10, "queued"), (11, "in_progress")]:
+        responses.add(
+            responses.GET,
+            f"https://api.github.com/repos/test/test/actions/runs/{run_id}/jobs?filter=latest&per_page=100&page=1",
+            json={
+                "jobs": [
+                    {
+                        "id": run_id * 10,
+                        "run_id": run_id,
+                        "name": "build",
+                        "status": status,
+                        "labels": ["self-hosted"],
+                    },
+                    {
+                        "id": run_id * 10 + 1,
+                        "run_id": run_id,
+                        "name": "test",
+                        "status": "queued",
+                        "labels": ["self-hosted", "gpu"],
+                    },
+                ]
+            },
+        )
+    jobs = github_instance.get_queued_jobs()
+    assert [job.id for job in jobs] == [100, 101, 111]
+    assert jobs[2].labels == ["self-hosted", "gpu"]
+
+
+@patch("time.sleep")
+@responses.activate
+def test_request_metrics(mock_sleep, github_instance):
+    runners = "https://api.github.com/repos/test/test/actions/runners"
+    responses.add(responses.GET, runners, status=429, headers={"Retry-After": "1"})
+    responses.add(
+        responses.GET,
+        runners,
+        json={"total_count": 0, "runners": []},
+        headers={"X-RateLimit-Remaining": "42"},
+    )
+    responses.add(responses.DELETE, f"{runners}/5", status=204)
+    responses.add(responses.DELETE, f"{runners}/6", status=404)
+    github_instance.get("repos/test/test/actions/runners")
+    github_instance.delete("repos/test/test/actions/runners/5")
+    with pytest.raises(RuntimeError):
+        github_instance.delete("repos/test/test/actions/runners/6")
+    metrics = github_instance.metrics.snapshot()
+    delete = metrics[("DELETE", "/repos/{owner}/{repo}/actions/runners/{id}")]
+    assert delete.count == 2
+    assert delete.statuses == {"204": 1, "404": 1}
+    get = metrics[("GET", "/repos/{owner}/{repo}/actions/runners")]
+    assert get.count == 1
+    assert get.retries == 1
+    assert get.statuses == {"200": 1}
+    assert get.rate_limit_remaining == 42
+    assert get.response_bytes == len(b'{"total_count": 0, "runners": []}')
+    assert list(metrics)[0][0] == "DELETE"
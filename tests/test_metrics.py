@@ -0,0 +1,69 @@
+import pytest
+
+from gha_runner.metrics import RequestMetrics, endpoint_template
+
+
+@pytest.mark.parametrize(
+    "url, template",
+    [
+        (
+            "https://api.github.com/repos/o/r/actions/runners?per_page=100&page=2",
+            "/repos/{owner}/{repo}/actions/runners",
+        ),
+        (
+            "https://api.github.com/repos/o/r/actions/runs/12/jobs",
+            "/repos/{owner}/{repo}/actions/runs/{id}/jobs",
+        ),
+        (
+            "https://api.github.com/repos/actions/runner/releases/latest",
+            "/repos/{owner}/{repo}/releases/latest",
+        ),
+        ("https://api.github.com/rate_limit", "/rate_limit"),
+    ],
+)
+def test_endpoint_template(url, template):
+    assert endpoint_template(url) == template
+
+
+def test_latency_histogram():
+    metrics = RequestMetrics()
+    for latency in (0.01, 0.3, 0.3, 100):
+        metrics.record("GET", "/rate_limit", 200, latency)
+    (m,) = metrics.snapshot().values()
+    assert m.count == 4
+    assert m.latency_buckets[0] == 1
+    assert m.latency_buckets[3] == 2
+    assert m.latency_buckets[-1] == 1
+    assert m.latency_sum == pytest.approx(100.61)
+
+
+def test_reset():
+    metrics = RequestMetrics()
+    metrics.record("GET", "/rate_limit", None, 0.1)
+    assert metrics.snapshot()[("GET", "/rate_limit")].statuses == {"error": 1}
+    metrics.reset()
+    assert metrics.snapshot() == {}
+
+
+def test_to_prometheus():
+    metrics = RequestMetrics()
+    url = "https://api.github.com/repos/o/r/actions/runners/1"
+    metrics.record("DELETE", url, 204, 0.2, retries=1, rate_limit_remaining=9)
+    metrics.record("DELETE", url, 404, 20.0, response_bytes=50)
+    text = metrics.to_prometheus()
+    labels = 'method="DELETE",endpoint="/repos/{owner}/{repo}/actions/runners/{id}"'
+    assert f'gha_runner_github_requests_total{{{labels},status="204"}} 1' in text
+    assert f'gha_runner_github_requests_total{{{labels},status="404"}} 1' in text
+    assert (
+        f'gha_runner_github_request_duration_seconds_bucket{{{labels},le="0.25"}} 1'
+        in text
+    )
+    assert (
+        f'gha_runner_github_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2'
+        in text
+    )
+    assert f"gha_runner_github_request_duration_seconds_count{{{labels}}} 2" in text
+    assert f"gha_runner_github_response_bytes_total{{{labels}}} 50" in text
+    assert f"gha_runner_github_retries_total{{{labels}}} 1" in text
+    assert f"gha_runner_github_rate_limit_remaining{{{labels}}} 9" in text
+    assert text.count("# TYPE") == 5
@@ -0,0 +1,123 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from gha_runner.clouddeployment import StopCloudInstance
+from gha_runner.gh import GitHubInstance, SelfHostedRunner
+from gha_runner.reaper import Reaper, find_generated_label
+
+
+class MockTaggedStop(StopCloudInstance):
+    removed = []
+
+    def __init__(self, **kwargs):
+        pass
+
+    def remove_instances(self, ids):
+        MockTaggedStop.removed.extend(ids)
+
+    def wait_until_removed(self, ids, **kwargs):
+        pass
+
+    def get_instance_mapping(self):
+        return {}
+
+    def find_instances(self, labels):
+        return {f"i-{label[-1]}": label for label in labels}
+
+
+def runner(i, status="offline", label=None):
+    return SelfHostedRunner(
+        id=i,
+        name=f"runner-{i}",
+        os="linux",
+        labels=["self-hosted", label or f"runner-abcdefg{i}"],
+        status=status,
+    )
+
+
+@pytest.fixture
+def gh_mock():
+    MockTaggedStop.removed = []
+    gh_mock = Mock(spec=GitHubInstance)
+    gh_mock.get_runners.return_value = [
+        runner(1),
+        runner(2),
+        runner(3, status="online"),
+        runner(4, label="my-static-runner"),
+    ]
+    gh_mock.remove_runners.return_value = {}
+    yield gh_mock
+
+
+@pytest.fixture
+def reaper(gh_mock, tmp_path):
+    yield Reaper(
+        stop_type=MockTaggedStop,
+        stop_params={},
+        gh=gh_mock,
+        state_path=tmp_path / "reaper.json",
+        offline_threshold=60,
+    )
+
+
+def test_find_generated_label():
+    assert find_generated_label(runner(1)) == "runner-abcdefg1"
+    assert find_generated_label(runner(1, label="runner-ABC")) is None
+    assert find_generated_label(runner(1, label="runner-abcdefg12")) is None
+
+
+def test_reap_waits_for_threshold(reaper, gh_mock):
+    with patch("time.time", return_value=1000):
+        result = reaper.reap()
+    assert result.offline == 2
+    assert result.removed == []
+    gh_mock.remove_runners.assert_not_called()
+    with patch("time.time", return_value=1060):
+        result = reaper.reap()
+    assert result.removed == ["runner-abcdefg1", "runner-abcdefg2"]
+    assert result.instances == {
+        "i-1": "runner-abcdefg1",
+        "i-2": "runner-abcdefg2",
+    }
+    assert MockTaggedStop.removed == ["i-1", "i-2"]
+    removed = gh_mock.remove_runners.call_args.args[0]
+    assert [r.id for r in removed] == [1, 2]
+
+
+def test_reap_forgets_runners_back_online(reaper, gh_mock):
+    with patch("time.time", return_value=1000):
+        reaper.reap()
+    gh_mock.get_runners.return_value = [runner(1, status="online")]
+    with patch("time.time", return_value=1030):
+        reaper.reap()
+    gh_mock.get_runners.return_value = [runner(1)]
+    with patch("time.time", return_value=1070):
+        result = reaper.reap()
+    # Offline again since 1030, which is within the threshold
+    assert result.removed == []
+
+
+def test_reap_failed_removal_is_retried(reaper, gh_mock, capsys):
+    gh_mock.remove_runners.return_value = {2: RuntimeError("Bad request")}
+    with patch("time.time", return_value=1000):
+        reaper.reap()
+    with patch("time.time", return_value=1060):
+        result = reaper.reap()
+    assert result.removed == ["runner-abcdefg1"]
+    assert result.failed == ["runner-abcdefg2"]
+    assert "Failed to remove runner runner-abcdefg2" in capsys.readouterr().out
+    gh_mock.get_runners.return_value = [runner(2)]
+    gh_mock.remove_runners.return_value = {}
+    with patch("time.time", return_value=1061):
+        result = reaper.reap()
+    assert result.removed == ["runner-abcdefg2"]
+
+
+def test_reap_dry_run(reaper, gh_mock):
+    reaper.dry_run = True
+    reaper.offline_threshold = 0
+    result = reaper.reap()
+    assert result.removed == ["runner-abcdefg1", "runner-abcdefg2"]
+    gh_mock.remove_runners.assert_not_called()
+    assert MockTaggedStop.removed == []
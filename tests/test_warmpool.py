@@ -0,0 +1,147 @@
+import json
+
+import pytest
+from conftest import MockFleetStart, MockFleetStop
+
+from gha_runner.warmpool import WarmPool
+
+
+@pytest.fixture
+def pool(gh_mock, tmp_path):
+    yield WarmPool(
+        create_type=MockFleetStart,
+        stop_type=MockFleetStop,
+        cloud_params={},
+        stop_params={},
+        gh=gh_mock,
+        size=3,
+        state_path=tmp_path / "pool.json",
+    )
+
+
+def test_refill(pool):
+    added = pool.refill()
+    assert len(added) == 3
+    assert pool.idle() == added
+    # A full pool is not refilled
+    assert pool.refill() == {}
+
+
+def test_acquire_from_pool(pool, gh_mock):
+    pool.refill()
+    idle = pool.idle()
+    leased = pool.acquire(2)
+    assert leased == dict(list(idle.items())[:2])
+    assert pool.leased() == leased
+    assert len(pool.idle()) == 1
+    gh_mock.create_runner_tokens.assert_called_once()
+
+
+def test_acquire_starts_shortfall(pool, gh_mock):
+    pool.refill()
+    leased = pool.acquire(5)
+    assert len(leased) == 5
+    assert pool.idle() == {}
+    assert gh_mock.create_runner_tokens.call_count == 2
+
+
+def test_acquire_discards_stale_runners(pool, gh_mock):
+    pool.refill()
+    stale_id, stale_label = next(iter(pool.idle().items()))
+    gh_mock.runners.pop(stale_label)
+    leased = pool.acquire(1)
+    assert stale_id not in leased
+    assert len(leased) == 1
+    assert MockFleetStop.removed == [stale_id]
+    assert stale_id not in pool.leased()
+
+
+@pytest.mark.parametrize(
+    "status, busy", [("offline", False), ("online", True)]
+)
+def test_acquire_discards_unusable_runners(pool, gh_mock, status, busy):
+    pool.refill()
+    bad_id, bad_label = next(iter(pool.idle().items()))
+    get_runner_index = gh_mock.get_runner_index.side_effect
+
+    def with_bad_runner(refresh=False):
+        index = get_runner_index(refresh)
+        # A crashed runner stays registered, but goes offline
+        index.by_label[bad_label].status = status
+        index.by_label[bad_label].busy = busy
+        return index
+
+    gh_mock.get_runner_index.side_effect = with_bad_runner
+    leased = pool.acquire(1)
+    assert bad_id not in leased
+    assert len(leased) == 1
+    assert MockFleetStop.removed == [bad_id]
+
+
+def test_refill_failure_removes_created_instances(pool, gh_mock):
+    gh_mock.wait_for_runners.side_effect = RuntimeError("Timeout reached")
+    with pytest.raises(RuntimeError, match="Timeout reached"):
+        pool.refill()
+    assert len(MockFleetStop.removed) == 3
+    assert pool.idle() == {}
+    with pool._state() as state:
+        assert state["refilling"] == {}
+
+
+def test_acquire_failure_releases_stale_runners(pool, gh_mock):
+    pool.refill()
+    idle = pool.idle()
+    stale_id, stale_label = next(iter(idle.items()))
+    gh_mock.runners.pop(stale_label)
+    gh_mock.wait_for_runners.side_effect = RuntimeError("Timeout reached")
+    with pytest.raises(RuntimeError, match="Timeout reached"):
+        pool.acquire(3)
+    assert pool.leased() == {}
+    # The healthy runners go back to the pool, the rest are removed
+    assert pool.idle() == {k: v for k, v in idle.items() if k != stale_id}
+    assert stale_id in MockFleetStop.removed
+    assert len(MockFleetStop.removed) == 2
+
+
+def test_release(pool):
+    pool.refill()
+    leased = pool.acquire(1)
+    pool.release(leased)
+    assert pool.leased() == {}
+    assert MockFleetStop.removed == list(leased)
+
+
+def test_state_shared_between_pools(pool):
+    pool.refill()
+    other = WarmPool(
+        create_type=MockFleetStart,
+        stop_type=MockFleetStop,
+        cloud_params={},
+        stop_params={},
+        gh=pool.gh,
+        size=3,
+        state_path=pool.state_path,
+    )
+    assert other.idle() == pool.idle()
+    state = json.loads(pool.state_path.read_text())
+    assert set(state) == {"idle", "leased", "refilling"}
+
+
+def test_refill_counts_in_flight(pool):
+    with pool._state() as state:
+        state["refilling"]["other"] = {"count": 2, "started": 1e12}
+    assert len(pool.refill()) == 1
+
+
+def test_start_refill_in_background(pool):
+    thread = pool.start_refill()
+    thread.join()
+    assert len(pool.idle()) == 3
+
+
+def test_drain(pool):
+    pool.refill()
+    idle = pool.idle()
+    pool.drain()
+    assert pool.idle() == {}
+    assert MockFleetStop.removed == list(idle)